@@ -0,0 +1,193 @@
+/**
+ * Read-path benchmark against a generated dataset (packages/database `db:generate-dataset`,
+ * then `timeline:rebuild`). Each shape is timed through the real services and compared
+ * with bench/baselines/feed.json.
+ *
+ *   pnpm --filter api bench:feed                     # compare, exit 1 on regression
+ *   pnpm --filter api bench:feed -- --update-baseline
+ *
+ * Env: BENCH_ITERATIONS (50), BENCH_WARMUP (5), BENCH_REGRESSION_THRESHOLD (0.2 = +20%),
+ * BENCH_READ_CACHES (off: the global-feed head and profile caches are disabled, so every
+ * shape reaches the database).
+ * Block and row counts come from pg_stat_statements when it is installed; Postgres
+ * doesn't report rows scanned per statement, so blocks touched stand in for read cost.
+ */
+// Must stay the first import
+import { READ_CACHES } from './read-caches';
+import { NestFactory } from '@nestjs/core';
+import { readFileSync, writeFileSync, existsSync } from 'fs';
+import { join } from 'path';
+import { AppModule } from '../src/app.module';
+import { PrismaService } from '../src/prisma/prisma.service';
+import { TweetsService } from '../src/tweets/tweets.service';
+import { UsersService } from '../src/users/users.service';
+
+const ITERATIONS = parseInt(process.env.BENCH_ITERATIONS ?? '50');
+const WARMUP = parseInt(process.env.BENCH_WARMUP ?? '5');
+const REGRESSION_THRESHOLD = parseFloat(process.env.BENCH_REGRESSION_THRESHOLD ?? '0.2');
+const PAGE_SIZE = 20;
+const DEEP_PAGE = 50;
+const BASELINE_PATH = join(__dirname, 'baselines', 'feed.json');
+
+interface ShapeResult {
+  latencyMs: { p50: number; p95: number; p99: number; mean: number };
+  roundTrips: number;
+  rowsReturned: number | null;
+  blocks: number | null;
+}
+
+function percentile(sorted: number[], p: number) {
+  return sorted[Math.min(sorted.length - 1, Math.ceil((p / 100) * sorted.length) - 1)];
+}
+
+const round = (value: number) => Math.round(value * 100) / 100;
+
+async function main() {
+  const app = await NestFactory.createApplicationContext(AppModule, { logger: ['error', 'warn'] });
+  const prisma = app.get(PrismaService);
+  const tweetsService = app.get(TweetsService);
+  const usersService = app.get(UsersService);
+
+  let statements = 0;
+  // Counted on every client, so reads routed to a replica still show up
+  prisma.clients.forEach(({ client }) => client.$on('query', () => statements++));
+
+  // Needs shared_preload_libraries=pg_stat_statements (set in docker-compose.yml)
+  await prisma.$executeRaw`CREATE EXTENSION IF NOT EXISTS pg_stat_statements`.catch(() => undefined);
+  const hasStatements = await prisma.$queryRaw<{ available: boolean }[]>`
+    SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_stat_statements') AS "available"
+  `.then(rows => rows[0].available).catch(() => false);
+  if (!hasStatements) {
+    console.warn('[bench:feed] pg_stat_statements is not installed; rows/blocks will be null');
+  }
+
+  try {
+    // Fixed subjects chosen by rank, so the same dataset always benchmarks the same rows
+    const [viewer] = await prisma.user.findMany({ orderBy: [{ followingCount: 'desc' }, { id: 'asc' }], take: 1 });
+    const [author] = await prisma.user.findMany({ orderBy: [{ tweetsCount: 'desc' }, { id: 'asc' }], take: 1 });
+    const [celebrity] = await prisma.user.findMany({ orderBy: [{ followersCount: 'desc' }, { id: 'asc' }], take: 1 });
+    const [thread] = await prisma.tweet.findMany({ orderBy: [{ repliesCount: 'desc' }, { id: 'asc' }], take: 1 });
+    if (!viewer || !author || !celebrity || !thread) {
+      throw new Error('Database is empty; generate a dataset first');
+    }
+
+    // Cursor DEEP_PAGE pages into the global feed, found once outside the timed loop
+    let deepCursor = '';
+    for (let page = 1; page < DEEP_PAGE; page++) {
+      const result = await tweetsService.findPage(viewer.id, undefined, false, false, deepCursor, PAGE_SIZE);
+      if (!result.nextCursor) break;
+      deepCursor = result.nextCursor;
+    }
+
+    const shapes: Record<string, () => Promise<unknown>> = {
+      globalFeed: () => tweetsService.findPage(viewer.id, undefined, false, false, '', PAGE_SIZE),
+      followingFeed: () => tweetsService.findPage(viewer.id, undefined, false, true, '', PAGE_SIZE),
+      authorProfileExcludeReplies: () => tweetsService.findPage(viewer.id, author.id, true, false, '', PAGE_SIZE),
+      deepPageKeyset: () => tweetsService.findPage(viewer.id, undefined, false, false, deepCursor, PAGE_SIZE),
+      deepPageOffset: () => tweetsService.findAll(viewer.id, undefined, false, false, DEEP_PAGE, PAGE_SIZE),
+      threadView: () => tweetsService.findOne(thread.id, viewer.id),
+      profileLookup: () => usersService.findByUsername(celebrity.username, viewer.id),
+    };
+
+    const results: Record<string, ShapeResult> = {};
+    for (const [name, run] of Object.entries(shapes)) {
+      for (let i = 0; i < WARMUP; i++) await run();
+
+      if (hasStatements) await prisma.$queryRaw`SELECT pg_stat_statements_reset()`;
+      statements = 0;
+      const latencies: number[] = [];
+      for (let i = 0; i < ITERATIONS; i++) {
+        const started = performance.now();
+        await run();
+        latencies.push(performance.now() - started);
+      }
+      const roundTrips = statements / ITERATIONS;
+
+      let rowsReturned: number | null = null;
+      let blocks: number | null = null;
+      if (hasStatements) {
+        const [totals] = await prisma.$queryRaw<{ rows: number; blocks: number }[]>`
+          SELECT COALESCE(sum("rows"), 0)::float AS "rows",
+                 COALESCE(sum("shared_blks_hit" + "shared_blks_read"), 0)::float AS "blocks"
+          FROM pg_stat_statements
+          WHERE "dbid" = (SELECT oid FROM pg_database WHERE datname = current_database())
+            AND "query" NOT ILIKE '%pg_stat_statements%'
+        `;
+        rowsReturned = round(totals.rows / ITERATIONS);
+        blocks = round(totals.blocks / ITERATIONS);
+      }
+
+      latencies.sort((a, b) => a - b);
+      results[name] = {
+        latencyMs: {
+          p50: round(percentile(latencies, 50)),
+          p95: round(percentile(latencies, 95)),
+          p99: round(percentile(latencies, 99)),
+          mean: round(latencies.reduce((sum, value) => sum + value, 0) / latencies.length),
+        },
+        roundTrips: round(roundTrips),
+        rowsReturned,
+        blocks,
+      };
+      console.log(`[bench:feed] ${name}: p50 ${results[name].latencyMs.p50}ms, p95 ${results[name].latencyMs.p95}ms, ${results[name].roundTrips} round trips, ${blocks ?? '-'} blocks`);
+    }
+
+    const dataset = {
+      users: await prisma.user.count(),
+      tweets: await prisma.tweet.count(),
+    };
+    const report = { dataset, iterations: ITERATIONS, pageSize: PAGE_SIZE, readCaches: READ_CACHES, shapes: results };
+
+    if (process.argv.includes('--update-baseline')) {
+      writeFileSync(BASELINE_PATH, JSON.stringify(report, null, 2) + '\n');
+      console.log(`[bench:feed] Baseline written to ${BASELINE_PATH}`);
+      return;
+    }
+
+    console.log(JSON.stringify(report, null, 2));
+    if (!existsSync(BASELINE_PATH)) {
+      console.warn('[bench:feed] No baseline yet; run with --update-baseline to record one');
+      return;
+    }
+
+    const baseline = JSON.parse(readFileSync(BASELINE_PATH, 'utf8'));
+    if (baseline.dataset.users !== dataset.users || baseline.dataset.tweets !== dataset.tweets) {
+      console.warn('[bench:feed] Dataset differs from the baseline\'s; comparison skipped');
+      return;
+    }
+    if ((baseline.readCaches ?? false) !== READ_CACHES) {
+      console.warn(`[bench:feed] Baseline was recorded with read caches ${baseline.readCaches ? 'on' : 'off'}; comparison skipped`);
+      return;
+    }
+
+    const regressions: string[] = [];
+    for (const [name, current] of Object.entries(results)) {
+      const previous: ShapeResult | undefined = baseline.shapes[name];
+      if (!previous) continue;
+      // Round trips are deterministic, so any increase counts; latency and blocks get the threshold
+      if (current.roundTrips > previous.roundTrips) {
+        regressions.push(`${name}: round trips ${previous.roundTrips} -> ${current.roundTrips}`);
+      }
+      if (current.latencyMs.p95 > previous.latencyMs.p95 * (1 + REGRESSION_THRESHOLD)) {
+        regressions.push(`${name}: p95 ${previous.latencyMs.p95}ms -> ${current.latencyMs.p95}ms`);
+      }
+      if (current.blocks !== null && previous.blocks !== null && current.blocks > previous.blocks * (1 + REGRESSION_THRESHOLD)) {
+        regressions.push(`${name}: blocks ${previous.blocks} -> ${current.blocks}`);
+      }
+    }
+
+    if (regressions.length > 0) {
+      console.error(`[bench:feed] Regressions beyond ${REGRESSION_THRESHOLD * 100}%:\n  ${regressions.join('\n  ')}`);
+      process.exitCode = 1;
+    } else {
+      console.log('[bench:feed] No regressions against baseline');
+    }
+  } finally {
+    await app.close();
+  }
+}
+
+main().catch(error => {
+  console.error('[bench:feed] Failed:', error);
+  process.exit(1);
+});
@@ -0,0 +1,135 @@
+/**
+ * Hot-tweet like benchmark: N clients like and unlike the same tweet for a fixed
+ * duration, then the tweet's likesCount is checked against what the clients did.
+ * A client's expected state is its last acknowledged request; shed (503) and
+ * rate-limited (429) requests were never applied, so they only count as shed.
+ *
+ *   pnpm --filter api bench:likes
+ *
+ * Env: API_URL (http://localhost:3001), CLIENTS (500), DURATION_MS (20000),
+ * SETTLE_MS (2000, time to let a write-behind buffer flush before the check).
+ * Run it once with LIKE_WRITE_BEHIND_MS unset and once with it set on the API to compare.
+ * Loopback clients skip the rate limits but not write shedding: with the API's default
+ * MAX_CONCURRENT_WRITES (200), 500 clients get a share of 503s. Start the API with
+ * MAX_CONCURRENT_WRITES above CLIENTS to measure the write path without shedding.
+ */
+const API_URL = process.env.API_URL ?? 'http://localhost:3001';
+const CLIENTS = parseInt(process.env.CLIENTS ?? '500');
+const DURATION_MS = parseInt(process.env.DURATION_MS ?? '20000');
+const SETTLE_MS = parseInt(process.env.SETTLE_MS ?? '2000');
+// Signups hash passwords with bcrypt, so keep setup concurrency modest
+const SIGNUP_CONCURRENCY = 25;
+
+class HttpError extends Error {
+  constructor(readonly status: number, readonly retryAfterS: number, message: string) {
+    super(message);
+  }
+}
+
+async function request(method: string, path: string, token?: string, body?: unknown) {
+  const res = await fetch(`${API_URL}${path}`, {
+    method,
+    headers: {
+      'Content-Type': 'application/json',
+      ...(token ? { Authorization: `Bearer ${token}` } : {}),
+    },
+    body: body === undefined ? undefined : JSON.stringify(body),
+  });
+  if (!res.ok) {
+    throw new HttpError(res.status, parseInt(res.headers.get('Retry-After') ?? '0') || 0, `${method} ${path} -> ${res.status}`);
+  }
+  return res.json();
+}
+
+async function signup(index: number, runId: string): Promise<string> {
+  const username = `bench_${runId}_${index}`;
+  const { access_token } = await request('POST', '/auth/signup', undefined, {
+    email: `${username}@bench.local`,
+    username,
+    password: 'bench-password',
+    name: `Bench ${index}`,
+  });
+  return access_token;
+}
+
+function percentile(sorted: number[], p: number) {
+  if (sorted.length === 0) return 0;
+  return sorted[Math.min(sorted.length - 1, Math.floor((p / 100) * sorted.length))];
+}
+
+async function main() {
+  const runId = Date.now().toString(36);
+
+  console.log(`[bench:likes] Signing up ${CLIENTS} users...`);
+  const tokens: string[] = [];
+  for (let i = 0; i < CLIENTS; i += SIGNUP_CONCURRENCY) {
+    const chunk = Array.from({ length: Math.min(SIGNUP_CONCURRENCY, CLIENTS - i) }, (_, j) => signup(i + j, runId));
+    tokens.push(...(await Promise.all(chunk)));
+  }
+
+  const tweet = await request('POST', '/tweets', tokens[0], { content: `Hot tweet ${runId}` });
+  const latencies: number[] = [];
+  let shed = 0;
+  let errors = 0;
+  const deadline = Date.now() + DURATION_MS;
+  // Whether each client's last acknowledged request left the tweet liked
+  const liked = new Array<boolean>(tokens.length).fill(false);
+
+  const client = async (token: string, index: number) => {
+    while (Date.now() < deadline) {
+      for (const method of ['PUT', 'DELETE']) {
+        const started = performance.now();
+        try {
+          await request(method, `/tweets/${tweet.id}/like`, token);
+          latencies.push(performance.now() - started);
+          liked[index] = method === 'PUT';
+        } catch (error) {
+          if (error instanceof HttpError && (error.status === 503 || error.status === 429)) {
+            shed++;
+            await new Promise(resolve => setTimeout(resolve, error.retryAfterS * 1000));
+          } else {
+            // Timed out or failed mid-flight: it may or may not have been applied
+            errors++;
+          }
+        }
+      }
+    }
+  };
+
+  console.log(`[bench:likes] Running ${CLIENTS} clients for ${DURATION_MS}ms against tweet ${tweet.id}...`);
+  const started = performance.now();
+  await Promise.all(tokens.map((token, index) => client(token, index)));
+  const elapsedMs = performance.now() - started;
+
+  await new Promise(resolve => setTimeout(resolve, SETTLE_MS));
+  const after = await request('GET', `/tweets/${tweet.id}`);
+
+  latencies.sort((a, b) => a - b);
+  const expectedLikesCount = liked.filter(Boolean).length;
+  const result = {
+    clients: CLIENTS,
+    durationMs: Math.round(elapsedMs),
+    operations: latencies.length,
+    shed,
+    errors,
+    opsPerSec: Math.round(latencies.length / (elapsedMs / 1000)),
+    latencyMs: {
+      p50: +percentile(latencies, 50).toFixed(1),
+      p95: +percentile(latencies, 95).toFixed(1),
+      p99: +percentile(latencies, 99).toFixed(1),
+    },
+    expectedLikesCount,
+    finalLikesCount: after._count.likes,
+    // Only decidable when every request got an answer
+    consistent: errors === 0 ? after._count.likes === expectedLikesCount : null,
+  };
+
+  console.log(JSON.stringify(result, null, 2));
+  if (result.consistent === false) process.exitCode = 1;
+  if (result.consistent === null) console.warn(`[bench:likes] ${errors} request(s) failed without a response; consistency not checked`);
+}
+
+main().catch(error => {
+  console.error('[bench:likes] Failed:', error);
+  process.exit(1);
+});
@@ -0,0 +1,12 @@
+/**
+ * Imported before the app so it runs ahead of the modules that read these settings:
+ * the in-memory read caches would serve most iterations, and the feed benchmark is
+ * there to measure the queries behind them. BENCH_READ_CACHES=1 leaves them on, to
+ * see what a warm process serves instead.
+ */
+export const READ_CACHES = process.env.BENCH_READ_CACHES === '1';
+
+if (!READ_CACHES) {
+  process.env.GLOBAL_FEED_CACHE_SIZE = '0';
+  process.env.PROFILE_CACHE_SIZE = '0';
+}
@@ -0,0 +1,84 @@
+import { CanActivate, ExecutionContext, HttpException, HttpStatus, Injectable, ServiceUnavailableException } from '@nestjs/common';
+import { Reflector } from '@nestjs/core';
+import type { Request, Response } from 'express';
+import { AuthTokenService } from '../auth/auth-token.service';
+import { LoadMonitorService } from './load-monitor.service';
+import { RATE_LIMIT_KEY, RateLimitRoute } from './rate-limit.decorator';
+import { parseRate, TokenBuckets } from './token-bucket';
+
+// RATE_LIMIT_ENABLED=0 turns the token buckets off (load tests); shedding stays on
+const RATE_LIMIT_ENABLED = process.env.RATE_LIMIT_ENABLED !== '0';
+// Local test runs and health checks come from here. Behind a proxy, set TRUST_PROXY
+// so req.ip is the client rather than the proxy.
+const RATE_LIMIT_EXEMPT_IPS = new Set(
+  (process.env.RATE_LIMIT_EXEMPT_IPS ?? '127.0.0.1,::1,::ffff:127.0.0.1').split(',').map(ip => ip.trim()).filter(Boolean)
+);
+const RATE_LIMIT_MAX_KEYS = parseInt(process.env.RATE_LIMIT_MAX_KEYS ?? '100000');
+// Rate-limited requests allowed in flight at once in this process, across all such routes
+const MAX_CONCURRENT_WRITES = parseInt(process.env.MAX_CONCURRENT_WRITES ?? '200');
+const SHED_RETRY_AFTER_S = parseInt(process.env.SHED_RETRY_AFTER_S ?? '2');
+
+/**
+ * Admission control for routes marked with @RateLimit. Runs as a global guard, before
+ * route-level auth and upload parsing, so rejected requests cost almost nothing:
+ * - 503 + Retry-After while the process is overloaded (LoadMonitorService) or has too
+ *   many such requests in flight. Reads are never shed, so they keep their latency
+ *   through a write storm.
+ * - 429 + Retry-After once the caller's user or address bucket is empty.
+ * Buckets are per process: with API_WORKERS=N a client can get up to N times the rate.
+ */
+@Injectable()
+export class AdmissionGuard implements CanActivate {
+  private readonly limiters = new Map<string, TokenBuckets | null>();
+  private inFlight = 0;
+
+  constructor(
+    private reflector: Reflector,
+    private loadMonitor: LoadMonitorService,
+    private authTokenService: AuthTokenService
+  ) {}
+
+  canActivate(context: ExecutionContext): boolean {
+    const route = this.reflector.get<RateLimitRoute | undefined>(RATE_LIMIT_KEY, context.getHandler());
+    if (!route) return true;
+
+    const req = context.switchToHttp().getRequest<Request>();
+    const res = context.switchToHttp().getResponse<Response>();
+
+    const overload = this.inFlight >= MAX_CONCURRENT_WRITES
+      ? `${this.inFlight} writes in flight`
+      : this.loadMonitor.overloadReason;
+    if (overload) {
+      res.setHeader('Retry-After', String(SHED_RETRY_AFTER_S));
+      throw new ServiceUnavailableException('Server is busy, please retry shortly');
+    }
+
+    const ip = req.ip ?? '';
+    if (RATE_LIMIT_ENABLED && !RATE_LIMIT_EXEMPT_IPS.has(ip)) {
+      // Route auth guards haven't run yet; the verified-token cache makes this cheap
+      const userId = this.authTokenService.fromHeader(req.headers.authorization)?.userId;
+      const waitMs = Math.max(
+        userId ? this.limiter(route, 'user')?.take(userId) ?? 0 : 0,
+        this.limiter(route, 'ip')?.take(ip) ?? 0
+      );
+      if (waitMs > 0) {
+        res.setHeader('Retry-After', String(Math.ceil(waitMs / 1000)));
+        throw new HttpException('Too many requests, please slow down', HttpStatus.TOO_MANY_REQUESTS);
+      }
+    }
+
+    this.inFlight++;
+    res.once('close', () => this.inFlight--);
+    return true;
+  }
+
+  private limiter(route: RateLimitRoute, scope: 'user' | 'ip') {
+    const key = `${route.name}:${scope}`;
+    if (!this.limiters.has(key)) {
+      const envName = `RATE_LIMIT_${route.name.toUpperCase().replace(/-/g, '_')}_${scope.toUpperCase()}`;
+      const rate = parseRate(process.env[envName], parseRate(route[scope]));
+      this.limiters.set(key, rate ? new TokenBuckets(rate, RATE_LIMIT_MAX_KEYS) : null);
+    }
+    return this.limiters.get(key);
+  }
+}
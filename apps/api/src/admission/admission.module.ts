@@ -0,0 +1,11 @@
+import { Module } from '@nestjs/common';
+import { APP_GUARD } from '@nestjs/core';
+import { AuthTokenModule } from '../auth/auth-token.module';
+import { AdmissionGuard } from './admission.guard';
+import { LoadMonitorService } from './load-monitor.service';
+
+@Module({
+  imports: [AuthTokenModule],
+  providers: [LoadMonitorService, { provide: APP_GUARD, useClass: AdmissionGuard }],
+})
+export class AdmissionModule {}
@@ -0,0 +1,63 @@
+import { Injectable, OnModuleDestroy, OnModuleInit } from '@nestjs/common';
+import { monitorEventLoopDelay } from 'perf_hooks';
+import { PrismaService } from '../prisma/prisma.service';
+
+// Writes are shed while the event loop's p99 delay over the last sample exceeds this
+const SHED_EVENT_LOOP_LAG_MS = parseInt(process.env.SHED_EVENT_LOOP_LAG_MS ?? '200');
+// ...or while this many queries are queued for a primary pool connection
+const SHED_POOL_WAITING = parseInt(process.env.SHED_POOL_WAITING ?? '20');
+const SAMPLE_INTERVAL_MS = 500;
+
+/**
+ * Samples event-loop lag and Prisma pool wait twice a second and says whether the
+ * process is too loaded to take more writes. Sampling off the request path keeps
+ * the per-request check to a field read.
+ */
+@Injectable()
+export class LoadMonitorService implements OnModuleInit, OnModuleDestroy {
+  private readonly eventLoopDelay = monitorEventLoopDelay({ resolution: 10 });
+  private sampleTimer?: NodeJS.Timeout;
+  private reason: string | null = null;
+
+  constructor(private prisma: PrismaService) {}
+
+  onModuleInit() {
+    this.eventLoopDelay.enable();
+    this.sampleTimer = setInterval(() => this.sample(), SAMPLE_INTERVAL_MS);
+    this.sampleTimer.unref();
+  }
+
+  onModuleDestroy() {
+    clearInterval(this.sampleTimer);
+    this.eventLoopDelay.disable();
+  }
+
+  /** Why writes should be shed right now, or null when they can be admitted. */
+  get overloadReason() {
+    return this.reason;
+  }
+
+  private async sample() {
+    const lagMs = this.eventLoopDelay.percentile(99) / 1e6;
+    this.eventLoopDelay.reset();
+
+    let poolWaiting = 0;
+    try {
+      const metrics = await this.prisma.$metrics.json();
+      poolWaiting = metrics.gauges.find(gauge => gauge.key === 'prisma_client_queries_wait')?.value ?? 0;
+    } catch (error) {
+      // Metrics are best-effort; lag alone still protects the process
+    }
+
+    const reason =
+      lagMs > SHED_EVENT_LOOP_LAG_MS ? `event loop lag ${Math.round(lagMs)}ms`
+      : poolWaiting > SHED_POOL_WAITING ? `${poolWaiting} queries waiting for a database connection`
+      : null;
+
+    if (reason !== this.reason) {
+      if (reason && !this.reason) console.warn(`[LoadMonitor] Shedding writes: ${reason}`);
+      if (!reason) console.log('[LoadMonitor] Load back to normal; admitting writes');
+    }
+    this.reason = reason;
+  }
+}
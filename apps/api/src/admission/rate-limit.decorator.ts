@@ -0,0 +1,18 @@
+import { SetMetadata } from '@nestjs/common';
+
+export const RATE_LIMIT_KEY = 'rateLimit';
+
+export interface RateLimitRoute {
+  // Shared by every route that draws on the same buckets, e.g. like/unlike/toggle
+  name: string;
+  // Default rates as "count/seconds"; RATE_LIMIT_<NAME>_USER / _IP override them
+  user?: string;
+  ip?: string;
+}
+
+/**
+ * Puts a route under admission control: per-user and per-address token buckets, and
+ * write shedding while the process is overloaded. See AdmissionGuard.
+ */
+export const RateLimit = (name: string, rates: { user?: string; ip?: string }) =>
+  SetMetadata<string, RateLimitRoute>(RATE_LIMIT_KEY, { name, ...rates });
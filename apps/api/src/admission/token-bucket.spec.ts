@@ -0,0 +1,31 @@
+import { parseRate, TokenBuckets } from './token-bucket';
+
+describe('parseRate', () => {
+  it('reads count/seconds and falls back on bad input', () => {
+    const fallback = { capacity: 1, refillPerSecond: 1 };
+    expect(parseRate('30/60')).toEqual({ capacity: 30, refillPerSecond: 0.5 });
+    expect(parseRate(undefined, fallback)).toBe(fallback);
+    expect(parseRate('nonsense', fallback)).toBe(fallback);
+    expect(parseRate('off', fallback)).toBeUndefined();
+  });
+});
+
+describe('TokenBuckets', () => {
+  it('admits a burst, then refills at the configured rate', () => {
+    const buckets = new TokenBuckets({ capacity: 2, refillPerSecond: 1 }, 100);
+
+    expect(buckets.take('u1', 0)).toBe(0);
+    expect(buckets.take('u1', 0)).toBe(0);
+    expect(buckets.take('u1', 0)).toBe(1000);
+    expect(buckets.take('u1', 500)).toBe(500);
+    expect(buckets.take('u1', 1000)).toBe(0);
+  });
+
+  it('keeps a bucket per key', () => {
+    const buckets = new TokenBuckets({ capacity: 1, refillPerSecond: 1 }, 100);
+
+    expect(buckets.take('a', 0)).toBe(0);
+    expect(buckets.take('b', 0)).toBe(0);
+    expect(buckets.take('a', 0)).toBeGreaterThan(0);
+  });
+});
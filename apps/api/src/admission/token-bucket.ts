@@ -0,0 +1,50 @@
+import { LruCache } from '../common/lru-cache';
+
+export interface BucketRate {
+  // Requests allowed in a burst
+  capacity: number;
+  refillPerSecond: number;
+}
+
+/**
+ * Parses "30/60" (30 requests per 60 seconds, bursting up to 30). "off" or an empty
+ * value disables the limit; anything unparseable falls back to the default.
+ */
+export function parseRate(value: string | undefined, fallback?: BucketRate): BucketRate | undefined {
+  if (value === undefined) return fallback;
+  if (value === '' || value === 'off') return undefined;
+
+  const [count, seconds] = value.split('/').map(part => parseFloat(part));
+  if (!(count > 0) || !(seconds > 0)) return fallback;
+  return { capacity: count, refillPerSecond: count / seconds };
+}
+
+/** One token bucket per key (user id, client address), held in a bounded LRU. */
+export class TokenBuckets {
+  private readonly buckets: LruCache<string, { tokens: number; updatedAt: number }>;
+  // A bucket untouched this long is full again, so forgetting it changes nothing
+  private readonly refillMs: number;
+
+  constructor(
+    private readonly rate: BucketRate,
+    maxKeys: number
+  ) {
+    this.refillMs = (rate.capacity / rate.refillPerSecond) * 1000;
+    this.buckets = new LruCache(maxKeys, this.refillMs);
+  }
+
+  /** Takes a token for `key`: 0 when admitted, otherwise the milliseconds until one is available. */
+  take(key: string, now: number = Date.now()): number {
+    const bucket = this.buckets.get(key);
+    const elapsedS = bucket ? (now - bucket.updatedAt) / 1000 : Infinity;
+    const tokens = Math.min(this.rate.capacity, (bucket?.tokens ?? 0) + elapsedS * this.rate.refillPerSecond);
+
+    if (tokens < 1) {
+      this.buckets.set(key, { tokens, updatedAt: now }, this.refillMs);
+      return Math.ceil(((1 - tokens) / this.rate.refillPerSecond) * 1000);
+    }
+
+    this.buckets.set(key, { tokens: tokens - 1, updatedAt: now }, this.refillMs);
+    return 0;
+  }
+}
@@ -10,13 +10,25 @@ import { TweetsModule } from './tweets/tweets.module';
 import { UploadsModule } from './uploads/uploads.module';
 import { NotificationsModule } from './notifications/notifications.module';
 import { ConversationsModule } from './conversations/conversations.module';
+import { CountersModule } from './counters/counters.module';
+import { RealtimeModule } from './realtime/realtime.module';
+import { MetricsModule } from './metrics/metrics.module';
+import { ClusterBusModule } from './cluster-bus/cluster-bus.module';
+import { AdmissionModule } from './admission/admission.module';
 
 @Module({
   imports: [
     ServeStaticModule.forRoot({
       rootPath: join(process.cwd(), 'uploads'),
       serveRoot: '/uploads',
+      // Upload names are random and never reused, so a URL's bytes never change
+      serveStaticOptions: {
+        immutable: true,
+        maxAge: '365d',
+        etag: true,
+      },
     }),
+    ClusterBusModule,
     PrismaModule,
     AuthModule,
     UsersModule,
@@ -24,6 +36,10 @@ import { ConversationsModule } from './conversations/conversations.module';
     UploadsModule,
     NotificationsModule,
     ConversationsModule,
+    CountersModule,
+    RealtimeModule,
+    MetricsModule,
+    AdmissionModule,
   ],
   controllers: [AppController],
   providers: [AppService],
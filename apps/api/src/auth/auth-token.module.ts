@@ -0,0 +1,16 @@
+import { Module } from '@nestjs/common';
+import { JwtModule } from '@nestjs/jwt';
+import { AuthTokenService } from './auth-token.service';
+import { OptionalJwtGuard } from './optional-jwt.guard';
+
+// Kept apart from AuthModule so UsersModule can use it without a circular import
+@Module({
+  imports: [
+    JwtModule.register({
+      secret: 'secretKey', // In production, use env var
+    }),
+  ],
+  providers: [AuthTokenService, OptionalJwtGuard],
+  exports: [AuthTokenService, OptionalJwtGuard],
+})
+export class AuthTokenModule {}
@@ -0,0 +1,46 @@
+import { Injectable } from '@nestjs/common';
+import { JwtService } from '@nestjs/jwt';
+import { LruCache } from '../common/lru-cache';
+
+// Verified tokens kept in memory so repeat reads skip signature checks
+const VERIFIED_TOKEN_CACHE_SIZE = parseInt(process.env.VERIFIED_TOKEN_CACHE_SIZE ?? '10000');
+const VERIFIED_TOKEN_CACHE_TTL_MS = 5 * 60 * 1000;
+
+export interface AuthUser {
+  userId: string;
+  email: string;
+}
+
+@Injectable()
+export class AuthTokenService {
+  private readonly verified = new LruCache<string, AuthUser>(VERIFIED_TOKEN_CACHE_SIZE, VERIFIED_TOKEN_CACHE_TTL_MS);
+
+  constructor(private jwtService: JwtService) {}
+
+  /** Returns the token's user, or null if it is missing, malformed, forged or expired. */
+  verify(token?: string): AuthUser | null {
+    if (!token) return null;
+
+    const cached = this.verified.get(token);
+    if (cached) return cached;
+
+    let payload: any;
+    try {
+      payload = this.jwtService.verify(token);
+    } catch (e) {
+      return null;
+    }
+    if (!payload?.sub) return null;
+
+    const user: AuthUser = { userId: payload.sub, email: payload.email };
+    // Never serve a cached entry past the token's own expiry
+    const ttlMs = payload.exp ? Math.min(payload.exp * 1000 - Date.now(), VERIFIED_TOKEN_CACHE_TTL_MS) : VERIFIED_TOKEN_CACHE_TTL_MS;
+    this.verified.set(token, user, ttlMs);
+    return user;
+  }
+
+  fromHeader(authHeader?: string): AuthUser | null {
+    const [scheme, token] = authHeader?.split(' ') ?? [];
+    return scheme === 'Bearer' ? this.verify(token) : null;
+  }
+}
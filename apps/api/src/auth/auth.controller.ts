@@ -4,6 +4,7 @@ import { Prisma } from '@repo/database';
 import { AuthGuard } from '@nestjs/passport';
 
 import { UsersService } from '../users/users.service';
+import { RateLimit } from '../admission/rate-limit.decorator';
 
 @Controller('auth')
 export class AuthController {
@@ -12,12 +13,15 @@ export class AuthController {
     private readonly usersService: UsersService
   ) {}
 
+  // Signup and login each spend a bcrypt worker; limited per address, since there's no user yet
+  @RateLimit('signup', { ip: '20/3600' })
   @Post('signup')
   async signup(@Body() userData: Prisma.UserCreateInput) {
     console.log('[AuthController] Signup request received:', { ...userData, password: '***' });
     return this.authService.register(userData);
   }
 
+  @RateLimit('login', { ip: '30/60' })
   @Post('login')
   async login(@Body() req: any) {
     console.log('[AuthController] Login request received for email:', req.email);
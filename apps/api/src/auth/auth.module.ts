@@ -5,11 +5,13 @@ import { UsersModule } from '../users/users.module';
 import { PassportModule } from '@nestjs/passport';
 import { JwtModule } from '@nestjs/jwt';
 import { JwtStrategy } from './jwt.strategy';
+import { PasswordsModule } from '../passwords/passwords.module';
 
 @Module({
   imports: [
     UsersModule,
     PassportModule,
+    PasswordsModule,
     JwtModule.register({
       secret: 'secretKey', // In production, use env var
       signOptions: { expiresIn: '60m' },
@@ -1,7 +1,7 @@
 import { Injectable, UnauthorizedException, ConflictException } from '@nestjs/common';
 import { UsersService } from '../users/users.service';
 import { JwtService } from '@nestjs/jwt';
-import * as bcrypt from 'bcrypt';
+import { PasswordsService } from '../passwords/passwords.service';
 import { Prisma } from '@repo/database';
 
 @Injectable()
@@ -9,6 +9,7 @@ export class AuthService {
   constructor(
     private usersService: UsersService,
     private jwtService: JwtService,
+    private passwordsService: PasswordsService,
   ) {}
 
   async validateUser(email: string, pass: string): Promise<any> {
@@ -16,7 +17,7 @@ export class AuthService {
     const user = await this.usersService.findOne(email);
     if (user) {
       console.log('[AuthService] User found, checking password...');
-      const isMatch = await bcrypt.compare(pass, user.password);
+      const isMatch = await this.passwordsService.compare(pass, user.password);
       if (isMatch) {
         console.log('[AuthService] Password validation successful');
         const { password, ...result } = user;
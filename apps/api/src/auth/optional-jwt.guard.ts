@@ -0,0 +1,18 @@
+import { CanActivate, ExecutionContext, Injectable } from '@nestjs/common';
+import { AuthTokenService } from './auth-token.service';
+
+/**
+ * For endpoints that work signed out but personalize when signed in. Sets
+ * `req.user` (same shape as the jwt strategy) for a valid token and never rejects.
+ */
+@Injectable()
+export class OptionalJwtGuard implements CanActivate {
+  constructor(private authTokenService: AuthTokenService) {}
+
+  canActivate(context: ExecutionContext) {
+    const req = context.switchToHttp().getRequest();
+    const user = this.authTokenService.fromHeader(req.headers.authorization);
+    if (user) req.user = user;
+    return true;
+  }
+}
@@ -0,0 +1,9 @@
+import { Global, Module } from '@nestjs/common';
+import { ClusterBusService } from './cluster-bus.service';
+
+@Global()
+@Module({
+  providers: [ClusterBusService],
+  exports: [ClusterBusService],
+})
+export class ClusterBusModule {}
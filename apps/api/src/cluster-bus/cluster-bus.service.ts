@@ -0,0 +1,110 @@
+import { Injectable, OnModuleDestroy, OnModuleInit } from '@nestjs/common';
+import cluster from 'cluster';
+import { BusEnvelope, BUS_IPC_TYPE, isBusEnvelope } from './ipc';
+
+// Only cluster workers have peers; an in-process API (API_WORKERS=1) publishes nowhere
+const CLUSTER_BUS_ENABLED = cluster.isWorker;
+// Every message is copied through the primary to each worker; bigger ones get a smaller stand-in
+export const MAX_MESSAGE_BYTES = 64 * 1024;
+
+export type BusTopic = 'profiles' | 'global-feed' | 'viewer-state' | 'recent-writers' | 'realtime';
+
+type Handler = (payload: any) => void;
+
+/**
+ * Fans cache invalidations and realtime events out to the other API workers on this
+ * host, through the cluster primary (see runPrimary). Publishing is fire-and-forget:
+ * messages queued in one tick go out together after it, and a worker the primary
+ * failed to deliver to runs the reset handlers on its next message, since it can't
+ * know what it missed. Separate hosts don't share a bus; their caches rely on TTLs.
+ */
+@Injectable()
+export class ClusterBusService implements OnModuleInit, OnModuleDestroy {
+  private readonly handlers = new Map<BusTopic, Handler[]>();
+  private readonly resetHandlers: (() => void)[] = [];
+  private queued: BusEnvelope['messages'] = [];
+  private flushing: Promise<void> = Promise.resolve();
+  private readonly onMessage = (message: unknown) => {
+    if (isBusEnvelope(message)) this.receive(message);
+  };
+
+  get enabled() {
+    return CLUSTER_BUS_ENABLED;
+  }
+
+  onModuleInit() {
+    if (!CLUSTER_BUS_ENABLED) return;
+    process.on('message', this.onMessage);
+  }
+
+  async onModuleDestroy() {
+    await this.flush();
+    process.off('message', this.onMessage);
+  }
+
+  subscribe(topic: BusTopic, handler: Handler) {
+    this.handlers.set(topic, [...(this.handlers.get(topic) ?? []), handler]);
+  }
+
+  /** Runs when messages to this worker may have been lost: drop anything that may have gone stale. */
+  onReset(handler: () => void) {
+    this.resetHandlers.push(handler);
+  }
+
+  /**
+   * Sends to every other worker. Returns false when the message is over
+   * MAX_MESSAGE_BYTES and was dropped, so the caller can send something smaller instead.
+   */
+  publish(topic: BusTopic, payload: unknown): boolean {
+    if (!CLUSTER_BUS_ENABLED) return true;
+
+    if (Buffer.byteLength(JSON.stringify(payload) ?? '') > MAX_MESSAGE_BYTES) return false;
+
+    if (this.queued.length === 0) process.nextTick(() => this.flush());
+    this.queued.push({ topic, payload });
+    return true;
+  }
+
+  private flush(): Promise<void> {
+    // Chained so batches go out in the order they were published
+    this.flushing = this.flushing.then(() => this.drain());
+    return this.flushing;
+  }
+
+  private drain() {
+    const messages = this.queued;
+    this.queued = [];
+    if (messages.length === 0) return;
+
+    if (!process.send || !process.connected) {
+      // The primary is gone and this worker is on its way out; peers fall back on their TTLs
+      console.warn(`[ClusterBus] Not connected; dropped ${messages.length} message(s)`);
+      return;
+    }
+
+    const envelope: BusEnvelope = { type: BUS_IPC_TYPE, messages };
+    return new Promise<void>(resolve => {
+      process.send!(envelope, undefined, {}, error => {
+        if (error) console.error('[ClusterBus] Publish failed:', error);
+        resolve();
+      });
+    });
+  }
+
+  private receive(envelope: BusEnvelope) {
+    if (envelope.reset) {
+      console.log('[ClusterBus] Messages to this worker were lost; resetting local caches');
+      this.resetHandlers.forEach(handler => handler());
+    }
+
+    for (const { topic, payload } of envelope.messages) {
+      this.handlers.get(topic as BusTopic)?.forEach(handler => {
+        try {
+          handler(payload);
+        } catch (error) {
+          console.error(`[ClusterBus] Handler for ${topic} failed:`, error);
+        }
+      });
+    }
+  }
+}
@@ -0,0 +1,13 @@
+// Tags bus traffic on the worker <-> primary IPC channel, which Node also uses internally
+export const BUS_IPC_TYPE = 'api-cluster-bus';
+
+export interface BusEnvelope {
+  type: typeof BUS_IPC_TYPE;
+  messages: { topic: string; payload: unknown }[];
+  // Set by the primary when an earlier relay to this worker failed
+  reset?: boolean;
+}
+
+export function isBusEnvelope(message: unknown): message is BusEnvelope {
+  return typeof message === 'object' && message !== null && (message as BusEnvelope).type === BUS_IPC_TYPE;
+}
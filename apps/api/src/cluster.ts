@@ -0,0 +1,136 @@
+import cluster, { Worker } from 'cluster';
+import { isBusEnvelope } from './cluster-bus/ipc';
+
+// How long a replacement worker gets to start listening before a rolling restart stops
+const WORKER_START_TIMEOUT_MS = parseInt(process.env.WORKER_START_TIMEOUT_MS ?? '60000');
+// A worker still draining after this long is killed
+const WORKER_STOP_TIMEOUT_MS = parseInt(process.env.WORKER_STOP_TIMEOUT_MS ?? '30000');
+const RESPAWN_DELAY_MS = 1000;
+// Database connections the whole cluster aims to hold when DATABASE_POOL_SIZE isn't set.
+// Prisma's per-process default (2 x cores + 1) times one worker per core would blow
+// through Postgres' max_connections.
+const CLUSTER_POOL_TOTAL = 40;
+
+function workerEnv(count: number) {
+  return {
+    DATABASE_POOL_SIZE: process.env.DATABASE_POOL_SIZE ?? String(Math.max(2, Math.floor(CLUSTER_POOL_TOTAL / count))),
+    // The workers themselves already spread over the cores
+    PASSWORD_WORKERS: process.env.PASSWORD_WORKERS ?? '1',
+  };
+}
+
+function waitForListening(worker: Worker) {
+  return new Promise<void>((resolve, reject) => {
+    const timer = setTimeout(() => reject(new Error('timed out')), WORKER_START_TIMEOUT_MS);
+    worker.once('listening', () => {
+      clearTimeout(timer);
+      resolve();
+    });
+    worker.once('exit', code => {
+      clearTimeout(timer);
+      reject(new Error(`exited with code ${code}`));
+    });
+  });
+}
+
+/**
+ * Cluster primary: forks `count` API workers that share the listen socket, replaces
+ * any that crash, and on SIGHUP replaces them one at a time, each only after its
+ * replacement is listening, so a deploy never leaves the port without a worker.
+ * Workers drain on SIGTERM (see enableGracefulShutdown); in-process caches stay
+ * coherent between them through ClusterBusService, whose messages the primary relays.
+ */
+export function runPrimary(count: number) {
+  const live = new Set<Worker>();
+  // Workers we stopped on purpose, which mustn't be respawned
+  const retiring = new Set<Worker>();
+  // Workers a bus message failed to reach; the next one they get tells them to reset
+  const missedBus = new WeakSet<Worker>();
+  let shuttingDown = false;
+  let restarting = false;
+
+  const relay = (from: Worker, message: unknown) => {
+    if (!isBusEnvelope(message)) return;
+    for (const worker of live) {
+      if (worker === from || !worker.isConnected()) continue;
+      const envelope = missedBus.delete(worker) ? { ...message, reset: true } : message;
+      worker.send(envelope, undefined, error => {
+        if (error) missedBus.add(worker);
+      });
+    }
+  };
+
+  const fork = () => {
+    const worker = cluster.fork(workerEnv(count));
+    live.add(worker);
+    worker.on('message', message => relay(worker, message));
+    return worker;
+  };
+
+  const stop = (worker: Worker) =>
+    new Promise<void>(resolve => {
+      if (worker.isDead()) return resolve();
+      retiring.add(worker);
+      worker.once('exit', () => resolve());
+      const timer = setTimeout(() => {
+        console.warn(`[Cluster] Worker ${worker.process.pid} still draining; killing it`);
+        worker.process.kill('SIGKILL');
+      }, WORKER_STOP_TIMEOUT_MS);
+      worker.once('exit', () => clearTimeout(timer));
+      worker.process.kill('SIGTERM');
+    });
+
+  const rollingRestart = async () => {
+    if (restarting || shuttingDown) return;
+    restarting = true;
+    console.log(`[Cluster] Rolling restart of ${live.size} worker(s)`);
+
+    for (const old of [...live]) {
+      if (shuttingDown) break;
+      // Crashed and already respawned since the restart began
+      if (!live.has(old)) continue;
+
+      const replacement = fork();
+      // One that dies while starting is most likely a bad build: don't respawn it in a loop
+      retiring.add(replacement);
+      try {
+        await waitForListening(replacement);
+        retiring.delete(replacement);
+      } catch (error) {
+        // Keep the old workers serving
+        console.error(`[Cluster] Replacement worker failed to start (${(error as Error).message}); stopping the restart`);
+        await stop(replacement);
+        break;
+      }
+      await stop(old);
+    }
+
+    restarting = false;
+    console.log('[Cluster] Rolling restart finished');
+  };
+
+  const shutdown = async (signal: NodeJS.Signals) => {
+    if (shuttingDown) return;
+    shuttingDown = true;
+    console.log(`[Cluster] ${signal}: stopping ${live.size} worker(s)`);
+    await Promise.all([...live].map(stop));
+    process.exit(0);
+  };
+
+  cluster.on('exit', (worker, code, signal) => {
+    live.delete(worker);
+    if (retiring.delete(worker) || shuttingDown) return;
+
+    console.error(`[Cluster] Worker ${worker.process.pid} died (${signal ?? code}); starting a replacement`);
+    setTimeout(() => {
+      if (!shuttingDown) fork();
+    }, RESPAWN_DELAY_MS);
+  });
+
+  process.on('SIGHUP', () => rollingRestart());
+  process.once('SIGTERM', () => shutdown('SIGTERM'));
+  process.once('SIGINT', () => shutdown('SIGINT'));
+
+  console.log(`[Cluster] Primary ${process.pid} starting ${count} worker(s)`);
+  for (let i = 0; i < count; i++) fork();
+}
@@ -0,0 +1,24 @@
+import { BatchLoader } from './batch-loader';
+
+describe('BatchLoader', () => {
+  it('should merge loads from the same tick into one deduplicated batch', async () => {
+    const batch = jest.fn(async (keys: string[]) => new Map(keys.map(key => [key, key.toUpperCase()])));
+    const loader = new BatchLoader(batch);
+
+    const [a, b, again] = await Promise.all([loader.load('a'), loader.load('b'), loader.load('a')]);
+
+    expect([a, b, again]).toEqual(['A', 'B', 'A']);
+    expect(batch).toHaveBeenCalledTimes(1);
+    expect(batch).toHaveBeenCalledWith(['a', 'b']);
+  });
+
+  it('should split batches at the size limit and omit missing keys', async () => {
+    const batch = jest.fn(async (keys: string[]) => new Map(keys.filter(key => key !== 'x').map(key => [key, 1])));
+    const loader = new BatchLoader(batch, 2);
+
+    const results = await loader.loadMany(['a', 'b', 'x']);
+
+    expect([...results.keys()]).toEqual(['a', 'b']);
+    expect(batch).toHaveBeenCalledTimes(2);
+  });
+});
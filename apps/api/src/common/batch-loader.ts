@@ -0,0 +1,43 @@
+/**
+ * DataLoader-style batching: every load() issued in the same tick is collected and
+ * resolved by one call to the batch function, so N concurrent lookups become one
+ * `IN` query. Nothing is cached between batches, which is what lets one loader be
+ * shared by all requests without serving stale rows.
+ */
+export class BatchLoader<K, V> {
+  private pending: { keys: K[]; result?: Promise<Map<K, V>> } | null = null;
+
+  constructor(
+    private readonly batch: (keys: K[]) => Promise<Map<K, V>>,
+    private readonly maxBatchSize: number = 1000
+  ) {}
+
+  async load(key: K): Promise<V | undefined> {
+    return (await this.enqueue(key)).get(key);
+  }
+
+  async loadMany(keys: K[]): Promise<Map<K, V>> {
+    const batches = await Promise.all(keys.map(key => this.enqueue(key)));
+    const results = new Map<K, V>();
+    keys.forEach((key, i) => {
+      const value = batches[i].get(key);
+      if (value !== undefined) results.set(key, value);
+    });
+    return results;
+  }
+
+  private enqueue(key: K): Promise<Map<K, V>> {
+    if (!this.pending || this.pending.keys.length >= this.maxBatchSize) {
+      const pending: { keys: K[]; result?: Promise<Map<K, V>> } = { keys: [] };
+      // Dispatch after the current promise jobs settle, so loads from sibling awaits join in
+      pending.result = new Promise<void>(resolve => process.nextTick(resolve)).then(() => {
+        if (this.pending === pending) this.pending = null;
+        return this.batch([...new Set(pending.keys)]);
+      });
+      this.pending = pending;
+    }
+
+    this.pending.keys.push(key);
+    return this.pending.result!;
+  }
+}
@@ -0,0 +1,53 @@
+import { createServer, IncomingMessage, ServerResponse } from 'http';
+import request from 'supertest';
+import { compression } from './compression';
+
+const large = JSON.stringify({ items: Array.from({ length: 200 }, (_, i) => `item ${i}`) });
+
+const middleware = compression();
+const server = createServer((req: IncomingMessage, res: ServerResponse) => {
+  middleware(req as any, res as any, () => {
+    if (req.url === '/events') {
+      res.setHeader('Content-Type', 'text/event-stream');
+      res.end(large);
+      return;
+    }
+    if (req.url === '/head') {
+      res.writeHead(200, 'OK', { 'Content-Type': 'application/json', 'Content-Length': Buffer.byteLength(large) });
+      res.end(large);
+      return;
+    }
+    if (req.url === '/stream') {
+      res.setHeader('Content-Type', 'text/event-stream');
+      res.setHeader('Cache-Control', 'no-cache, no-transform');
+      res.write('data: {}\n\n');
+      res.end();
+      return;
+    }
+    res.setHeader('Content-Type', 'application/json');
+    res.end(req.url === '/small' ? '{"ok":true}' : large);
+  });
+});
+
+describe('compression', () => {
+  it('should gzip large JSON for clients that accept it', async () => {
+    const res = await request(server).get('/large').set('Accept-Encoding', 'gzip');
+    expect(res.headers['content-encoding']).toBe('gzip');
+    expect(res.headers['vary']).toContain('Accept-Encoding');
+    expect(res.body.items).toHaveLength(200);
+  });
+
+  it('should see headers passed to writeHead', async () => {
+    const res = await request(server).get('/head').set('Accept-Encoding', 'gzip');
+    expect(res.headers['content-encoding']).toBe('gzip');
+    expect(res.headers['content-length']).toBeUndefined();
+    expect(res.body.items).toHaveLength(200);
+  });
+
+  it('should leave small bodies, no-transform streams and non-gzip clients alone', async () => {
+    expect((await request(server).get('/small').set('Accept-Encoding', 'gzip')).headers['content-encoding']).toBeUndefined();
+    expect((await request(server).get('/stream').set('Accept-Encoding', 'gzip')).headers['content-encoding']).toBeUndefined();
+    expect((await request(server).get('/events').set('Accept-Encoding', 'gzip')).headers['content-encoding']).toBeUndefined();
+    expect((await request(server).get('/large').set('Accept-Encoding', 'identity')).headers['content-encoding']).toBeUndefined();
+  });
+});
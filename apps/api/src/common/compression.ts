@@ -0,0 +1,106 @@
+import type { NextFunction, Request, Response } from 'express';
+import { constants, createGzip, Gzip } from 'zlib';
+
+// Below this a gzip frame saves little and costs a deflate stream
+const COMPRESSION_THRESHOLD_BYTES = 1024;
+// JSON and text; images are already compressed
+const COMPRESSIBLE_TYPES = /^(application\/(json|javascript)|text\/)/;
+// Events must reach the client as they're written, not sit in a deflate buffer
+const STREAMING_TYPES = /^text\/event-stream/;
+
+function shouldCompress(req: Request, res: Response) {
+  if (req.method === 'HEAD' || res.statusCode === 204 || res.statusCode === 304) return false;
+  if (res.getHeader('Content-Encoding')) return false;
+  // The SSE stream sends no-transform so events are never held back in a deflate buffer
+  if (/\bno-transform\b/.test(String(res.getHeader('Cache-Control') ?? ''))) return false;
+  const type = String(res.getHeader('Content-Type') ?? '');
+  if (!COMPRESSIBLE_TYPES.test(type) || STREAMING_TYPES.test(type)) return false;
+
+  const length = res.getHeader('Content-Length');
+  return length === undefined || Number(length) >= COMPRESSION_THRESHOLD_BYTES;
+}
+
+function appendVary(res: Response, field: string) {
+  const vary = String(res.getHeader('Vary') ?? '');
+  if (!vary.split(',').some(value => value.trim().toLowerCase() === field.toLowerCase())) {
+    res.setHeader('Vary', vary ? `${vary}, ${field}` : field);
+  }
+}
+
+/**
+ * Gzips text responses for clients that accept it. The decision is made when the
+ * headers go out, so it sees the final status, type and length of the response,
+ * including headers passed to writeHead itself. Like the `compression` package it
+ * adds res.flush() for handlers that stream, and it tears the gzip stream down when
+ * the client goes away mid-response.
+ */
+export function compression() {
+  return (req: Request, res: Response, next: NextFunction) => {
+    const acceptsGzip = /\bgzip\b/.test(String(req.headers['accept-encoding'] ?? ''));
+    const write = res.write.bind(res) as (chunk: any, encoding?: any, cb?: any) => boolean;
+    const end = res.end.bind(res) as (chunk?: any, encoding?: any, cb?: any) => Response;
+    const writeHead = res.writeHead;
+    let gzip: Gzip | null = null;
+
+    res.writeHead = function (this: Response, statusCode: number, ...rest: any[]) {
+      // writeHead(status, [reason], [headers]): fold the headers in so the checks below see them
+      const reason = typeof rest[0] === 'string' ? rest.shift() : undefined;
+      const headers = rest[0];
+      if (Array.isArray(headers)) {
+        for (let i = 0; i + 1 < headers.length; i += 2) res.setHeader(headers[i], headers[i + 1]);
+      } else if (headers) {
+        for (const [name, value] of Object.entries(headers)) {
+          if (value !== undefined) res.setHeader(name, value as any);
+        }
+      }
+      res.statusCode = statusCode;
+
+      if (COMPRESSIBLE_TYPES.test(String(res.getHeader('Content-Type') ?? ''))) appendVary(res, 'Accept-Encoding');
+      if (acceptsGzip && shouldCompress(req, res)) {
+        res.removeHeader('Content-Length');
+        res.setHeader('Content-Encoding', 'gzip');
+        gzip = createGzip();
+        gzip.on('data', chunk => {
+          if (!write(chunk)) gzip!.pause();
+        });
+        res.on('drain', () => gzip!.resume());
+        gzip.on('end', () => end());
+      }
+      return reason === undefined ? writeHead.call(this, statusCode) : writeHead.call(this, statusCode, reason);
+    } as typeof res.writeHead;
+
+    // Pushes out what's been written so far, for responses sent in pieces
+    (res as Response & { flush: () => void }).flush = () => {
+      gzip?.flush(constants.Z_SYNC_FLUSH);
+    };
+
+    // A client that disconnects never drains the response; don't leave the deflate stream behind
+    res.once('close', () => {
+      if (gzip && !res.writableFinished) gzip.destroy();
+    });
+
+    res.write = function (chunk: any, encoding?: any, cb?: any) {
+      if (!res.headersSent) res.writeHead(res.statusCode);
+      if (!gzip) return write(chunk, encoding, cb);
+      return gzip.write(chunk, typeof encoding === 'string' ? (encoding as BufferEncoding) : 'utf8', typeof encoding === 'function' ? encoding : cb);
+    } as typeof res.write;
+
+    res.end = function (chunk?: any, encoding?: any, cb?: any) {
+      if (typeof chunk === 'function') [cb, chunk] = [chunk, undefined];
+      if (typeof encoding === 'function') [cb, encoding] = [encoding, undefined];
+      // res.send sets Content-Length, but a bare end(body) may not; size it for the threshold check
+      if (!res.headersSent && chunk !== undefined && res.getHeader('Content-Length') === undefined) {
+        res.setHeader('Content-Length', Buffer.byteLength(chunk, encoding));
+      }
+      if (!res.headersSent) res.writeHead(res.statusCode);
+      if (!gzip) return end(chunk, encoding, cb);
+
+      if (cb) res.once('finish', cb);
+      if (chunk !== undefined) gzip.write(chunk, encoding ?? 'utf8');
+      gzip.end();
+      return res;
+    } as typeof res.end;
+
+    next();
+  };
+}
@@ -0,0 +1,15 @@
+import { BadRequestException } from '@nestjs/common';
+import { decodeCursor, encodeCursor } from './cursor';
+
+describe('cursor', () => {
+  it('should round-trip createdAt and id', () => {
+    const createdAt = new Date('2025-12-16T05:53:10.023Z');
+    const cursor = encodeCursor({ createdAt, id: 'ckabc123' });
+
+    expect(decodeCursor(cursor)).toEqual({ createdAt, id: 'ckabc123' });
+  });
+
+  it('should reject malformed cursors', () => {
+    expect(() => decodeCursor('not-a-cursor')).toThrow(BadRequestException);
+  });
+});
@@ -0,0 +1,31 @@
+import { BadRequestException } from '@nestjs/common';
+
+export interface Cursor {
+  createdAt: Date;
+  id: string;
+}
+
+/**
+ * Opaque keyset cursor for newest-first lists (feeds, notifications, messages).
+ * Encodes the (createdAt, id) pair of the last row so the next page can
+ * seek past it instead of scanning/skipping everything before it.
+ */
+export function encodeCursor(row: { createdAt: Date; id: string }): string {
+  return Buffer.from(`${row.createdAt.toISOString()}|${row.id}`, 'utf8').toString('base64url');
+}
+
+export function decodeCursor(cursor: string): Cursor {
+  const raw = Buffer.from(cursor, 'base64url').toString('utf8');
+  const separator = raw.indexOf('|');
+  if (separator === -1) {
+    throw new BadRequestException('Invalid cursor');
+  }
+
+  const createdAt = new Date(raw.slice(0, separator));
+  const id = raw.slice(separator + 1);
+  if (Number.isNaN(createdAt.getTime()) || !id) {
+    throw new BadRequestException('Invalid cursor');
+  }
+
+  return { createdAt, id };
+}
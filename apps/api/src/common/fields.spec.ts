@@ -0,0 +1,20 @@
+import { parseFields, selectFields } from './fields';
+
+describe('fields', () => {
+  const tweet = {
+    id: 't1',
+    content: 'hello',
+    authorId: 'u1',
+    author: { id: 'u1', username: 'bob', avatar: null },
+  };
+
+  it('should keep only the selected paths', () => {
+    const selection = parseFields('id, content,author.username');
+
+    expect(selectFields([tweet], selection)).toEqual([{ id: 't1', content: 'hello', author: { username: 'bob' } }]);
+  });
+
+  it('should return the value untouched without a selection', () => {
+    expect(selectFields(tweet, parseFields(''))).toBe(tweet);
+  });
+});
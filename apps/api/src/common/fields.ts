@@ -0,0 +1,44 @@
+/**
+ * Sparse fieldsets: `?fields=id,content,author.username` keeps only the listed paths of
+ * each returned object, so clients download what they render rather than whole rows.
+ */
+export interface FieldSelection {
+  [field: string]: FieldSelection | true;
+}
+
+export function parseFields(fields?: string): FieldSelection | null {
+  const paths = (fields ?? '').split(',').map(path => path.trim()).filter(Boolean);
+  if (paths.length === 0) return null;
+
+  const selection: FieldSelection = {};
+  for (const path of paths) {
+    const parts = path.split('.');
+    const leaf = parts.pop()!;
+    let node: FieldSelection | undefined = selection;
+    for (const part of parts) {
+      const child: FieldSelection | true | undefined = node[part];
+      // A parent that was already selected whole stays whole
+      if (child === true) {
+        node = undefined;
+        break;
+      }
+      node = child ?? (node[part] = {});
+    }
+    if (node) node[leaf] = true;
+  }
+  return selection;
+}
+
+export function selectFields<T>(value: T, selection: FieldSelection | null): T;
+export function selectFields(value: unknown, selection: FieldSelection | null): unknown {
+  if (!selection || value === null || typeof value !== 'object' || value instanceof Date) return value;
+  if (Array.isArray(value)) return value.map(item => selectFields(item, selection));
+
+  const source = value as Record<string, unknown>;
+  const picked: Record<string, unknown> = {};
+  for (const [field, child] of Object.entries(selection)) {
+    if (!(field in source)) continue;
+    picked[field] = child === true ? source[field] : selectFields(source[field], child);
+  }
+  return picked;
+}
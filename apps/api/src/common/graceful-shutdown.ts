@@ -0,0 +1,52 @@
+import type { INestApplication } from '@nestjs/common';
+import type { IncomingMessage, Server, ServerResponse } from 'http';
+
+// In-flight requests get this long to finish once shutdown starts
+const SHUTDOWN_DRAIN_TIMEOUT_MS = parseInt(process.env.SHUTDOWN_DRAIN_TIMEOUT_MS ?? '10000');
+const DRAIN_POLL_MS = 100;
+
+// SSE streams never finish on their own; RealtimeService ends them when the app closes
+function isEventStream(res: ServerResponse) {
+  return String(res.getHeader('Content-Type') ?? '').startsWith('text/event-stream');
+}
+
+/**
+ * On SIGTERM/SIGINT: stop accepting connections, let in-flight requests finish, then
+ * close the app, which flushes the write-behind buffers and ends SSE streams.
+ * Nest's own shutdown hooks tear the modules down first, failing requests still running
+ * against them; during a rolling restart that would drop a request per worker replaced.
+ */
+export function enableGracefulShutdown(app: INestApplication) {
+  const server: Server = app.getHttpServer();
+  const inFlight = new Set<ServerResponse>();
+  server.on('request', (req: IncomingMessage, res: ServerResponse) => {
+    inFlight.add(res);
+    res.on('close', () => inFlight.delete(res));
+  });
+
+  let stopping = false;
+  const shutdown = async (signal: NodeJS.Signals) => {
+    if (stopping) return;
+    stopping = true;
+    console.log(`[Shutdown] ${signal}: draining ${inFlight.size} open request(s)`);
+
+    // In a cluster worker this also takes it out of the primary's rotation
+    server.close();
+    const deadline = Date.now() + SHUTDOWN_DRAIN_TIMEOUT_MS;
+    while (Date.now() < deadline && [...inFlight].some(res => !isEventStream(res))) {
+      // Keep-alive sockets that went idle since the last pass
+      server.closeIdleConnections();
+      await new Promise(resolve => setTimeout(resolve, DRAIN_POLL_MS));
+    }
+
+    try {
+      await app.close();
+      process.exit(0);
+    } catch (error) {
+      console.error('[Shutdown] Failed to close cleanly:', error);
+      process.exit(1);
+    }
+  };
+
+  (['SIGTERM', 'SIGINT'] as const).forEach(signal => process.once(signal, () => shutdown(signal)));
+}
@@ -0,0 +1,25 @@
+import { LruCache } from './lru-cache';
+
+describe('LruCache', () => {
+  it('should evict the least recently used entry', () => {
+    const cache = new LruCache<string, number>(2);
+    cache.set('a', 1);
+    cache.set('b', 2);
+    cache.get('a');
+    cache.set('c', 3);
+
+    expect(cache.get('a')).toBe(1);
+    expect(cache.get('b')).toBeUndefined();
+    expect(cache.get('c')).toBe(3);
+  });
+
+  it('should expire entries after their ttl', () => {
+    jest.useFakeTimers();
+    const cache = new LruCache<string, number>(10, 1000);
+    cache.set('a', 1);
+
+    jest.advanceTimersByTime(1001);
+    expect(cache.get('a')).toBeUndefined();
+    jest.useRealTimers();
+  });
+});
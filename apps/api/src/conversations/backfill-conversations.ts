@@ -0,0 +1,14 @@
+import { NestFactory } from '@nestjs/core';
+import { AppModule } from '../app.module';
+import { ConversationsService } from './conversations.service';
+
+// Usage: pnpm --filter api conversations:backfill (run once after db:push adds dmKey/lastMessage columns)
+async function backfill() {
+  const app = await NestFactory.createApplicationContext(AppModule);
+  try {
+    await app.get(ConversationsService).backfillDenormalizedFields();
+  } finally {
+    await app.close();
+  }
+}
+backfill();
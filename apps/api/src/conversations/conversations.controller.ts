@@ -1,4 +1,4 @@
-import { Controller, Get, Post, Body, Param, UseGuards, Request } from '@nestjs/common';
+import { Controller, Get, Post, Body, Param, UseGuards, Request, Query } from '@nestjs/common';
 import { ConversationsService } from './conversations.service';
 import { AuthGuard } from '@nestjs/passport';
 
@@ -18,8 +18,9 @@ export class ConversationsController {
   }
 
   @Get(':id/messages')
-  async getMessages(@Param('id') id: string, @Request() req: any) {
-    return this.conversationsService.getMessages(id, req.user.userId);
+  async getMessages(@Param('id') id: string, @Request() req: any, @Query('before') before?: string, @Query('limit') limit?: string) {
+    const limitNum = limit ? Math.min(parseInt(limit), 100) : 30;
+    return this.conversationsService.getMessages(id, req.user.userId, before, limitNum);
   }
 
   @Post(':id/messages')
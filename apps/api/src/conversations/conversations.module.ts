@@ -3,9 +3,10 @@ import { ConversationsService } from './conversations.service';
 import { ConversationsController } from './conversations.controller';
 import { JwtModule } from '@nestjs/jwt';
 import { UsersModule } from '../users/users.module';
+import { RealtimeModule } from '../realtime/realtime.module';
 
 @Module({
-  imports: [JwtModule, UsersModule],
+  imports: [JwtModule, UsersModule, RealtimeModule],
   controllers: [ConversationsController],
   providers: [ConversationsService],
   exports: [ConversationsService],
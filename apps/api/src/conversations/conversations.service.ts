@@ -1,114 +1,132 @@
 import { Injectable, NotFoundException } from '@nestjs/common';
 import { PrismaService } from '../prisma/prisma.service';
 import { Prisma } from '@repo/database';
+import { decodeCursor, encodeCursor } from '../common/cursor';
+import { RealtimeService } from '../realtime/realtime.service';
+
+const PARTICIPANTS_INCLUDE = {
+  participants: {
+    include: {
+      user: {
+        select: {
+          id: true,
+          name: true,
+          username: true,
+          avatar: true
+        }
+      }
+    }
+  }
+} satisfies Prisma.ConversationInclude;
+
+// Order-independent key for a two-person conversation
+function toDmKey(userId: string, otherUserId: string) {
+  return [userId, otherUserId].sort().join(':');
+}
 
 @Injectable()
 export class ConversationsService {
-  constructor(private prisma: PrismaService) {}
+  constructor(
+    private prisma: PrismaService,
+    private realtimeService: RealtimeService
+  ) {}
 
   async createOrGet(userId: string, otherUserId: string) {
     if (userId === otherUserId) {
       throw new Error("Cannot chat with yourself");
     }
 
-    // Check if conversation exists
-    const existing = await this.prisma.conversation.findFirst({
-      where: {
-        AND: [
-          { participants: { some: { userId } } },
-          { participants: { some: { userId: otherUserId } } }
-        ]
-      },
-      include: {
-        participants: {
-          include: {
-            user: {
-              select: {
-                id: true,
-                name: true,
-                username: true,
-                avatar: true
-              }
-            }
-          }
-        }
-      }
+    const dmKey = toDmKey(userId, otherUserId);
+    const existing = await this.prisma.conversation.findUnique({
+      where: { dmKey },
+      include: PARTICIPANTS_INCLUDE
     });
 
     if (existing) return existing;
 
     // Create new conversation
-    return this.prisma.conversation.create({
-      data: {
-        participants: {
-          create: [
-            { userId: userId },
-            { userId: otherUserId }
-          ]
-        }
-      },
-      include: {
-        participants: {
-          include: {
-            user: {
-              select: {
-                id: true,
-                name: true,
-                username: true,
-                avatar: true
-              }
-            }
+    try {
+      return await this.prisma.conversation.create({
+        data: {
+          dmKey,
+          participants: {
+            create: [
+              { userId: userId },
+              { userId: otherUserId }
+            ]
           }
-        }
+        },
+        include: PARTICIPANTS_INCLUDE
+      });
+    } catch (error) {
+      // Both users opened the DM at once; the unique dmKey lets the loser read the winner's row
+      if (error instanceof Prisma.PrismaClientKnownRequestError && error.code === 'P2002') {
+        return this.prisma.conversation.findUniqueOrThrow({
+          where: { dmKey },
+          include: PARTICIPANTS_INCLUDE
+        });
       }
-    });
+      throw error;
+    }
   }
 
   async findAll(userId: string) {
-    return this.prisma.conversation.findMany({
-      where: {
-        participants: {
-          some: { userId }
-        }
-      },
-      include: {
-        participants: {
-          include: {
-            user: {
-              select: {
-                id: true,
-                name: true,
-                username: true,
-                avatar: true
-              }
-            }
-          }
-        },
-        messages: {
-          orderBy: { createdAt: 'desc' },
-          take: 1
+    const memberships = await this.prisma.conversationParticipant.findMany({
+      where: { userId },
+      orderBy: { lastMessageAt: 'desc' },
+      select: {
+        unreadCount: true,
+        hasSeenLatest: true,
+        conversation: {
+          include: PARTICIPANTS_INCLUDE
         }
-      },
-      orderBy: { updatedAt: 'desc' }
+      }
     });
+
+    return memberships.map(membership => ({
+      ...membership.conversation,
+      unreadCount: membership.unreadCount,
+      hasSeenLatest: membership.hasSeenLatest,
+    }));
   }
 
-  async getMessages(conversationId: string, userId: string) {
-    // Verify participation
-    const participation = await this.prisma.conversationParticipant.findUnique({
-      where: {
-        userId_conversationId: {
-          userId,
-          conversationId
+  /**
+   * Returns one page of history, newest first. Pass the returned `nextCursor` as
+   * `before` to load older messages. Opening the latest page also clears the unread count.
+   */
+  async getMessages(conversationId: string, userId: string, before?: string, limit: number = 30) {
+    if (before) {
+      const participation = await this.prisma.conversationParticipant.findUnique({
+        where: {
+          userId_conversationId: {
+            userId,
+            conversationId
+          }
         }
-      }
-    });
-
-    if (!participation) throw new NotFoundException('Conversation not found');
+      });
+      if (!participation) throw new NotFoundException('Conversation not found');
+    } else {
+      // Doubles as the participation check: no row updated means the user isn't in this conversation
+      const { count } = await this.prisma.conversationParticipant.updateMany({
+        where: { userId, conversationId },
+        data: { unreadCount: 0, hasSeenLatest: true }
+      });
+      if (count === 0) throw new NotFoundException('Conversation not found');
+    }
 
-    return this.prisma.message.findMany({
-      where: { conversationId },
-      orderBy: { createdAt: 'asc' },
+    const cursor = before ? decodeCursor(before) : null;
+    const rows = await this.prisma.message.findMany({
+      where: {
+        conversationId,
+        ...(cursor ? {
+          OR: [
+            { createdAt: { lt: cursor.createdAt } },
+            { createdAt: cursor.createdAt, id: { lt: cursor.id } },
+          ],
+        } : {}),
+      },
+      orderBy: [{ createdAt: 'desc' }, { id: 'desc' }],
+      take: limit + 1,
       include: {
         sender: {
           select: {
@@ -120,45 +138,114 @@ export class ConversationsService {
         }
       }
     });
+
+    const hasMore = rows.length > limit;
+    const messages = hasMore ? rows.slice(0, limit) : rows;
+
+    return {
+      messages,
+      nextCursor: hasMore ? encodeCursor(messages[messages.length - 1]) : null,
+    };
   }
 
   async sendMessage(conversationId: string, userId: string, content: string) {
-     // Verify participation
-    const participation = await this.prisma.conversationParticipant.findUnique({
-      where: {
-        userId_conversationId: {
-          userId,
-          conversationId
-        }
-      }
-    });
+    const sentAt = new Date();
 
-    if (!participation) throw new NotFoundException('Conversation not found');
+    const { message, recipientIds } = await this.prisma.$transaction(async (tx) => {
+      // Doubles as the participation check; the sender has by definition seen the latest message
+      const { count } = await tx.conversationParticipant.updateMany({
+        where: { userId, conversationId },
+        data: { unreadCount: 0, hasSeenLatest: true, lastMessageAt: sentAt }
+      });
+      if (count === 0) throw new NotFoundException('Conversation not found');
 
-    const message = await this.prisma.message.create({
-      data: {
-        content,
-        conversationId,
-        senderId: userId
-      },
-      include: {
-        sender: {
-          select: {
-             id: true,
-             name: true,
-             username: true,
-             avatar: true
+      const message = await tx.message.create({
+        data: {
+          content,
+          conversationId,
+          senderId: userId,
+          createdAt: sentAt
+        },
+        include: {
+          sender: {
+            select: {
+               id: true,
+               name: true,
+               username: true,
+               avatar: true
+            }
           }
         }
-      }
-    });
+      });
 
-    // Update conversation timestamp
-    await this.prisma.conversation.update({
-      where: { id: conversationId },
-      data: { updatedAt: new Date() }
+      await tx.conversationParticipant.updateMany({
+        where: { conversationId, userId: { not: userId } },
+        data: { unreadCount: { increment: 1 }, hasSeenLatest: false, lastMessageAt: sentAt }
+      });
+
+      const conversation = await tx.conversation.update({
+        where: { id: conversationId },
+        data: {
+          lastMessageContent: content,
+          lastMessageSenderId: userId,
+          lastMessageAt: sentAt
+        },
+        select: { participants: { select: { userId: true } } }
+      });
+
+      return { message, recipientIds: conversation.participants.map(participant => participant.userId) };
     });
 
+    // After commit, so a client that refetches on the event always finds the message.
+    // The sender is included to keep their other tabs in sync.
+    this.realtimeService.publish(recipientIds, 'message', message);
     return message;
   }
+
+  /**
+   * One-off backfill for conversations created before dmKey and the last-message
+   * columns existed. Safe to re-run; only fills rows that are still empty.
+   */
+  async backfillDenormalizedFields() {
+    // Duplicate DMs for the same pair keep the oldest conversation as the keyed one
+    const keyed = await this.prisma.$executeRaw`
+      UPDATE "Conversation" c SET "dmKey" = k."dmKey"
+      FROM (
+        SELECT DISTINCT ON (pairs."dmKey") pairs."conversationId", pairs."dmKey"
+        FROM (
+          SELECT p."conversationId", string_agg(p."userId", ':' ORDER BY p."userId" COLLATE "C") AS "dmKey"
+          FROM "ConversationParticipant" p
+          GROUP BY p."conversationId"
+          HAVING count(*) = 2
+        ) pairs
+        JOIN "Conversation" conv ON conv."id" = pairs."conversationId"
+        ORDER BY pairs."dmKey", conv."createdAt" ASC
+      ) k
+      WHERE c."id" = k."conversationId"
+        AND c."dmKey" IS NULL
+        AND NOT EXISTS (SELECT 1 FROM "Conversation" d WHERE d."dmKey" = k."dmKey")
+    `;
+
+    const summarized = await this.prisma.$executeRaw`
+      UPDATE "Conversation" c SET
+        "lastMessageContent" = m."content",
+        "lastMessageSenderId" = m."senderId",
+        "lastMessageAt" = m."createdAt"
+      FROM (
+        SELECT DISTINCT ON ("conversationId") "conversationId", "content", "senderId", "createdAt"
+        FROM "Message"
+        ORDER BY "conversationId", "createdAt" DESC, "id" DESC
+      ) m
+      WHERE c."id" = m."conversationId" AND c."lastMessageAt" IS NULL
+    `;
+
+    await this.prisma.$executeRaw`
+      UPDATE "ConversationParticipant" p SET "lastMessageAt" = COALESCE(c."lastMessageAt", c."createdAt")
+      FROM "Conversation" c
+      WHERE p."conversationId" = c."id"
+    `;
+
+    console.log(`[ConversationsService] Backfilled ${keyed} DM keys and ${summarized} last-message summaries`);
+    return { keyed, summarized };
+  }
 }
@@ -0,0 +1,97 @@
+import { Injectable } from '@nestjs/common';
+import { PrismaService } from '../prisma/prisma.service';
+
+/**
+ * Repairs drift in the denormalized Tweet/User counters.
+ * Writes keep them exact in the common path, but cascaded deletes and manual
+ * data fixes bypass that, so this recomputes them in id-ordered batches.
+ */
+@Injectable()
+export class CountersService {
+  constructor(private prisma: PrismaService) {}
+
+  async reconcileTweets(batchSize: number = 1000) {
+    let cursor: string | undefined;
+    let fixed = 0;
+
+    while (true) {
+      const tweets = await this.prisma.tweet.findMany({
+        select: { id: true },
+        orderBy: { id: 'asc' },
+        take: batchSize,
+        ...(cursor ? { skip: 1, cursor: { id: cursor } } : {}),
+      });
+      if (tweets.length === 0) break;
+
+      const ids = tweets.map(tweet => tweet.id);
+      fixed += await this.prisma.$executeRaw`
+        UPDATE "Tweet" t SET
+          "likesCount" = c."likes",
+          "repliesCount" = c."replies",
+          "retweetsCount" = c."retweets",
+          "quotesCount" = c."quotes"
+        FROM (
+          SELECT x."id",
+            (SELECT count(*) FROM "Like" l WHERE l."tweetId" = x."id")::int AS "likes",
+            (SELECT count(*) FROM "Tweet" r WHERE r."parentId" = x."id")::int AS "replies",
+            (SELECT count(*) FROM "Tweet" r WHERE r."retweetId" = x."id")::int AS "retweets",
+            (SELECT count(*) FROM "Tweet" q WHERE q."quoteId" = x."id")::int AS "quotes"
+          FROM "Tweet" x
+          WHERE x."id" = ANY(${ids})
+        ) c
+        WHERE t."id" = c."id"
+          AND (t."likesCount", t."repliesCount", t."retweetsCount", t."quotesCount")
+            IS DISTINCT FROM (c."likes", c."replies", c."retweets", c."quotes")
+      `;
+      cursor = ids[ids.length - 1];
+    }
+
+    return fixed;
+  }
+
+  async reconcileUsers(batchSize: number = 1000) {
+    let cursor: string | undefined;
+    let fixed = 0;
+
+    while (true) {
+      const users = await this.prisma.user.findMany({
+        select: { id: true },
+        orderBy: { id: 'asc' },
+        take: batchSize,
+        ...(cursor ? { skip: 1, cursor: { id: cursor } } : {}),
+      });
+      if (users.length === 0) break;
+
+      const ids = users.map(user => user.id);
+      fixed += await this.prisma.$executeRaw`
+        UPDATE "User" u SET
+          "followersCount" = c."followers",
+          "followingCount" = c."following",
+          "tweetsCount" = c."tweets",
+          "unreadNotifications" = c."unread"
+        FROM (
+          SELECT x."id",
+            (SELECT count(*) FROM "Follow" f WHERE f."followingId" = x."id")::int AS "followers",
+            (SELECT count(*) FROM "Follow" f WHERE f."followerId" = x."id")::int AS "following",
+            (SELECT count(*) FROM "Tweet" t WHERE t."authorId" = x."id")::int AS "tweets",
+            (SELECT count(*) FROM "Notification" n WHERE n."userId" = x."id" AND NOT n."read")::int AS "unread"
+          FROM "User" x
+          WHERE x."id" = ANY(${ids})
+        ) c
+        WHERE u."id" = c."id"
+          AND (u."followersCount", u."followingCount", u."tweetsCount", u."unreadNotifications")
+            IS DISTINCT FROM (c."followers", c."following", c."tweets", c."unread")
+      `;
+      cursor = ids[ids.length - 1];
+    }
+
+    return fixed;
+  }
+
+  async reconcile() {
+    const tweets = await this.reconcileTweets();
+    const users = await this.reconcileUsers();
+    console.log(`[CountersService] Reconciled counters: ${tweets} tweets, ${users} users fixed`);
+    return { tweets, users };
+  }
+}
@@ -0,0 +1,14 @@
+import { NestFactory } from '@nestjs/core';
+import { AppModule } from '../app.module';
+import { CountersService } from './counters.service';
+
+// Usage: pnpm --filter api counters:reconcile (safe to run from cron while the API is serving)
+async function reconcile() {
+  const app = await NestFactory.createApplicationContext(AppModule);
+  try {
+    await app.get(CountersService).reconcile();
+  } finally {
+    await app.close();
+  }
+}
+reconcile();
@@ -0,0 +1,11 @@
+import { Module } from '@nestjs/common';
+import { LikesService } from './likes.service';
+import { NotificationsModule } from '../notifications/notifications.module';
+import { ViewerStateModule } from '../viewer-state/viewer-state.module';
+
+@Module({
+  imports: [NotificationsModule, ViewerStateModule],
+  providers: [LikesService],
+  exports: [LikesService],
+})
+export class LikesModule {}
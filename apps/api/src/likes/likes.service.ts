@@ -0,0 +1,219 @@
+import { Injectable, NotFoundException, OnModuleInit, OnModuleDestroy } from '@nestjs/common';
+import { randomUUID } from 'crypto';
+import { PrismaService } from '../prisma/prisma.service';
+import { Prisma } from '@repo/database';
+import { NotificationsService } from '../notifications/notifications.service';
+import { ViewerStateService } from '../viewer-state/viewer-state.service';
+
+// 0 writes every like straight through. A positive value buffers likes for that long,
+// so a burst on one hot tweet becomes a single insert and a single counter update.
+const LIKE_WRITE_BEHIND_MS = parseInt(process.env.LIKE_WRITE_BEHIND_MS ?? '0');
+const LIKE_MAX_BATCH = 1000;
+
+interface PendingLike {
+  userId: string;
+  tweetId: string;
+  liked: boolean;
+}
+
+@Injectable()
+export class LikesService implements OnModuleInit, OnModuleDestroy {
+  // Keyed by tweet and user, so only the latest intent per pair is written
+  private pending = new Map<string, PendingLike>();
+  private flushTimer?: NodeJS.Timeout;
+  private flushing: Promise<void> = Promise.resolve();
+
+  constructor(
+    private prisma: PrismaService,
+    private notificationsService: NotificationsService,
+    private viewerStateService: ViewerStateService
+  ) {}
+
+  onModuleInit() {
+    if (LIKE_WRITE_BEHIND_MS <= 0) return;
+    this.flushTimer = setInterval(() => this.flush(), LIKE_WRITE_BEHIND_MS);
+    this.flushTimer.unref();
+  }
+
+  async onModuleDestroy() {
+    clearInterval(this.flushTimer);
+    await this.flush();
+  }
+
+  /** Idempotent: liking an already-liked tweet is a no-op. */
+  async like(tweetId: string, userId: string) {
+    this.viewerStateService.recordLike(userId, tweetId, true);
+    if (LIKE_WRITE_BEHIND_MS > 0) {
+      this.buffer({ userId, tweetId, liked: true });
+    } else {
+      await this.insertLike(tweetId, userId);
+    }
+    return { liked: true };
+  }
+
+  /** Idempotent: unliking a tweet that isn't liked is a no-op. */
+  async unlike(tweetId: string, userId: string) {
+    this.viewerStateService.recordLike(userId, tweetId, false);
+    if (LIKE_WRITE_BEHIND_MS > 0) {
+      this.buffer({ userId, tweetId, liked: false });
+    } else {
+      await this.deleteLike(tweetId, userId);
+    }
+    return { liked: false };
+  }
+
+  /**
+   * Kept for clients that still POST to toggle. Prefer like/unlike, which say
+   * what the client wants and so stay correct under retries and double clicks.
+   */
+  async toggle(tweetId: string, userId: string) {
+    if (LIKE_WRITE_BEHIND_MS > 0) {
+      const pending = this.pending.get(`${tweetId}:${userId}`);
+      const liked = pending
+        ? pending.liked
+        : !!(await this.prisma.like.findUnique({ where: { userId_tweetId: { userId, tweetId } }, select: { id: true } }));
+      return liked ? this.unlike(tweetId, userId) : this.like(tweetId, userId);
+    }
+
+    // Unlike first: a removed row means it was liked, otherwise this is a like
+    if (await this.deleteLike(tweetId, userId)) {
+      this.viewerStateService.recordLike(userId, tweetId, false);
+      return { liked: false };
+    }
+    return this.like(tweetId, userId);
+  }
+
+  flush(): Promise<void> {
+    // Chained so a size-triggered flush never overlaps the interval one
+    this.flushing = this.flushing.then(() => this.drain());
+    return this.flushing;
+  }
+
+  // The insert and the counter bump are one statement, so concurrent likes can't
+  // race into a unique violation or a counter that disagrees with the Like rows
+  private async insertLike(tweetId: string, userId: string) {
+    let inserted: { authorId: string }[];
+    try {
+      inserted = await this.prisma.$queryRaw<{ authorId: string }[]>`
+        WITH inserted AS (
+          INSERT INTO "Like" ("id", "userId", "tweetId", "createdAt")
+          VALUES (${randomUUID()}, ${userId}, ${tweetId}, NOW())
+          ON CONFLICT ("userId", "tweetId") DO NOTHING
+          RETURNING "tweetId"
+        )
+        UPDATE "Tweet" t SET "likesCount" = t."likesCount" + 1
+        FROM inserted
+        WHERE t."id" = inserted."tweetId"
+        RETURNING t."authorId"
+      `;
+    } catch (error) {
+      // Foreign key violation: the tweet doesn't exist
+      if (error instanceof Prisma.PrismaClientKnownRequestError && error.meta?.code === '23503') {
+        throw new NotFoundException('Tweet not found');
+      }
+      throw error;
+    }
+
+    if (inserted.length > 0) {
+      this.notificationsService.enqueue({
+        type: 'LIKE',
+        userId: inserted[0].authorId,
+        issuerId: userId,
+        tweetId,
+      });
+    }
+  }
+
+  private async deleteLike(tweetId: string, userId: string) {
+    const removed = await this.prisma.$executeRaw`
+      WITH deleted AS (
+        DELETE FROM "Like" WHERE "userId" = ${userId} AND "tweetId" = ${tweetId}
+        RETURNING "tweetId"
+      )
+      UPDATE "Tweet" t SET "likesCount" = t."likesCount" - 1
+      FROM deleted
+      WHERE t."id" = deleted."tweetId"
+    `;
+    return removed > 0;
+  }
+
+  private buffer(like: PendingLike) {
+    const key = `${like.tweetId}:${like.userId}`;
+    // Re-insert so a changed intent moves to the back of the queue
+    this.pending.delete(key);
+    this.pending.set(key, like);
+    if (this.pending.size >= LIKE_MAX_BATCH) {
+      this.flush();
+    }
+  }
+
+  private async drain() {
+    while (this.pending.size > 0) {
+      const batch = [...this.pending.values()].slice(0, LIKE_MAX_BATCH);
+      batch.forEach(like => this.pending.delete(`${like.tweetId}:${like.userId}`));
+      try {
+        await this.write(batch);
+      } catch (error) {
+        console.error('[LikesService] Failed to write like batch:', error);
+      }
+    }
+  }
+
+  private async write(batch: PendingLike[]) {
+    const likes = batch.filter(like => like.liked);
+    const unlikes = batch.filter(like => !like.liked);
+
+    if (likes.length > 0) {
+      const rows = likes.map(like => Prisma.sql`(${randomUUID()}, ${like.userId}, ${like.tweetId})`);
+      // Joining Tweet drops likes on tweets deleted since they were buffered,
+      // which would otherwise fail the whole batch on the foreign key
+      const inserted = await this.prisma.$queryRaw<{ userId: string; tweetId: string; authorId: string }[]>`
+        WITH incoming ("id", "userId", "tweetId") AS (
+          VALUES ${Prisma.join(rows)}
+        ),
+        inserted AS (
+          INSERT INTO "Like" ("id", "userId", "tweetId", "createdAt")
+          SELECT i."id", i."userId", i."tweetId", NOW()
+          FROM incoming i
+          JOIN "Tweet" t ON t."id" = i."tweetId"
+          ON CONFLICT ("userId", "tweetId") DO NOTHING
+          RETURNING "userId", "tweetId"
+        ),
+        counted AS (
+          UPDATE "Tweet" t SET "likesCount" = t."likesCount" + c."count"
+          FROM (SELECT "tweetId", count(*)::int AS "count" FROM inserted GROUP BY "tweetId") c
+          WHERE t."id" = c."tweetId"
+          RETURNING t."id", t."authorId"
+        )
+        SELECT i."userId", i."tweetId", c."authorId"
+        FROM inserted i
+        JOIN counted c ON c."id" = i."tweetId"
+      `;
+
+      inserted.forEach(row => this.notificationsService.enqueue({
+        type: 'LIKE',
+        userId: row.authorId,
+        issuerId: row.userId,
+        tweetId: row.tweetId,
+      }));
+    }
+
+    if (unlikes.length > 0) {
+      const rows = unlikes.map(like => Prisma.sql`(${like.userId}, ${like.tweetId})`);
+      await this.prisma.$executeRaw`
+        WITH incoming ("userId", "tweetId") AS (
+          VALUES ${Prisma.join(rows)}
+        ),
+        deleted AS (
+          DELETE FROM "Like" l
+          USING incoming i
+          WHERE l."userId" = i."userId" AND l."tweetId" = i."tweetId"
+          RETURNING l."tweetId"
+        )
+        UPDATE "Tweet" t SET "likesCount" = t."likesCount" - c."count"
+        FROM (SELECT "tweetId", count(*)::int AS "count" FROM deleted GROUP BY "tweetId") c
+        WHERE t."id" = c."tweetId"
+      `;
+    }
+  }
+}
@@ -1,12 +1,39 @@
 import { NestFactory } from '@nestjs/core';
+import { NestExpressApplication } from '@nestjs/platform-express';
+import cluster from 'cluster';
+import { availableParallelism } from 'os';
 import { AppModule } from './app.module';
+import { runPrimary } from './cluster';
+import { compression } from './common/compression';
+import { enableGracefulShutdown } from './common/graceful-shutdown';
+
+// API processes per host: 1 runs in-process (dev, watch mode), 0 forks one per core
+const API_WORKERS = parseInt(process.env.API_WORKERS ?? '1');
+// Express 'trust proxy': a hop count or address list. Set behind a load balancer so
+// req.ip, which per-address rate limits key on, is the client and not the proxy.
+const TRUST_PROXY = process.env.TRUST_PROXY;
 
 async function bootstrap() {
-  const app = await NestFactory.create(AppModule);
+  const app = await NestFactory.create<NestExpressApplication>(AppModule);
+  // Express hashes each response body into an ETag and answers a matching If-None-Match with 304;
+  // feed and profile routes add Cache-Control: no-cache so browsers always revalidate
+  app.set('etag', 'weak');
+  if (TRUST_PROXY) {
+    app.set('trust proxy', /^\d+$/.test(TRUST_PROXY) ? parseInt(TRUST_PROXY) : TRUST_PROXY);
+  }
+  // The SSE stream opts out through its Cache-Control: no-transform header
+  app.use(compression());
   app.enableCors({
     origin: ['http://localhost:3000'],
     credentials: true,
   });
+  // Drains in-flight requests, then lets queued work (e.g. batched notifications) flush
+  enableGracefulShutdown(app);
   await app.listen(process.env.PORT ?? 3001, '0.0.0.0');
 }
-bootstrap();
+
+if (cluster.isPrimary && API_WORKERS !== 1) {
+  runPrimary(API_WORKERS > 0 ? API_WORKERS : availableParallelism());
+} else {
+  bootstrap();
+}
@@ -0,0 +1,27 @@
+import { Histogram } from './histogram';
+
+describe('Histogram', () => {
+  it('should render cumulative buckets per label set', () => {
+    const histogram = new Histogram('request_seconds', 'Request latency', [0.25, 1]);
+    histogram.observe({ route: 'GET /tweets' }, 0.25);
+    histogram.observe({ route: 'GET /tweets' }, 0.5);
+    histogram.observe({ route: 'GET /tweets' }, 2);
+
+    expect(histogram.render()).toEqual([
+      '# HELP request_seconds Request latency',
+      '# TYPE request_seconds histogram',
+      'request_seconds_bucket{route="GET /tweets",le="0.25"} 1',
+      'request_seconds_bucket{route="GET /tweets",le="1"} 2',
+      'request_seconds_bucket{route="GET /tweets",le="+Inf"} 3',
+      'request_seconds_sum{route="GET /tweets"} 2.75',
+      'request_seconds_count{route="GET /tweets"} 3',
+    ]);
+  });
+
+  it('should escape quotes in label values', () => {
+    const histogram = new Histogram('x', 'x', [1]);
+    histogram.observe({ route: 'say "hi"' }, 0);
+
+    expect(histogram.render()[2]).toBe('x_bucket{route="say \\"hi\\"",le="1"} 1');
+  });
+});
@@ -0,0 +1,57 @@
+export type Labels = Record<string, string>;
+
+interface Series {
+  labels: Labels;
+  buckets: number[];
+  sum: number;
+  count: number;
+}
+
+export function formatLabels(labels: Labels) {
+  const pairs = Object.entries(labels).map(
+    ([key, value]) => `${key}="${value.replace(/\\/g, '\\\\').replace(/"/g, '\\"').replace(/\n/g, '\\n')}"`,
+  );
+  return pairs.length > 0 ? `{${pairs.join(',')}}` : '';
+}
+
+/**
+ * Prometheus histogram with labelled series, rendered in the text exposition format.
+ * Label values should have bounded cardinality (route templates, not raw paths).
+ */
+export class Histogram {
+  private readonly series = new Map<string, Series>();
+
+  constructor(
+    readonly name: string,
+    readonly help: string,
+    private readonly bounds: number[],
+  ) {}
+
+  observe(labels: Labels, value: number) {
+    const key = formatLabels(labels);
+    let series = this.series.get(key);
+    if (!series) {
+      series = { labels, buckets: this.bounds.map(() => 0), sum: 0, count: 0 };
+      this.series.set(key, series);
+    }
+
+    this.bounds.forEach((bound, i) => {
+      if (value <= bound) series.buckets[i]++;
+    });
+    series.sum += value;
+    series.count++;
+  }
+
+  render(): string[] {
+    const lines = [`# HELP ${this.name} ${this.help}`, `# TYPE ${this.name} histogram`];
+    for (const series of this.series.values()) {
+      this.bounds.forEach((bound, i) => {
+        lines.push(`${this.name}_bucket${formatLabels({ ...series.labels, le: String(bound) })} ${series.buckets[i]}`);
+      });
+      lines.push(`${this.name}_bucket${formatLabels({ ...series.labels, le: '+Inf' })} ${series.count}`);
+      lines.push(`${this.name}_sum${formatLabels(series.labels)} ${series.sum}`);
+      lines.push(`${this.name}_count${formatLabels(series.labels)} ${series.count}`);
+    }
+    return lines;
+  }
+}
@@ -0,0 +1,15 @@
+import { Controller, Get, Header, UseGuards } from '@nestjs/common';
+import { MetricsGuard } from './metrics.guard';
+import { MetricsService } from './metrics.service';
+
+@Controller('metrics')
+@UseGuards(MetricsGuard)
+export class MetricsController {
+  constructor(private metricsService: MetricsService) {}
+
+  @Get()
+  @Header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+  metrics() {
+    return this.metricsService.render();
+  }
+}
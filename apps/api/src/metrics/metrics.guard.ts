@@ -0,0 +1,32 @@
+import { CanActivate, ExecutionContext, Injectable, NotFoundException } from '@nestjs/common';
+import { createHash, timingSafeEqual } from 'crypto';
+import type { Request } from 'express';
+
+// Scrapers presenting `Authorization: Bearer <METRICS_TOKEN>` are let in from anywhere
+const METRICS_TOKEN = process.env.METRICS_TOKEN ?? '';
+// A Prometheus on the same host needs no token. Behind a proxy, set TRUST_PROXY so
+// req.ip is the client rather than the proxy.
+const METRICS_ALLOWED_IPS = new Set(
+  (process.env.METRICS_ALLOWED_IPS ?? '127.0.0.1,::1,::ffff:127.0.0.1').split(',').map(ip => ip.trim()).filter(Boolean)
+);
+
+const digest = (value: string) => createHash('sha256').update(value).digest();
+
+/**
+ * Keeps /metrics, which lists every route and its traffic, off the public API. Anyone
+ * else gets a 404, as if the endpoint didn't exist.
+ */
+@Injectable()
+export class MetricsGuard implements CanActivate {
+  canActivate(context: ExecutionContext): boolean {
+    const req = context.switchToHttp().getRequest<Request>();
+    if (METRICS_ALLOWED_IPS.has(req.ip ?? '')) return true;
+
+    const header = req.headers.authorization ?? '';
+    // Hashed first so the comparison is constant-time whatever the lengths
+    if (METRICS_TOKEN && header.startsWith('Bearer ') && timingSafeEqual(digest(header.slice(7)), digest(METRICS_TOKEN))) {
+      return true;
+    }
+    throw new NotFoundException();
+  }
+}
@@ -0,0 +1,45 @@
+import { CallHandler, ExecutionContext, Injectable, NestInterceptor } from '@nestjs/common';
+import type { Request, Response } from 'express';
+import { Observable, tap } from 'rxjs';
+import { MetricsService } from './metrics.service';
+import { RequestMetrics, requestMetrics } from './request-metrics';
+
+/**
+ * Runs each handler inside its own RequestMetrics context, adds a Server-Timing header
+ * (DB time and query count next to total handler time) and records the route's metrics
+ * once the response is sent.
+ */
+@Injectable()
+export class MetricsInterceptor implements NestInterceptor {
+  constructor(private metricsService: MetricsService) {}
+
+  intercept(context: ExecutionContext, next: CallHandler): Observable<unknown> {
+    if (context.getType() !== 'http') return next.handle();
+
+    const req = context.switchToHttp().getRequest<Request>();
+    const res = context.switchToHttp().getResponse<Response>();
+    // Route template rather than the raw path keeps label cardinality bounded
+    const route = `${req.method} ${req.route?.path ?? 'unmatched'}`;
+    const metrics: RequestMetrics = { queries: 0, dbMs: 0 };
+    const started = performance.now();
+
+    res.once('finish', () => {
+      // Event streams stay open for minutes; their duration isn't request latency
+      if (String(res.getHeader('Content-Type') ?? '').startsWith('text/event-stream')) return;
+      this.metricsService.recordRequest(route, res.statusCode, (performance.now() - started) / 1000, metrics);
+    });
+
+    const setServerTiming = () => {
+      if (res.headersSent) return;
+      const total = performance.now() - started;
+      res.setHeader(
+        'Server-Timing',
+        `db;dur=${metrics.dbMs.toFixed(1)};desc="${metrics.queries} queries", app;dur=${total.toFixed(1)}`,
+      );
+    };
+
+    return new Observable(subscriber =>
+      requestMetrics.run(metrics, () => next.handle().subscribe(subscriber)),
+    ).pipe(tap({ next: setServerTiming, error: setServerTiming }));
+  }
+}
@@ -0,0 +1,170 @@
+import { Injectable, OnModuleDestroy, OnModuleInit } from '@nestjs/common';
+import { monitorEventLoopDelay } from 'perf_hooks';
+import { PrismaService } from '../prisma/prisma.service';
+import { PasswordsService } from '../passwords/passwords.service';
+import { Histogram, formatLabels } from './histogram';
+import { RequestMetrics, requestMetrics } from './request-metrics';
+
+const HTTP_SECONDS_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5];
+const QUERY_SECONDS_BUCKETS = [0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1];
+const QUERIES_PER_REQUEST_BUCKETS = [1, 2, 3, 5, 10, 20, 50, 100];
+// A request issuing more Prisma operations than this is logged as a likely N+1
+const N_PLUS_ONE_QUERY_THRESHOLD = parseInt(process.env.N_PLUS_ONE_QUERY_THRESHOLD ?? '15');
+// At most one N+1 warning per route in this window; the counter below still sees every one
+const N_PLUS_ONE_WARN_INTERVAL_MS = 60 * 1000;
+
+/**
+ * Joins exposition-format outputs that share metric names (one per Prisma client), since
+ * each family's HELP/TYPE must appear once with all of its samples grouped beneath it.
+ */
+function mergeMetricFamilies(outputs: string[]) {
+  const families = new Map<string, { header: string[]; samples: string[] }>();
+  for (const output of outputs) {
+    let current: { header: string[]; samples: string[] } | undefined;
+    for (const line of output.split('\n')) {
+      const header = line.match(/^# (HELP|TYPE) (\S+)/);
+      if (header) {
+        current = families.get(header[2]);
+        if (!current) {
+          current = { header: [], samples: [] };
+          families.set(header[2], current);
+        }
+        if (current.header.length < 2) current.header.push(line);
+      } else if (line.trim() && current) {
+        current.samples.push(line);
+      }
+    }
+  }
+  return [...families.values()].map(family => [...family.header, ...family.samples].join('\n')).join('\n') + '\n';
+}
+
+/**
+ * Per-route latency and query attribution, exposed in Prometheus format on /metrics.
+ *
+ * Query events come from the engine outside the request's async context, so they only
+ * feed the global statement histogram; per-request counts come from a Prisma middleware,
+ * which runs inside it and counts client operations (a findMany with includes is one).
+ */
+@Injectable()
+export class MetricsService implements OnModuleInit, OnModuleDestroy {
+  private readonly requestDuration = new Histogram(
+    'http_request_duration_seconds',
+    'HTTP request latency by route',
+    HTTP_SECONDS_BUCKETS,
+  );
+  private readonly requestQueries = new Histogram(
+    'http_request_db_queries',
+    'Prisma operations issued per request by route',
+    QUERIES_PER_REQUEST_BUCKETS,
+  );
+  private readonly requestDbDuration = new Histogram(
+    'http_request_db_duration_seconds',
+    'Time spent in Prisma operations per request by route',
+    HTTP_SECONDS_BUCKETS,
+  );
+  private readonly queryDuration = new Histogram(
+    'db_query_duration_seconds',
+    'SQL statement duration as reported by the Prisma engine',
+    QUERY_SECONDS_BUCKETS,
+  );
+  private readonly nPlusOneRequests = new Map<string, number>();
+  private readonly nPlusOneWarnedAt = new Map<string, { at: number; count: number }>();
+  private readonly eventLoopDelay = monitorEventLoopDelay({ resolution: 20 });
+
+  constructor(
+    private prisma: PrismaService,
+    private passwordsService: PasswordsService,
+  ) {}
+
+  onModuleInit() {
+    this.eventLoopDelay.enable();
+
+    for (const { name, client } of this.prisma.clients) {
+      client.$on('query', event => this.queryDuration.observe({ client: name }, event.duration / 1000));
+
+      client.$use(async (params, next) => {
+        const metrics = requestMetrics.getStore();
+        if (!metrics) return next(params);
+
+        const started = performance.now();
+        try {
+          return await next(params);
+        } finally {
+          metrics.queries++;
+          metrics.dbMs += performance.now() - started;
+        }
+      });
+    }
+  }
+
+  onModuleDestroy() {
+    this.eventLoopDelay.disable();
+  }
+
+  recordRequest(route: string, status: number, seconds: number, metrics: RequestMetrics) {
+    this.requestDuration.observe({ route, status: `${Math.floor(status / 100)}xx` }, seconds);
+    this.requestQueries.observe({ route }, metrics.queries);
+    this.requestDbDuration.observe({ route }, metrics.dbMs / 1000);
+
+    if (metrics.queries > N_PLUS_ONE_QUERY_THRESHOLD) {
+      const count = (this.nPlusOneRequests.get(route) ?? 0) + 1;
+      this.nPlusOneRequests.set(route, count);
+
+      const warned = this.nPlusOneWarnedAt.get(route);
+      const now = Date.now();
+      if (!warned || now - warned.at >= N_PLUS_ONE_WARN_INTERVAL_MS) {
+        const since = warned ? ` (${count - warned.count} such requests since the last warning)` : '';
+        console.warn(
+          `[MetricsService] ${route} issued ${metrics.queries} queries in one request ` +
+            `(threshold ${N_PLUS_ONE_QUERY_THRESHOLD}); likely N+1${since}`,
+        );
+        this.nPlusOneWarnedAt.set(route, { at: now, count });
+      }
+    }
+  }
+
+  async render(): Promise<string> {
+    const lines = [
+      ...this.requestDuration.render(),
+      ...this.requestQueries.render(),
+      ...this.requestDbDuration.render(),
+      ...this.queryDuration.render(),
+      '# HELP http_n_plus_one_requests_total Requests that exceeded the per-request query threshold',
+      '# TYPE http_n_plus_one_requests_total counter',
+      ...[...this.nPlusOneRequests].map(
+        ([route, count]) => `http_n_plus_one_requests_total${formatLabels({ route })} ${count}`,
+      ),
+    ];
+
+    // Delay since the previous scrape, so each sample reflects the last interval rather than uptime
+    const delay = this.eventLoopDelay;
+    lines.push(
+      '# HELP nodejs_eventloop_lag_seconds Event loop delay since the previous scrape',
+      '# TYPE nodejs_eventloop_lag_seconds gauge',
+      `nodejs_eventloop_lag_seconds{quantile="0.5"} ${delay.percentile(50) / 1e9}`,
+      `nodejs_eventloop_lag_seconds{quantile="0.99"} ${delay.percentile(99) / 1e9}`,
+      `nodejs_eventloop_lag_seconds{quantile="1"} ${delay.max / 1e9}`,
+    );
+    delay.reset();
+
+    const passwords = this.passwordsService.stats();
+    lines.push(
+      '# HELP password_workers_busy bcrypt worker threads currently hashing',
+      '# TYPE password_workers_busy gauge',
+      `password_workers_busy ${passwords.busy}`,
+      '# HELP password_workers_total bcrypt worker threads in the pool',
+      '# TYPE password_workers_total gauge',
+      `password_workers_total ${passwords.workers}`,
+      '# HELP password_queue_depth bcrypt jobs waiting for a worker',
+      '# TYPE password_queue_depth gauge',
+      `password_queue_depth ${passwords.queueDepth}`,
+    );
+
+    // Connection pool gauges (busy/idle/open) and pool wait histogram from each Prisma engine
+    const poolMetrics = await Promise.all(
+      this.prisma.clients.map(({ name, client }) => client.$metrics.prometheus({ globalLabels: { client: name } })),
+    );
+
+    return `${lines.join('\n')}\n${mergeMetricFamilies(poolMetrics)}`;
+  }
+}
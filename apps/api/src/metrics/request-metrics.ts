@@ -0,0 +1,9 @@
+import { AsyncLocalStorage } from 'async_hooks';
+
+export interface RequestMetrics {
+  queries: number;
+  dbMs: number;
+}
+
+// Set by MetricsInterceptor around each handler; the Prisma middleware adds to whichever request is current
+export const requestMetrics = new AsyncLocalStorage<RequestMetrics>();
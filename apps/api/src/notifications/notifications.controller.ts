@@ -1,4 +1,4 @@
-import { Controller, Get, Patch, Param, UseGuards, Request } from '@nestjs/common';
+import { Controller, Get, Patch, Param, UseGuards, Request, Query, Body } from '@nestjs/common';
 import { NotificationsService } from './notifications.service';
 import { AuthGuard } from '@nestjs/passport';
 
@@ -8,8 +8,19 @@ export class NotificationsController {
   constructor(private readonly notificationsService: NotificationsService) {}
 
   @Get()
-  async findAll(@Request() req: any) {
-    return this.notificationsService.findAll(req.user.userId);
+  async findAll(@Request() req: any, @Query('cursor') cursor?: string, @Query('limit') limit?: string) {
+    const limitNum = limit ? Math.min(parseInt(limit), 100) : 20;
+    return this.notificationsService.findAll(req.user.userId, cursor, limitNum);
+  }
+
+  @Get('unread-count')
+  async getUnreadCount(@Request() req: any) {
+    return this.notificationsService.getUnreadCount(req.user.userId);
+  }
+
+  @Patch('read')
+  async markAllAsRead(@Request() req: any, @Body() body: { upTo?: string }) {
+    return this.notificationsService.markAllAsRead(req.user.userId, body?.upTo);
   }
 
   @Patch(':id/read')
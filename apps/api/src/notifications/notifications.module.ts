@@ -2,9 +2,10 @@ import { Module } from '@nestjs/common';
 import { NotificationsService } from './notifications.service';
 import { NotificationsController } from './notifications.controller';
 import { JwtModule } from '@nestjs/jwt';
+import { RealtimeModule } from '../realtime/realtime.module';
 
 @Module({
-  imports: [JwtModule],
+  imports: [JwtModule, RealtimeModule],
   controllers: [NotificationsController],
   providers: [NotificationsService],
   exports: [NotificationsService],
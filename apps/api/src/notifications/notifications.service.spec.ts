@@ -0,0 +1,56 @@
+import { Prisma } from '@repo/database';
+import { PrismaService } from '../prisma/prisma.service';
+import { RealtimeService } from '../realtime/realtime.service';
+import { NotificationsService } from './notifications.service';
+
+function setup() {
+  const statements: Prisma.Sql[] = [];
+  const prisma = {
+    $executeRaw: jest.fn(async (strings: TemplateStringsArray, ...values: unknown[]) => {
+      statements.push(Prisma.sql(strings, ...values));
+      return 1;
+    }),
+    $transaction: jest.fn(async (operations: Promise<unknown>[]) => Promise.all(operations)),
+    markWritten: jest.fn(),
+  };
+  const realtime = { publish: jest.fn() };
+  const service = new NotificationsService(prisma as unknown as PrismaService, realtime as unknown as RealtimeService);
+  return { service, statements };
+}
+
+describe('NotificationsService', () => {
+  it('should write a batch holding a reply to a deleted tweet in single statements that skip it', async () => {
+    const { service, statements } = setup();
+    const error = jest.spyOn(console, 'error').mockImplementation(() => undefined);
+
+    // Reply deleted after its notification was queued
+    service.enqueue({ type: 'REPLY', userId: 'u1', issuerId: 'u2', tweetId: 'deleted' });
+    service.enqueue({ type: 'FOLLOW', userId: 'u3', issuerId: 'u2' });
+    service.enqueue({ type: 'LIKE', userId: 'u4', issuerId: 'u2', tweetId: 't1' });
+    await service.flush();
+
+    expect(error).not.toHaveBeenCalled();
+    error.mockRestore();
+
+    // Plain rows: both go into one INSERT that only keeps rows whose tweet still exists
+    const plain = statements.find(statement => statement.sql.includes('inserted AS'))!;
+    expect(plain.sql).toContain('LEFT JOIN "Tweet" t ON t."id" = i."tweetId"');
+    expect(plain.sql).toContain('WHERE i."tweetId" IS NULL OR t."id" IS NOT NULL');
+    expect(plain.values).toEqual(expect.arrayContaining(['u1', 'deleted', 'u3']));
+
+    // Aggregates: the upsert and actor rows only see groups whose tweet joins
+    const aggregate = statements.find(statement => statement.sql.includes('upserted AS'))!;
+    expect(aggregate.sql).toMatch(/live AS \(\s+SELECT i\.\* FROM incoming i JOIN "Tweet" t ON t\."id" = i\."tweetId"/);
+    expect(aggregate.sql).toContain('FROM live i');
+    expect(aggregate.values).toEqual(expect.arrayContaining(['u4', 't1']));
+  });
+
+  it('should drop notifications a user would send to themselves', async () => {
+    const { service, statements } = setup();
+
+    service.enqueue({ type: 'LIKE', userId: 'u1', issuerId: 'u1', tweetId: 't1' });
+    await service.flush();
+
+    expect(statements).toHaveLength(0);
+  });
+});
@@ -1,20 +1,218 @@
-import { Injectable } from '@nestjs/common';
+import { Injectable, OnModuleInit, OnModuleDestroy } from '@nestjs/common';
+import { randomUUID } from 'crypto';
 import { PrismaService } from '../prisma/prisma.service';
-import { Prisma } from '@repo/database';
+import { NotificationType, Prisma } from '@repo/database';
+import { decodeCursor, encodeCursor } from '../common/cursor';
+import { RealtimeService } from '../realtime/realtime.service';
+
+// How long notifications wait in memory; likes on one tweet inside a window collapse into one row
+const NOTIFICATION_FLUSH_INTERVAL_MS = parseInt(process.env.NOTIFICATION_FLUSH_INTERVAL_MS ?? '1000');
+const NOTIFICATION_MAX_BATCH = 500;
+// Types folded into a single "X and N others" row per (recipient, tweet)
+const AGGREGATED_TYPES = new Set<NotificationType>(['LIKE', 'RETWEET']);
+
+export interface PendingNotification {
+  type: NotificationType;
+  userId: string;
+  issuerId: string;
+  tweetId?: string;
+}
 
 @Injectable()
-export class NotificationsService {
-  constructor(private prisma: PrismaService) {}
+export class NotificationsService implements OnModuleInit, OnModuleDestroy {
+  private queue: PendingNotification[] = [];
+  private flushTimer?: NodeJS.Timeout;
+  private flushing: Promise<void> = Promise.resolve();
 
-  async create(data: Prisma.NotificationCreateInput) {
-    return this.prisma.notification.create({
-      data,
-    });
+  constructor(
+    private prisma: PrismaService,
+    private realtimeService: RealtimeService
+  ) {}
+
+  onModuleInit() {
+    this.flushTimer = setInterval(() => this.flush(), NOTIFICATION_FLUSH_INTERVAL_MS);
+    this.flushTimer.unref();
+  }
+
+  async onModuleDestroy() {
+    clearInterval(this.flushTimer);
+    await this.flush();
+  }
+
+  /**
+   * Queues a notification for the next batched write. Returns immediately so the
+   * like/reply request path never waits on the notification insert.
+   */
+  enqueue(notification: PendingNotification) {
+    if (notification.userId === notification.issuerId) return;
+
+    this.queue.push(notification);
+    if (this.queue.length >= NOTIFICATION_MAX_BATCH) {
+      this.flush();
+    }
   }
 
-  async findAll(userId: string) {
-    return this.prisma.notification.findMany({
-      where: { userId },
+  flush(): Promise<void> {
+    // Chained so a size-triggered flush never overlaps the interval one
+    this.flushing = this.flushing.then(() => this.drain());
+    return this.flushing;
+  }
+
+  private async drain() {
+    while (this.queue.length > 0) {
+      const batch = this.queue.splice(0, NOTIFICATION_MAX_BATCH);
+      try {
+        await this.write(batch);
+      } catch (error) {
+        console.error('[NotificationsService] Failed to write notification batch:', error);
+      }
+    }
+  }
+
+  private async write(batch: PendingNotification[]) {
+    const plain: PendingNotification[] = [];
+    const groups = new Map<string, { latest: PendingNotification; issuers: Set<string> }>();
+
+    for (const notification of batch) {
+      if (!AGGREGATED_TYPES.has(notification.type) || !notification.tweetId) {
+        plain.push(notification);
+        continue;
+      }
+
+      const key = `${notification.userId}:${notification.type}:${notification.tweetId}`;
+      const group = groups.get(key) ?? { latest: notification, issuers: new Set<string>() };
+      // The most recent actor is shown by name, the rest become "and N others"
+      group.latest = notification;
+      group.issuers.add(notification.issuerId);
+      groups.set(key, group);
+    }
+
+    if (plain.length > 0) {
+      const rows = plain.map(notification => Prisma.sql`(
+        ${randomUUID()}, ${notification.type}::"NotificationType", ${notification.userId},
+        ${notification.issuerId}, ${notification.tweetId ?? null}::text
+      )`);
+
+      // Joining Tweet drops notifications about tweets deleted since they were queued,
+      // which would otherwise fail the whole batch on the foreign key
+      await this.prisma.$executeRaw`
+        WITH incoming ("id", "type", "userId", "issuerId", "tweetId") AS (
+          VALUES ${Prisma.join(rows)}
+        ),
+        inserted AS (
+          INSERT INTO "Notification" ("id", "type", "userId", "issuerId", "tweetId", "read", "createdAt")
+          SELECT i."id", i."type", i."userId", i."issuerId", i."tweetId", false, NOW()
+          FROM incoming i
+          LEFT JOIN "Tweet" t ON t."id" = i."tweetId"
+          WHERE i."tweetId" IS NULL OR t."id" IS NOT NULL
+          RETURNING "userId"
+        )
+        UPDATE "User" u SET "unreadNotifications" = u."unreadNotifications" + d."count"
+        FROM (SELECT "userId", count(*)::int AS "count" FROM inserted GROUP BY "userId") d
+        WHERE u."id" = d."userId"
+      `;
+    }
+
+    if (groups.size > 0) {
+      const rows = [...groups.values()].map(({ latest }) => Prisma.sql`(
+        ${randomUUID()}, ${latest.type}::"NotificationType", ${latest.userId}, ${latest.issuerId},
+        ${latest.tweetId}, ${`${latest.type}:${latest.tweetId}`}
+      )`);
+      const keys = [...groups.values()].map(({ latest }) => Prisma.sql`(${latest.userId}, ${`${latest.type}:${latest.tweetId}`})`);
+      const actors = [...groups.values()].flatMap(({ latest, issuers }) =>
+        [...issuers].map(issuerId => Prisma.sql`(${latest.userId}, ${`${latest.type}:${latest.tweetId}`}, ${issuerId})`)
+      );
+
+      await this.prisma.$transaction([
+        // A read aggregate starts a fresh count with the next burst, so forget who it counted
+        this.prisma.$executeRaw`
+          DELETE FROM "NotificationActor" a
+          USING "Notification" n
+          WHERE n."read" AND a."userId" = n."userId" AND a."groupKey" = n."groupKey"
+            AND (n."userId", n."groupKey") IN (VALUES ${Prisma.join(keys)})
+        `,
+        // Only actors the aggregate hasn't counted yet add to it; a group with none is left
+        // alone, so an unlike and re-like doesn't resurface it. "prior" sees the pre-statement
+        // snapshot, so only rows that were absent or already read become new unread items for
+        // the badge counter.
+        this.prisma.$executeRaw`
+          WITH incoming ("id", "type", "userId", "issuerId", "tweetId", "groupKey") AS (
+            VALUES ${Prisma.join(rows)}
+          ),
+          -- Groups whose tweet still exists; the rest would fail the batch on the foreign key
+          live AS (
+            SELECT i.* FROM incoming i JOIN "Tweet" t ON t."id" = i."tweetId"
+          ),
+          added AS (
+            INSERT INTO "NotificationActor" ("userId", "groupKey", "issuerId")
+            SELECT a."userId", a."groupKey", a."issuerId"
+            FROM (VALUES ${Prisma.join(actors)}) AS a ("userId", "groupKey", "issuerId")
+            JOIN live l ON l."userId" = a."userId" AND l."groupKey" = a."groupKey"
+            ON CONFLICT DO NOTHING
+            RETURNING "userId", "groupKey"
+          ),
+          counted AS (
+            SELECT "userId", "groupKey", count(*)::int AS "actorCount"
+            FROM added
+            GROUP BY "userId", "groupKey"
+          ),
+          prior AS (
+            SELECT n."userId", n."groupKey", n."read"
+            FROM "Notification" n
+            JOIN incoming i ON n."userId" = i."userId" AND n."groupKey" = i."groupKey"
+          ),
+          upserted AS (
+            INSERT INTO "Notification" ("id", "type", "userId", "issuerId", "tweetId", "groupKey", "actorCount", "read", "createdAt")
+            SELECT i."id", i."type", i."userId", i."issuerId", i."tweetId", i."groupKey", c."actorCount", false, NOW()
+            FROM live i
+            JOIN counted c ON c."userId" = i."userId" AND c."groupKey" = i."groupKey"
+            ON CONFLICT ("userId", "groupKey") DO UPDATE SET
+              "issuerId" = EXCLUDED."issuerId",
+              "actorCount" = CASE WHEN "Notification"."read" THEN EXCLUDED."actorCount"
+                                  ELSE "Notification"."actorCount" + EXCLUDED."actorCount" END,
+              "read" = false,
+              "createdAt" = EXCLUDED."createdAt"
+            RETURNING "userId", "groupKey"
+          )
+          UPDATE "User" u SET "unreadNotifications" = u."unreadNotifications" + d."count"
+          FROM (
+            SELECT up."userId", count(*)::int AS "count"
+            FROM upserted up
+            LEFT JOIN prior p ON p."userId" = up."userId" AND p."groupKey" = up."groupKey"
+            WHERE p."userId" IS NULL OR p."read"
+            GROUP BY up."userId"
+          ) d
+          WHERE u."id" = d."userId"
+        `,
+      ]);
+    }
+
+    const written = [...plain, ...[...groups.values()].map(group => group.latest)];
+    // Recipients refetch on the nudge below; keep that read off a replica that may not have the rows yet
+    this.prisma.markWritten(...new Set(written.map(notification => notification.userId)));
+
+    // Only a nudge: clients refetch the list and badge, so the payload stays tiny
+    for (const notification of written) {
+      this.realtimeService.publish([notification.userId], 'notification', {
+        type: notification.type,
+        tweetId: notification.tweetId ?? null,
+      });
+    }
+  }
+
+  async findAll(userId: string, cursor?: string, limit: number = 20) {
+    const after = cursor ? decodeCursor(cursor) : null;
+
+    const rows = await this.prisma.reader(userId).notification.findMany({
+      where: {
+        userId,
+        ...(after ? {
+          OR: [
+            { createdAt: { lt: after.createdAt } },
+            { createdAt: after.createdAt, id: { lt: after.id } },
+          ],
+        } : {}),
+      },
       include: {
         issuer: {
           select: {
@@ -31,23 +229,60 @@ export class NotificationsService {
           }
         }
       },
-      orderBy: {
-        createdAt: 'desc',
-      },
+      orderBy: [{ createdAt: 'desc' }, { id: 'desc' }],
+      take: limit + 1,
+    });
+
+    const hasMore = rows.length > limit;
+    const notifications = hasMore ? rows.slice(0, limit) : rows;
+
+    return {
+      notifications,
+      nextCursor: hasMore ? encodeCursor(notifications[notifications.length - 1]) : null,
+      // Newest row on the page; pass it to markAllAsRead to clear exactly what the client has seen
+      headCursor: notifications.length > 0 ? encodeCursor(notifications[0]) : null,
+    };
+  }
+
+  async getUnreadCount(userId: string) {
+    const user = await this.prisma.reader(userId).user.findUnique({
+      where: { id: userId },
+      select: { unreadNotifications: true },
     });
+    return { count: Math.max(user?.unreadNotifications ?? 0, 0) };
   }
 
   async markAsRead(id: string, userId: string) {
-     // Verify ownership
-     const notification = await this.prisma.notification.findFirst({
-        where: { id, userId }
-     });
-     
-     if (!notification) return null;
-
-     return this.prisma.notification.update({
-       where: { id },
-       data: { read: true },
-     });
+    return this.markRead(userId, { id });
+  }
+
+  /**
+   * Marks every unread notification as read, or only those at or before `upTo`
+   * (a cursor from findAll) so items that arrived after the page was loaded stay unread.
+   */
+  async markAllAsRead(userId: string, upTo?: string) {
+    const until = upTo ? decodeCursor(upTo) : null;
+    return this.markRead(userId, until ? {
+      OR: [
+        { createdAt: { lt: until.createdAt } },
+        { createdAt: until.createdAt, id: { lte: until.id } },
+      ],
+    } : {});
+  }
+
+  private async markRead(userId: string, where: Prisma.NotificationWhereInput) {
+    return this.prisma.$transaction(async (tx) => {
+      const { count } = await tx.notification.updateMany({
+        where: { ...where, userId, read: false },
+        data: { read: true },
+      });
+      if (count > 0) {
+        await tx.user.update({
+          where: { id: userId },
+          data: { unreadNotifications: { decrement: count } },
+        });
+      }
+      return { count };
+    });
   }
 }
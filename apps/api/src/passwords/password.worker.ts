@@ -0,0 +1,14 @@
+import { parentPort } from 'worker_threads';
+import * as bcrypt from 'bcrypt';
+
+// Sync bcrypt is fine here: this thread does nothing else
+parentPort?.on('message', (job: { id: number; op: 'hash' | 'compare'; password: string; hash?: string; cost?: number }) => {
+  try {
+    const result = job.op === 'hash'
+      ? bcrypt.hashSync(job.password, job.cost ?? 10)
+      : bcrypt.compareSync(job.password, job.hash ?? '');
+    parentPort?.postMessage({ id: job.id, result });
+  } catch (error) {
+    parentPort?.postMessage({ id: job.id, error: (error as Error).message });
+  }
+});
@@ -0,0 +1,104 @@
+import { Injectable, OnModuleDestroy, ServiceUnavailableException } from '@nestjs/common';
+import { Worker } from 'worker_threads';
+import { join } from 'path';
+
+const BCRYPT_COST = parseInt(process.env.BCRYPT_COST ?? '10');
+// Each worker runs one bcrypt at a time, so this is also the concurrency cap
+const PASSWORD_WORKERS = parseInt(process.env.PASSWORD_WORKERS ?? '2');
+// Beyond this, login/signup is refused with 503 instead of queueing unbounded
+const PASSWORD_MAX_QUEUE = parseInt(process.env.PASSWORD_MAX_QUEUE ?? '500');
+
+type Job = { id: number; op: 'hash' | 'compare'; password: string; hash?: string; cost?: number };
+
+interface PoolWorker {
+  worker: Worker;
+  job?: Job;
+}
+
+/**
+ * bcrypt on dedicated worker threads. The bcrypt module's async API borrows the
+ * libuv threadpool, which Prisma and file I/O also need; a login storm would starve them.
+ */
+@Injectable()
+export class PasswordsService implements OnModuleDestroy {
+  private workers: PoolWorker[] = [];
+  private queue: Job[] = [];
+  private pending = new Map<number, { resolve: (value: any) => void; reject: (error: Error) => void }>();
+  private nextId = 0;
+
+  onModuleDestroy() {
+    this.workers.forEach(({ worker }) => worker.terminate());
+    this.workers = [];
+  }
+
+  hash(password: string): Promise<string> {
+    return this.run({ id: ++this.nextId, op: 'hash', password, cost: BCRYPT_COST });
+  }
+
+  compare(password: string, hash: string): Promise<boolean> {
+    return this.run({ id: ++this.nextId, op: 'compare', password, hash });
+  }
+
+  stats() {
+    return {
+      workers: this.workers.length,
+      busy: this.workers.filter(entry => entry.job).length,
+      queueDepth: this.queue.length,
+    };
+  }
+
+  private run<T>(job: Job): Promise<T> {
+    if (this.queue.length >= PASSWORD_MAX_QUEUE) {
+      throw new ServiceUnavailableException('Authentication is busy, please retry');
+    }
+
+    return new Promise<T>((resolve, reject) => {
+      this.pending.set(job.id, { resolve, reject });
+      this.queue.push(job);
+      this.dispatch();
+    });
+  }
+
+  private dispatch() {
+    while (this.queue.length > 0) {
+      const idle = this.workers.find(entry => !entry.job) ?? this.spawn();
+      if (!idle) return;
+
+      idle.job = this.queue.shift();
+      idle.worker.postMessage(idle.job);
+    }
+  }
+
+  private spawn(): PoolWorker | undefined {
+    if (this.workers.length >= PASSWORD_WORKERS) return undefined;
+
+    // Under ts-node (dev scripts) the worker is still a .ts file
+    const isTs = __filename.endsWith('.ts');
+    const worker = new Worker(join(__dirname, `password.worker${isTs ? '.ts' : '.js'}`), {
+      execArgv: isTs ? ['-r', 'ts-node/register'] : undefined,
+    });
+    const entry: PoolWorker = { worker };
+
+    worker.on('message', ({ id, result, error }: { id: number; result?: any; error?: string }) => {
+      const waiter = this.pending.get(id);
+      this.pending.delete(id);
+      entry.job = undefined;
+      if (error) waiter?.reject(new Error(error));
+      else waiter?.resolve(result);
+      this.dispatch();
+    });
+
+    worker.on('error', error => {
+      console.error('[PasswordsService] Worker crashed:', error);
+      if (entry.job) {
+        this.pending.get(entry.job.id)?.reject(error);
+        this.pending.delete(entry.job.id);
+      }
+      this.workers = this.workers.filter(other => other !== entry);
+      this.dispatch();
+    });
+
+    this.workers.push(entry);
+    return entry;
+  }
+}
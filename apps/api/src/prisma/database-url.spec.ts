@@ -0,0 +1,24 @@
+import { withPoolSettings } from './database-url';
+
+describe('withPoolSettings', () => {
+  it('should set pool parameters and keep the rest of the URL', () => {
+    const url = withPoolSettings('postgresql://app:secret@db:5432/twitter?schema=public&connection_limit=3', {
+      poolSize: 20,
+      acquireTimeoutS: 5,
+      statementTimeoutMs: 3000,
+    });
+
+    const parsed = new URL(url);
+    expect(parsed.host).toBe('db:5432');
+    expect(parsed.searchParams.get('schema')).toBe('public');
+    expect(parsed.searchParams.get('connection_limit')).toBe('20');
+    expect(parsed.searchParams.get('pool_timeout')).toBe('5');
+    expect(parsed.searchParams.get('options')).toBe('-c statement_timeout=3000');
+  });
+
+  it('should leave unset settings alone', () => {
+    const url = 'postgresql://app:secret@db:5432/twitter?connection_limit=3';
+
+    expect(new URL(withPoolSettings(url, {})).searchParams.get('connection_limit')).toBe('3');
+  });
+});
@@ -0,0 +1,36 @@
+export interface PoolSettings {
+  // Connections this process opens to the database (Prisma's connection_limit)
+  poolSize?: number;
+  // Seconds a query waits for a free connection before failing (Prisma's pool_timeout)
+  acquireTimeoutS?: number;
+  // Server-side cap on any single statement, in milliseconds
+  statementTimeoutMs?: number;
+}
+
+/** Applies pool settings to a Postgres URL, overriding any the URL already carries. */
+export function withPoolSettings(url: string, settings: PoolSettings): string {
+  const parsed = new URL(url);
+  if (settings.poolSize !== undefined) {
+    parsed.searchParams.set('connection_limit', String(settings.poolSize));
+  }
+  if (settings.acquireTimeoutS !== undefined) {
+    parsed.searchParams.set('pool_timeout', String(settings.acquireTimeoutS));
+  }
+  if (settings.statementTimeoutMs !== undefined) {
+    // Startup options, so every pooled connection gets it without a per-query SET
+    parsed.searchParams.set('options', `-c statement_timeout=${settings.statementTimeoutMs}`);
+  }
+  return parsed.toString();
+}
+
+function optionalInt(value?: string) {
+  return value ? parseInt(value) : undefined;
+}
+
+export function poolSettingsFromEnv(prefix: 'DATABASE' | 'DATABASE_REPLICA'): PoolSettings {
+  return {
+    poolSize: optionalInt(process.env[`${prefix}_POOL_SIZE`]),
+    acquireTimeoutS: optionalInt(process.env[`${prefix}_POOL_TIMEOUT_S`]),
+    statementTimeoutMs: optionalInt(process.env[`${prefix}_STATEMENT_TIMEOUT_MS`]),
+  };
+}
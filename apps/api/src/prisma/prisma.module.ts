@@ -1,9 +1,11 @@
 import { Global, Module } from '@nestjs/common';
+import { APP_INTERCEPTOR } from '@nestjs/core';
 import { PrismaService } from './prisma.service';
+import { ReadYourWritesInterceptor } from './read-your-writes.interceptor';
 
 @Global()
 @Module({
-  providers: [PrismaService],
+  providers: [PrismaService, { provide: APP_INTERCEPTOR, useClass: ReadYourWritesInterceptor }],
   exports: [PrismaService],
 })
 export class PrismaModule {}
@@ -1,12 +1,48 @@
 import { Injectable, OnModuleInit, OnModuleDestroy } from '@nestjs/common';
-import { PrismaClient } from '@repo/database';
+import { Prisma, PrismaClient } from '@repo/database';
+import { LruCache } from '../common/lru-cache';
+import { poolSettingsFromEnv, withPoolSettings } from './database-url';
+import { ClusterBusService } from '../cluster-bus/cluster-bus.service';
 
+// Unset: every query goes to the primary
+const DATABASE_REPLICA_URL = process.env.DATABASE_REPLICA_URL;
+// How long a user's reads stay on the primary after a write; should exceed worst replica lag
+const READ_YOUR_WRITES_MS = parseInt(process.env.READ_YOUR_WRITES_MS ?? '5000');
+const READ_YOUR_WRITES_MAX_USERS = 100000;
+
+export type DatabaseClient = PrismaClient<Prisma.PrismaClientOptions, 'query'>;
+
+function clientOptions(url?: string, prefix: 'DATABASE' | 'DATABASE_REPLICA' = 'DATABASE'): Prisma.PrismaClientOptions {
+  return {
+    // Query events feed MetricsService's statement histogram and the benchmarks' statement counts
+    log: [{ emit: 'event', level: 'query' }],
+    ...(url ? { datasources: { db: { url: withPoolSettings(url, poolSettingsFromEnv(prefix)) } } } : {}),
+  };
+}
+
+/**
+ * The primary client, plus an optional read replica for feed, profile and notification
+ * reads. Users who just wrote are kept on the primary for READ_YOUR_WRITES_MS, so they
+ * never see their own change missing because the replica hasn't replayed it yet.
+ */
 @Injectable()
-export class PrismaService extends PrismaClient implements OnModuleInit, OnModuleDestroy {
+export class PrismaService extends PrismaClient<Prisma.PrismaClientOptions, 'query'> implements OnModuleInit, OnModuleDestroy {
+  readonly replica: DatabaseClient | null = DATABASE_REPLICA_URL
+    ? new PrismaClient(clientOptions(DATABASE_REPLICA_URL, 'DATABASE_REPLICA')) as DatabaseClient
+    : null;
+  private readonly recentWriters = new LruCache<string, true>(READ_YOUR_WRITES_MAX_USERS, READ_YOUR_WRITES_MS);
+
+  constructor(private clusterBus: ClusterBusService) {
+    super(clientOptions(process.env.DATABASE_URL));
+    // The user's next request may land on another process
+    clusterBus.subscribe('recent-writers', ({ userIds }: { userIds: string[] }) => this.pin(userIds));
+  }
+
   async onModuleInit() {
     try {
       await this.$connect();
-      console.log('[PrismaService] Successfully connected to the database.');
+      await this.replica?.$connect();
+      console.log(`[PrismaService] Successfully connected to the database${this.replica ? ' and read replica' : ''}.`);
     } catch (error) {
       console.error('[PrismaService] Failed to connect to the database:', error);
       throw error;
@@ -14,6 +50,38 @@ export class PrismaService extends PrismaClient implements OnModuleInit, OnModul
   }
 
   async onModuleDestroy() {
-    await this.$disconnect();
+    await Promise.all([this.$disconnect(), this.replica?.$disconnect()]);
+  }
+
+  /**
+   * Client for a read that may lag slightly: the replica, unless one of `userIds` wrote
+   * within the read-your-writes window. Writes and read-then-write checks use `this`.
+   */
+  reader(...userIds: (string | undefined)[]): DatabaseClient {
+    if (!this.replica || userIds.some(userId => userId && this.wroteRecently(userId))) return this;
+    return this.replica;
+  }
+
+  /** Records that data owned by these users changed, pinning their reads to the primary. */
+  markWritten(...userIds: string[]) {
+    if (!this.replica) return;
+    this.pin(userIds);
+    this.clusterBus.publish('recent-writers', { userIds });
+  }
+
+  private pin(userIds: string[]) {
+    if (!this.replica) return;
+    userIds.forEach(userId => this.recentWriters.set(userId, true));
+  }
+
+  wroteRecently(userId: string) {
+    return !!this.recentWriters.get(userId);
+  }
+
+  get clients(): { name: 'primary' | 'replica'; client: DatabaseClient }[] {
+    return [
+      { name: 'primary', client: this },
+      ...(this.replica ? [{ name: 'replica' as const, client: this.replica }] : []),
+    ];
   }
 }
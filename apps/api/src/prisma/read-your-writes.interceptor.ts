@@ -0,0 +1,24 @@
+import { CallHandler, ExecutionContext, Injectable, NestInterceptor } from '@nestjs/common';
+import type { Request } from 'express';
+import { Observable, finalize } from 'rxjs';
+import { PrismaService } from './prisma.service';
+
+const READ_ONLY_METHODS = new Set(['GET', 'HEAD', 'OPTIONS']);
+
+/** Pins an authenticated user's reads to the primary after any mutating request. */
+@Injectable()
+export class ReadYourWritesInterceptor implements NestInterceptor {
+  constructor(private prisma: PrismaService) {}
+
+  intercept(context: ExecutionContext, next: CallHandler): Observable<unknown> {
+    if (context.getType() !== 'http') return next.handle();
+
+    const req = context.switchToHttp().getRequest<Request & { user?: { userId?: string } }>();
+    const userId = req.user?.userId;
+    if (!userId || READ_ONLY_METHODS.has(req.method)) return next.handle();
+
+    // Marked again on completion so the window runs from the commit, not the request start
+    this.prisma.markWritten(userId);
+    return next.handle().pipe(finalize(() => this.prisma.markWritten(userId)));
+  }
+}
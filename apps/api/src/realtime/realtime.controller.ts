@@ -0,0 +1,29 @@
+import { Controller, Get, Headers, Query, Req, Res, UnauthorizedException } from '@nestjs/common';
+import { AuthTokenService } from '../auth/auth-token.service';
+import type { Request, Response } from 'express';
+import { RealtimeService } from './realtime.service';
+
+@Controller('realtime')
+export class RealtimeController {
+  constructor(
+    private readonly realtimeService: RealtimeService,
+    private readonly authTokenService: AuthTokenService
+  ) {}
+
+  // EventSource can't set headers, so the token may also come as ?token=
+  @Get('stream')
+  stream(
+    @Req() req: Request,
+    @Res() res: Response,
+    @Query('token') token?: string,
+    @Headers('authorization') authHeader?: string,
+    @Headers('last-event-id') lastEventId?: string,
+  ) {
+    const user = token ? this.authTokenService.verify(token) : this.authTokenService.fromHeader(authHeader);
+    if (!user) {
+      throw new UnauthorizedException('Invalid token');
+    }
+
+    this.realtimeService.connect(user.userId, req, res, lastEventId);
+  }
+}
@@ -0,0 +1,12 @@
+import { Module } from '@nestjs/common';
+import { AuthTokenModule } from '../auth/auth-token.module';
+import { RealtimeService } from './realtime.service';
+import { RealtimeController } from './realtime.controller';
+
+@Module({
+  imports: [AuthTokenModule],
+  controllers: [RealtimeController],
+  providers: [RealtimeService],
+  exports: [RealtimeService],
+})
+export class RealtimeModule {}
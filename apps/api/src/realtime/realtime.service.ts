@@ -0,0 +1,177 @@
+import { Injectable, OnModuleDestroy } from '@nestjs/common';
+import type { Request, Response } from 'express';
+import { LruCache } from '../common/lru-cache';
+import { ClusterBusService } from '../cluster-bus/cluster-bus.service';
+
+const HEARTBEAT_INTERVAL_MS = 25 * 1000;
+// Unflushed bytes a slow client may accumulate before we drop it; it resumes via Last-Event-ID
+const MAX_PENDING_BYTES = 256 * 1024;
+// Replay window per user for reconnects
+const HISTORY_EVENTS_PER_USER = 100;
+const HISTORY_TTL_MS = 5 * 60 * 1000;
+const HISTORY_MAX_USERS = 50000;
+
+// Event ids are "<boot>:<seq>"; a different boot means the replay buffer is gone.
+// Each process has its own buffer, so the pid keeps workers started together apart.
+const BOOT_ID = `${Date.now().toString(36)}${process.pid.toString(36)}`;
+
+export type RealtimeEventType = 'message' | 'notification';
+
+interface RealtimeEvent {
+  seq: number;
+  frame: string;
+}
+
+interface Connection {
+  res: Response;
+  pending: string[];
+  pendingBytes: number;
+  draining: boolean;
+}
+
+/**
+ * Server-sent events hub. Services publish per-user events; each open stream
+ * gets heartbeats, bounded write buffering and replay from Last-Event-ID.
+ * Events also go out over the cluster bus, since a user's stream may be held by
+ * another process; a reconnect that lands on a different process gets a reset.
+ */
+@Injectable()
+export class RealtimeService implements OnModuleDestroy {
+  private readonly connections = new Map<string, Set<Connection>>();
+  private readonly history = new LruCache<string, RealtimeEvent[]>(HISTORY_MAX_USERS, HISTORY_TTL_MS);
+  private sequence = 0;
+  private readonly heartbeat = setInterval(() => this.sendHeartbeats(), HEARTBEAT_INTERVAL_MS);
+
+  constructor(private clusterBus: ClusterBusService) {
+    this.heartbeat.unref();
+    clusterBus.subscribe('realtime', ({ userIds, type, payload }: { userIds: string[]; type: RealtimeEventType; payload?: string }) => {
+      if (payload === undefined) this.reset(userIds);
+      else this.deliver(userIds, type, payload);
+    });
+    // Events meant for this worker were lost; have every client reload
+    clusterBus.onReset(() => this.reset([...this.connections.keys()]));
+  }
+
+  onModuleDestroy() {
+    clearInterval(this.heartbeat);
+    for (const connections of this.connections.values()) {
+      connections.forEach(connection => connection.res.end());
+    }
+    this.connections.clear();
+  }
+
+  publish(userIds: string[], type: RealtimeEventType, data: unknown) {
+    const payload = JSON.stringify(data);
+    this.deliver(userIds, type, payload);
+
+    // Too big for the bus: streams elsewhere are told to refetch instead
+    if (!this.clusterBus.publish('realtime', { userIds, type, payload })) {
+      this.clusterBus.publish('realtime', { userIds, type });
+    }
+  }
+
+  private deliver(userIds: string[], type: RealtimeEventType, payload: string) {
+    for (const userId of new Set(userIds)) {
+      const seq = ++this.sequence;
+      const frame = `id: ${BOOT_ID}:${seq}\nevent: ${type}\ndata: ${payload}\n\n`;
+
+      const events = this.history.get(userId) ?? [];
+      events.push({ seq, frame });
+      if (events.length > HISTORY_EVENTS_PER_USER) events.shift();
+      this.history.set(userId, events);
+
+      this.connections.get(userId)?.forEach(connection => this.write(connection, frame));
+    }
+  }
+
+  connect(userId: string, req: Request, res: Response, lastEventId?: string) {
+    res.status(200);
+    res.setHeader('Content-Type', 'text/event-stream');
+    res.setHeader('Cache-Control', 'no-cache, no-transform');
+    res.setHeader('Connection', 'keep-alive');
+    // Stops nginx-style proxies from buffering the stream
+    res.setHeader('X-Accel-Buffering', 'no');
+    res.flushHeaders();
+
+    const connection: Connection = { res, pending: [], pendingBytes: 0, draining: false };
+    const userConnections = this.connections.get(userId) ?? new Set<Connection>();
+    userConnections.add(connection);
+    this.connections.set(userId, userConnections);
+
+    this.write(connection, `retry: 3000\n\n`);
+    this.replay(userId, connection, lastEventId);
+
+    req.on('close', () => {
+      userConnections.delete(connection);
+      if (userConnections.size === 0) this.connections.delete(userId);
+    });
+  }
+
+  private reset(userIds: string[]) {
+    for (const userId of userIds) {
+      this.connections.get(userId)?.forEach(connection => this.write(connection, `event: reset\ndata: {}\n\n`));
+    }
+  }
+
+  get connectionCount() {
+    let count = 0;
+    this.connections.forEach(connections => (count += connections.size));
+    return count;
+  }
+
+  private replay(userId: string, connection: Connection, lastEventId?: string) {
+    if (!lastEventId) return;
+
+    const [boot, seqText] = lastEventId.split(':');
+    const lastSeq = parseInt(seqText);
+    const events = this.history.get(userId);
+
+    // Gap we can't fill (restart, or more events than the window holds): ask for a full reload.
+    // A missing history may have expired with events the client never saw, so unless nothing
+    // at all has been published since its last event, it gets a reload too.
+    const gap = events ? lastSeq < events[0].seq - 1 : lastSeq < this.sequence;
+    if (boot !== BOOT_ID || Number.isNaN(lastSeq) || gap) {
+      this.write(connection, `event: reset\ndata: {}\n\n`);
+      return;
+    }
+
+    (events ?? [])
+      .filter(event => event.seq > lastSeq)
+      .forEach(event => this.write(connection, event.frame));
+  }
+
+  private write(connection: Connection, chunk: string) {
+    if (connection.res.writableEnded) return;
+
+    if (connection.draining) {
+      connection.pending.push(chunk);
+      connection.pendingBytes += Buffer.byteLength(chunk);
+      if (connection.pendingBytes > MAX_PENDING_BYTES) {
+        connection.res.end();
+      }
+      return;
+    }
+
+    if (!connection.res.write(chunk)) {
+      connection.draining = true;
+      connection.res.once('drain', () => this.flushPending(connection));
+    }
+  }
+
+  private flushPending(connection: Connection) {
+    connection.draining = false;
+    const pending = connection.pending;
+    connection.pending = [];
+    connection.pendingBytes = 0;
+    pending.forEach(chunk => this.write(connection, chunk));
+  }
+
+  private sendHeartbeats() {
+    for (const connections of this.connections.values()) {
+      connections.forEach(connection => {
+        // Skip slow clients; piling heartbeats onto their buffer would only hasten the drop
+        if (!connection.draining) this.write(connection, `: heartbeat\n\n`);
+      });
+    }
+  }
+}
@@ -0,0 +1,23 @@
+import { NestFactory } from '@nestjs/core';
+import { AppModule } from '../app.module';
+import { TimelineService } from './timeline.service';
+
+// Usage: pnpm --filter api timeline:rebuild [userId]
+async function rebuild() {
+  const app = await NestFactory.createApplicationContext(AppModule);
+  const timelineService = app.get(TimelineService);
+  const userId = process.argv[2];
+
+  try {
+    if (userId) {
+      await timelineService.rebuild(userId);
+      console.log(`[RebuildTimelines] Rebuilt timeline for ${userId}`);
+    } else {
+      const count = await timelineService.rebuildAll();
+      console.log(`[RebuildTimelines] Rebuilt ${count} timelines`);
+    }
+  } finally {
+    await app.close();
+  }
+}
+rebuild();
@@ -0,0 +1,194 @@
+import { Injectable } from '@nestjs/common';
+import { PrismaService } from '../prisma/prisma.service';
+import { Cursor } from '../common/cursor';
+
+// Entries kept per home timeline; older tweets are trimmed during fan-out
+const TIMELINE_MAX_ENTRIES = parseInt(process.env.TIMELINE_MAX_ENTRIES ?? '800');
+// Share of the receiving timelines each fan-out trims. A timeline is trimmed about once
+// every 1/rate inserts, so it overshoots the cap by roughly that many entries at most.
+const TIMELINE_TRIM_SAMPLE_RATE = parseFloat(process.env.TIMELINE_TRIM_SAMPLE_RATE ?? '0.03');
+// Authors with at least this many followers are merged in at read time instead of fanned out
+const FANOUT_FOLLOWER_THRESHOLD = parseInt(process.env.TIMELINE_FANOUT_THRESHOLD ?? '10000');
+
+export interface TimelineKey {
+  id: string;
+  createdAt: Date;
+}
+
+@Injectable()
+export class TimelineService {
+  constructor(private prisma: PrismaService) {}
+
+  /**
+   * Pushes a freshly created tweet into every follower's home timeline with a single
+   * INSERT ... SELECT, then trims a sample of those timelines back to the cap.
+   * High-follower authors are flagged instead and pulled on read.
+   */
+  async fanOut(tweet: { id: string; authorId: string; createdAt: Date }) {
+    const author = await this.prisma.user.findUnique({
+      where: { id: tweet.authorId },
+      select: { fanoutOnRead: true, followersCount: true },
+    });
+    if (!author || author.fanoutOnRead) return;
+
+    if (author.followersCount >= FANOUT_FOLLOWER_THRESHOLD) {
+      // Sticky on purpose: un-flagging later would hide tweets that were never fanned out
+      await this.prisma.user.update({ where: { id: tweet.authorId }, data: { fanoutOnRead: true } });
+      return;
+    }
+
+    await this.prisma.$executeRaw`
+      INSERT INTO "TimelineEntry" ("userId", "tweetId", "authorId", "createdAt")
+      SELECT f."followerId", ${tweet.id}, ${tweet.authorId}, ${tweet.createdAt}
+      FROM "Follow" f
+      WHERE f."followingId" = ${tweet.authorId}
+      ON CONFLICT DO NOTHING
+    `;
+
+    await this.trimSample(tweet.authorId);
+  }
+
+  /**
+   * Returns the ordered (id, createdAt) keys of a home timeline page, merging the
+   * materialized entries with tweets from followed high-follower authors.
+   */
+  async getPage(userId: string, options: { after?: Cursor; skip?: number; take: number }): Promise<TimelineKey[]> {
+    const skip = options.skip ?? 0;
+    const window = skip + options.take;
+    const after = options.after;
+
+    const [entries, pulledAuthors] = await Promise.all([
+      this.prisma.reader(userId).timelineEntry.findMany({
+        where: {
+          userId,
+          ...(after ? {
+            OR: [
+              { createdAt: { lt: after.createdAt } },
+              { createdAt: after.createdAt, tweetId: { lt: after.id } },
+            ],
+          } : {}),
+        },
+        orderBy: [{ createdAt: 'desc' }, { tweetId: 'desc' }],
+        take: window,
+        select: { tweetId: true, createdAt: true },
+      }),
+      this.prisma.reader(userId).follow.findMany({
+        where: { followerId: userId, following: { fanoutOnRead: true } },
+        select: { followingId: true },
+      }),
+    ]);
+
+    const keys = new Map<string, TimelineKey>();
+    for (const entry of entries) {
+      keys.set(entry.tweetId, { id: entry.tweetId, createdAt: entry.createdAt });
+    }
+
+    if (pulledAuthors.length > 0) {
+      const pulled = await this.prisma.reader(userId).tweet.findMany({
+        where: {
+          authorId: { in: pulledAuthors.map(f => f.followingId) },
+          ...(after ? {
+            OR: [
+              { createdAt: { lt: after.createdAt } },
+              { createdAt: after.createdAt, id: { lt: after.id } },
+            ],
+          } : {}),
+        },
+        orderBy: [{ createdAt: 'desc' }, { id: 'desc' }],
+        take: window,
+        select: { id: true, createdAt: true },
+      });
+      for (const tweet of pulled) {
+        keys.set(tweet.id, tweet);
+      }
+    }
+
+    return [...keys.values()]
+      .sort((a, b) => b.createdAt.getTime() - a.createdAt.getTime() || (a.id < b.id ? 1 : a.id > b.id ? -1 : 0))
+      .slice(skip, window);
+  }
+
+  /** Backfills a newly followed author's recent tweets into the follower's timeline. */
+  async onFollow(followerId: string, followingId: string) {
+    await this.prisma.$executeRaw`
+      INSERT INTO "TimelineEntry" ("userId", "tweetId", "authorId", "createdAt")
+      SELECT ${followerId}, t."id", t."authorId", t."createdAt"
+      FROM "Tweet" t
+      JOIN "User" u ON u."id" = t."authorId" AND u."fanoutOnRead" = false
+      WHERE t."authorId" = ${followingId}
+      ORDER BY t."createdAt" DESC, t."id" DESC
+      LIMIT ${TIMELINE_MAX_ENTRIES}
+      ON CONFLICT DO NOTHING
+    `;
+  }
+
+  async onUnfollow(followerId: string, followingId: string) {
+    await this.prisma.timelineEntry.deleteMany({
+      where: { userId: followerId, authorId: followingId },
+    });
+  }
+
+  /** Rebuilds one user's home timeline from scratch out of the Follow and Tweet tables. */
+  async rebuild(userId: string) {
+    await this.prisma.$transaction([
+      this.prisma.timelineEntry.deleteMany({ where: { userId } }),
+      this.prisma.$executeRaw`
+        INSERT INTO "TimelineEntry" ("userId", "tweetId", "authorId", "createdAt")
+        SELECT ${userId}, t."id", t."authorId", t."createdAt"
+        FROM "Tweet" t
+        JOIN "Follow" f ON f."followingId" = t."authorId" AND f."followerId" = ${userId}
+        JOIN "User" u ON u."id" = t."authorId" AND u."fanoutOnRead" = false
+        ORDER BY t."createdAt" DESC, t."id" DESC
+        LIMIT ${TIMELINE_MAX_ENTRIES}
+        ON CONFLICT DO NOTHING
+      `,
+    ]);
+  }
+
+  async rebuildAll(batchSize: number = 500) {
+    let cursor: string | undefined;
+    let rebuilt = 0;
+
+    while (true) {
+      const users = await this.prisma.user.findMany({
+        select: { id: true },
+        orderBy: { id: 'asc' },
+        take: batchSize,
+        ...(cursor ? { skip: 1, cursor: { id: cursor } } : {}),
+      });
+      if (users.length === 0) break;
+
+      for (const user of users) {
+        await this.rebuild(user.id);
+      }
+      rebuilt += users.length;
+      cursor = users[users.length - 1].id;
+      console.log(`[TimelineService] Rebuilt ${rebuilt} timelines`);
+    }
+
+    return rebuilt;
+  }
+
+  private async trimSample(authorId: string) {
+    if (TIMELINE_TRIM_SAMPLE_RATE <= 0) return;
+
+    // Keeps each sampled follower's newest TIMELINE_MAX_ENTRIES rows; timelines shorter
+    // than that have no cut-off row and drop out of the join
+    await this.prisma.$executeRaw`
+      DELETE FROM "TimelineEntry" e
+      USING (
+        SELECT f."followerId", b."createdAt", b."tweetId"
+        FROM "Follow" f
+        CROSS JOIN LATERAL (
+          SELECT "createdAt", "tweetId" FROM "TimelineEntry"
+          WHERE "userId" = f."followerId"
+          ORDER BY "createdAt" DESC, "tweetId" DESC
+          OFFSET ${TIMELINE_MAX_ENTRIES - 1} LIMIT 1
+        ) b
+        WHERE f."followingId" = ${authorId} AND random() < ${TIMELINE_TRIM_SAMPLE_RATE}
+      ) cut
+      WHERE e."userId" = cut."followerId"
+        AND (e."createdAt", e."tweetId") < (cut."createdAt", cut."tweetId")
+    `;
+  }
+}
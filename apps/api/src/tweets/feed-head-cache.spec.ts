@@ -0,0 +1,53 @@
+import { FeedHeadCache } from './feed-head-cache';
+
+const row = (id: string, minute: number) => ({ id, createdAt: new Date(Date.UTC(2025, 0, 1, 0, minute)) });
+
+describe('FeedHeadCache', () => {
+  const feed = [row('c', 3), row('b', 2), row('a', 1)];
+
+  it('should serve pages inside the head and defer the rest to the caller', async () => {
+    const load = jest.fn(async (take: number) => feed.slice(0, take));
+    const cache = new FeedHeadCache(2, 60000, load);
+
+    expect(await cache.getPage({ take: 2 })).toEqual([feed[0], feed[1]]);
+    expect(await cache.getPage({ after: feed[0], take: 1 })).toEqual([feed[1]]);
+    expect(await cache.getPage({ skip: 1, take: 2 })).toBeNull();
+    expect(load).toHaveBeenCalledTimes(1);
+  });
+
+  it('should keep new rows in feed order and drop removed ones', async () => {
+    const cache = new FeedHeadCache(5, 60000, async () => [...feed]);
+    await cache.getPage({ take: 1 });
+
+    cache.add(row('d', 4));
+    cache.remove('b');
+
+    expect((await cache.getPage({ take: 5 }))!.map(r => r.id)).toEqual(['d', 'c', 'a']);
+  });
+
+  it('should reload after an invalidation', async () => {
+    const load = jest.fn(async (take: number) => feed.slice(0, take));
+    const cache = new FeedHeadCache(5, 60000, load);
+    await cache.getPage({ take: 1 });
+
+    cache.invalidate();
+    await cache.getPage({ take: 1 });
+    expect(load).toHaveBeenCalledTimes(2);
+  });
+
+  it('should keep a reload that raced writes, with the writes replayed onto it', async () => {
+    let resolve!: (rows: ReturnType<typeof row>[]) => void;
+    const load = jest.fn(() => new Promise<ReturnType<typeof row>[]>(r => (resolve = r)));
+    const cache = new FeedHeadCache(5, 60000, load);
+
+    const page = cache.getPage({ take: 5 });
+    cache.add(row('d', 4));
+    cache.add(row('c', 3));
+    cache.remove('a');
+    resolve([...feed]);
+
+    expect((await page)!.map(r => r.id)).toEqual(['d', 'c', 'b']);
+    expect((await cache.getPage({ take: 5 }))!.map(r => r.id)).toEqual(['d', 'c', 'b']);
+    expect(load).toHaveBeenCalledTimes(1);
+  });
+});
@@ -0,0 +1,125 @@
+import { Cursor } from '../common/cursor';
+
+interface FeedRow {
+  id: string;
+  createdAt: Date;
+}
+
+// Newest-first order of the feed: (createdAt, id) descending
+function isOlderThan(row: FeedRow, cursor: Cursor) {
+  const diff = row.createdAt.getTime() - cursor.createdAt.getTime();
+  return diff < 0 || (diff === 0 && row.id < cursor.id);
+}
+
+/**
+ * The newest rows of a feed every viewer shares, held in memory so its first pages
+ * skip the database. Writers keep it current with add/update/remove; the TTL reload
+ * picks up what they can't see (counter changes, writes on other instances).
+ * Callers overlay viewer-specific state on the returned rows, which are shared and
+ * must not be mutated.
+ */
+interface HeadState<T> {
+  rows: T[];
+  // True when the rows are the whole feed, not just its head
+  complete: boolean;
+}
+
+type HeadWrite<T> = (state: HeadState<T>) => HeadState<T>;
+
+export class FeedHeadCache<T extends FeedRow> {
+  private state: HeadState<T> | null = null;
+  private expiresAt = 0;
+  private loading: Promise<HeadState<T>> | null = null;
+  // Writes made while a reload is in flight, replayed onto its rows before they're kept
+  private writesDuringLoad: HeadWrite<T>[] | null = null;
+  // Bumped by invalidate, so a load that started before one isn't kept
+  private generation = 0;
+
+  constructor(
+    private readonly maxRows: number,
+    private readonly ttlMs: number,
+    private readonly load: (take: number) => Promise<T[]>
+  ) {}
+
+  /**
+   * Rows for one page, or null when the page reaches past the cached head and the
+   * caller has to query.
+   */
+  async getPage(options: { skip?: number; after?: Cursor; take: number }): Promise<T[] | null> {
+    if (this.maxRows <= 0) return null;
+
+    const { rows, complete } = await this.current();
+    let start = options.skip ?? 0;
+    if (options.after) {
+      const index = rows.findIndex(row => isOlderThan(row, options.after!));
+      start = index === -1 ? rows.length : index;
+    }
+
+    if (start + options.take > rows.length && !complete) return null;
+    return rows.slice(start, start + options.take);
+  }
+
+  add(row: T) {
+    this.write(({ rows, complete }) => {
+      // A reload that ran after the insert already has it
+      const next = rows.filter(existing => existing.id !== row.id);
+      const index = next.findIndex(existing => isOlderThan(existing, row));
+      next.splice(index === -1 ? next.length : index, 0, row);
+      if (next.length > this.maxRows) {
+        next.length = this.maxRows;
+        complete = false;
+      }
+      return { rows: next, complete };
+    });
+  }
+
+  update(id: string, changes: Partial<T>) {
+    this.write(({ rows, complete }) => ({
+      rows: rows.map(row => (row.id === id ? { ...row, ...changes } : row)),
+      complete,
+    }));
+  }
+
+  remove(id: string) {
+    this.write(({ rows, complete }) => ({ rows: rows.filter(row => row.id !== id), complete }));
+  }
+
+  /** Drops the cached rows; the next read reloads them. */
+  invalidate() {
+    this.generation++;
+    this.state = null;
+  }
+
+  private write(apply: HeadWrite<T>) {
+    if (this.state) this.state = apply(this.state);
+    // The in-flight reload may have read the table before this write
+    this.writesDuringLoad?.push(apply);
+  }
+
+  private current(): Promise<HeadState<T>> {
+    if (this.state && Date.now() < this.expiresAt) {
+      return Promise.resolve(this.state);
+    }
+
+    // One reload at a time; concurrent readers share it
+    if (!this.loading) {
+      const generation = this.generation;
+      const writes: HeadWrite<T>[] = [];
+      this.writesDuringLoad = writes;
+      this.loading = this.load(this.maxRows)
+        .then(rows => {
+          const state = writes.reduce((current, apply) => apply(current), { rows, complete: rows.length < this.maxRows });
+          if (generation === this.generation) {
+            this.state = state;
+            this.expiresAt = Date.now() + this.ttlMs;
+          }
+          return state;
+        })
+        .finally(() => {
+          this.loading = null;
+          this.writesDuringLoad = null;
+        });
+    }
+    return this.loading;
+  }
+}
@@ -0,0 +1,83 @@
+import { encodeCursor } from '../common/cursor';
+import { ThreadRow, buildReplyTree, clampParam } from './reply-tree';
+
+const row = (id: string, parentId: string | null, depth: number, rn: number | null, kind: ThreadRow['kind'] = 'reply'): ThreadRow => ({
+  kind,
+  depth,
+  rn,
+  id,
+  content: id,
+  image: null,
+  views: 0,
+  createdAt: new Date(Date.UTC(2025, 0, 1, 0, rn ?? 0)),
+  parentId,
+  authorId: 'u1',
+  likesCount: 0,
+  repliesCount: 0,
+  retweetsCount: 0,
+  quotesCount: 0,
+  author: { id: 'u1', name: null, username: 'u1', avatar: null },
+});
+
+// Shuffled on purpose: the query returns rows in no particular order
+const rows = [
+  row('a2', 'a', 2, 2),
+  row('c', 'root', 1, 3),
+  row('a1x', 'a1', 3, 1),
+  row('a4', 'a', 2, 4),
+  row('b', 'root', 1, 2),
+  row('a1', 'a', 2, 1),
+  row('parent', null, 1, null, 'ancestor'),
+  row('a', 'root', 1, 1),
+  row('root', 'parent', 0, null, 'focus'),
+  row('a3', 'a', 2, 3),
+];
+
+const ids = (nodes: { id: string }[]) => nodes.map(node => node.id);
+
+describe('buildReplyTree', () => {
+  it('should order siblings by position and turn the extra row into a nextCursor', () => {
+    const tree = buildReplyTree(rows, 'root', 3, 2, r => ({ id: r.id }));
+
+    expect(ids(tree.children)).toEqual(['a', 'b']);
+    expect(tree.nextCursor).toBe(encodeCursor(rows.find(r => r.id === 'b')!));
+  });
+
+  it('should page nested levels by the nested size and end leaves with a null cursor', () => {
+    const tree = buildReplyTree(rows, 'root', 3, 20, r => ({ id: r.id }));
+    const [a, b, c] = tree.children;
+
+    expect(ids(tree.children)).toEqual(['a', 'b', 'c']);
+    expect(tree.nextCursor).toBeNull();
+    expect(ids(a.children!)).toEqual(['a1', 'a2', 'a3']);
+    expect(a.nextCursor).toBe(encodeCursor(rows.find(r => r.id === 'a3')!));
+    expect(b).toMatchObject({ children: [], nextCursor: null });
+    expect(c).toMatchObject({ children: [], nextCursor: null });
+    expect(ids(a.children![0].children!)).toEqual(['a1x']);
+  });
+
+  it('should leave out children below the depth limit', () => {
+    const tree = buildReplyTree(rows, 'root', 2, 20, r => ({ id: r.id }));
+    const a1 = tree.children[0].children![0];
+
+    expect(a1.id).toBe('a1');
+    expect(a1).not.toHaveProperty('children');
+    expect(a1).not.toHaveProperty('nextCursor');
+  });
+
+  it('should nest only replies, not the ancestors or the focus tweet', () => {
+    const tree = buildReplyTree(rows, 'parent', 3, 20, r => ({ id: r.id }));
+
+    expect(tree).toEqual({ children: [], nextCursor: null });
+  });
+});
+
+describe('clampParam', () => {
+  it('should fall back on NaN and clamp to 1..max', () => {
+    expect(clampParam(NaN, 20, 100)).toBe(20);
+    expect(clampParam(2.5, 20, 100)).toBe(20);
+    expect(clampParam(0, 20, 100)).toBe(1);
+    expect(clampParam(500, 20, 100)).toBe(100);
+    expect(clampParam(7, 20, 100)).toBe(7);
+  });
+});
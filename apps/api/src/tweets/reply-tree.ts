@@ -0,0 +1,79 @@
+import { encodeCursor } from '../common/cursor';
+
+// Replies shown under each reply below the top level; the top level pages `limit` at a time
+export const THREAD_NESTED_REPLIES = 3;
+
+/** One row of TweetsService.queryThread: a tweet tagged with where it sits in the thread. */
+export interface ThreadRow {
+  kind: 'ancestor' | 'focus' | 'reply';
+  depth: number;
+  // Position among its siblings, oldest first; null for ancestors and the focus
+  rn: number | null;
+  id: string;
+  content: string | null;
+  image: string | null;
+  views: number;
+  createdAt: Date;
+  parentId: string | null;
+  authorId: string;
+  likesCount: number;
+  repliesCount: number;
+  retweetsCount: number;
+  quotesCount: number;
+  author: { id: string; name: string | null; username: string; avatar: string | null };
+}
+
+export type ReplyNode<T> = T & Partial<ReplyPage<T>>;
+
+export interface ReplyPage<T> {
+  children: ReplyNode<T>[];
+  nextCursor: string | null;
+}
+
+// Query params arrive as parseInt output, so NaN falls back to the default
+export function clampParam(value: number, fallback: number, max: number) {
+  return Number.isInteger(value) ? Math.min(Math.max(value, 1), max) : fallback;
+}
+
+export function toThreadShape(row: ThreadRow) {
+  const { kind, depth, rn, ...tweet } = row;
+  return tweet;
+}
+
+/**
+ * Nests the reply rows under `rootId`, oldest first. The query fetches one row past each
+ * page, which only turns into that level's nextCursor; levels at `maxDepth` come
+ * without `children`.
+ */
+export function buildReplyTree<T>(
+  rows: ThreadRow[],
+  rootId: string,
+  maxDepth: number,
+  limit: number,
+  toItem: (row: ThreadRow) => T
+): ReplyPage<T> {
+  const byParent = new Map<string, ThreadRow[]>();
+  for (const row of rows) {
+    if (row.kind !== 'reply' || !row.parentId) continue;
+    const siblings = byParent.get(row.parentId) ?? [];
+    siblings.push(row);
+    byParent.set(row.parentId, siblings);
+  }
+
+  const build = (parentId: string, depth: number): ReplyPage<T> => {
+    const pageSize = depth === 1 ? limit : THREAD_NESTED_REPLIES;
+    const siblings = (byParent.get(parentId) ?? []).sort((a, b) => a.rn! - b.rn!);
+    const hasMore = siblings.length > pageSize;
+    const page = hasMore ? siblings.slice(0, pageSize) : siblings;
+
+    return {
+      children: page.map(row => ({
+        ...toItem(row),
+        ...(depth < maxDepth ? build(row.id, depth + 1) : {}),
+      })),
+      nextCursor: hasMore ? encodeCursor(page[page.length - 1]) : null,
+    };
+  };
+
+  return build(rootId, 1);
+}
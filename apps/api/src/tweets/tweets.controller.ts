@@ -1,17 +1,23 @@
-import { Controller, Get, Post, Body, UseGuards, Request, Param, Delete, Headers, Patch, Query } from '@nestjs/common';
+import { Controller, Get, Post, Put, Body, UseGuards, Request, Param, Delete, Patch, Query, Header } from '@nestjs/common';
 import { TweetsService } from './tweets.service';
+import { LikesService } from '../likes/likes.service';
+import { ViewsService } from '../views/views.service';
 import { AuthGuard } from '@nestjs/passport';
-import { JwtService } from '@nestjs/jwt';
+import { OptionalJwtGuard } from '../auth/optional-jwt.guard';
 import { Prisma } from '@repo/database';
+import { parseFields, selectFields } from '../common/fields';
+import { RateLimit } from '../admission/rate-limit.decorator';
 
 @Controller('tweets')
 export class TweetsController {
   constructor(
     private readonly tweetsService: TweetsService,
-    private readonly jwtService: JwtService
+    private readonly likesService: LikesService,
+    private readonly viewsService: ViewsService
   ) {}
 
   @UseGuards(AuthGuard('jwt'))
+  @RateLimit('tweet-create', { user: '30/60', ip: '120/60' })
   @Post()
   create(@Body() createTweetDto: { content: string; image?: string; parentId?: string }, @Request() req: any) {
     const data: any = {
@@ -31,44 +37,62 @@ export class TweetsController {
     return this.tweetsService.create(data);
   }
 
+  @UseGuards(OptionalJwtGuard)
   @Get()
-  findAll(@Headers('authorization') authHeader?: string, @Query('authorId') authorId?: string, @Query('excludeReplies') excludeReplies?: string, @Query('following') following?: string, @Query('page') page?: string, @Query('limit') limit?: string) {
-    let userId: string | undefined;
-    if (authHeader) {
-      try {
-        const token = authHeader.split(' ')[1];
-        const decoded: any = this.jwtService.decode(token);
-        if (decoded?.sub) {
-          userId = decoded.sub;
-        } else if (decoded?.userId) {
-          userId = decoded.userId;
-        }
-      } catch (e) {
-        // ignore invalid tokens
-      }
+  @Header('Cache-Control', 'private, no-cache')
+  @Header('Vary', 'Authorization')
+  async findAll(@Request() req: any, @Query('authorId') authorId?: string, @Query('excludeReplies') excludeReplies?: string, @Query('following') following?: string, @Query('page') page?: string, @Query('limit') limit?: string, @Query('cursor') cursor?: string, @Query('fields') fields?: string, @Query('ids') ids?: string) {
+    const userId: string | undefined = req.user?.userId;
+    const limitNum = limit ? parseInt(limit) : 3;
+    const selection = parseFields(fields);
+    // Bulk hydration: ?ids=a,b,c returns those tweets (up to 100) in that order
+    if (ids !== undefined) {
+      const tweets = await this.tweetsService.findByIds(ids.split(',').filter(Boolean), userId);
+      return selectFields(tweets, selection);
+    }
+    // Passing `cursor` (empty for the first page) opts into keyset paging: { tweets, nextCursor }
+    if (cursor !== undefined) {
+      const result = await this.tweetsService.findPage(userId, authorId, excludeReplies === 'true', following === 'true', cursor, limitNum);
+      this.viewsService.record(this.viewerKey(req), result.tweets.map(tweet => tweet.id));
+      return { ...result, tweets: selectFields(result.tweets, selection) };
     }
     const pageNum = page ? parseInt(page) : 1;
-    const limitNum = limit ? parseInt(limit) : 3;
-    return this.tweetsService.findAll(userId, authorId, excludeReplies === 'true', following === 'true', pageNum, limitNum);
+    const tweets = await this.tweetsService.findAll(userId, authorId, excludeReplies === 'true', following === 'true', pageNum, limitNum);
+    this.viewsService.record(this.viewerKey(req), tweets.map(tweet => tweet.id));
+    return selectFields(tweets, selection);
   }
 
+  @UseGuards(OptionalJwtGuard)
   @Get(':id')
-  findOne(@Param('id') id: string, @Headers('authorization') authHeader?: string) {
-    let userId: string | undefined;
-    if (authHeader) {
-      try {
-        const token = authHeader.split(' ')[1];
-        const decoded: any = this.jwtService.decode(token);
-        if (decoded?.sub) {
-          userId = decoded.sub;
-        } else if (decoded?.userId) {
-          userId = decoded.userId;
-        }
-      } catch (e) {
-        // ignore invalid tokens
-      }
-    }
-    return this.tweetsService.findOne(id, userId);
+  @Header('Cache-Control', 'private, no-cache')
+  @Header('Vary', 'Authorization')
+  async findOne(@Param('id') id: string, @Request() req: any, @Query('fields') fields?: string) {
+    const userId: string | undefined = req.user?.userId;
+    const tweet = await this.tweetsService.findOne(id, userId);
+    if (!tweet) return tweet;
+    this.viewsService.record(this.viewerKey(req), [tweet.id, ...tweet.children.map(child => child.id)]);
+
+    // The selection applies to the tweet and to each reply alike
+    const selection = parseFields(fields);
+    return { ...selectFields(tweet, selection), children: selectFields(tweet.children, selection), nextCursor: tweet.nextCursor };
+  }
+
+  // Ancestors, the tweet and a depth-limited reply tree in one call
+  @UseGuards(OptionalJwtGuard)
+  @Get(':id/thread')
+  async findThread(@Param('id') id: string, @Request() req: any, @Query('depth') depth?: string, @Query('limit') limit?: string) {
+    const thread = await this.tweetsService.findThread(id, req.user?.userId, depth ? parseInt(depth) : undefined, limit ? parseInt(limit) : undefined);
+    this.viewsService.record(this.viewerKey(req), [thread.tweet.id, ...thread.children.map(child => child.id)]);
+    return thread;
+  }
+
+  // "Load more replies" for any node of a thread, using the nextCursor it came with
+  @UseGuards(OptionalJwtGuard)
+  @Get(':id/replies')
+  async findReplies(@Param('id') id: string, @Request() req: any, @Query('cursor') cursor?: string, @Query('depth') depth?: string, @Query('limit') limit?: string) {
+    const page = await this.tweetsService.findReplies(id, req.user?.userId, cursor || undefined, depth ? parseInt(depth) : undefined, limit ? parseInt(limit) : undefined);
+    this.viewsService.record(this.viewerKey(req), page.children.map(child => child.id));
+    return page;
   }
 
   @UseGuards(AuthGuard('jwt'))
@@ -85,8 +109,29 @@ export class TweetsController {
   }
 
   @UseGuards(AuthGuard('jwt'))
+  @RateLimit('like', { user: '120/60', ip: '600/60' })
+  @Put(':id/like')
+  async like(@Param('id') id: string, @Request() req: any) {
+    return this.likesService.like(id, req.user.userId);
+  }
+
+  @UseGuards(AuthGuard('jwt'))
+  @RateLimit('like', { user: '120/60', ip: '600/60' })
+  @Delete(':id/like')
+  async unlike(@Param('id') id: string, @Request() req: any) {
+    return this.likesService.unlike(id, req.user.userId);
+  }
+
+  // Toggle kept for older clients; PUT/DELETE are safe to retry
+  @UseGuards(AuthGuard('jwt'))
+  @RateLimit('like', { user: '120/60', ip: '600/60' })
   @Post(':id/like')
   async toggleLike(@Param('id') id: string, @Request() req: any) {
-    return this.tweetsService.toggleLike(id, req.user.userId);
+    return this.likesService.toggle(id, req.user.userId);
+  }
+
+  // Anonymous impressions are deduped per client address
+  private viewerKey(req: any): string {
+    return req.user?.userId ?? `anon:${req.ip}`;
   }
 }
@@ -2,11 +2,16 @@
 import { Module } from '@nestjs/common';
 import { TweetsController } from './tweets.controller';
 import { TweetsService } from './tweets.service';
-import { AuthModule } from '../auth/auth.module';
+import { AuthTokenModule } from '../auth/auth-token.module';
 import { NotificationsModule } from '../notifications/notifications.module';
+import { TimelineModule } from '../timeline/timeline.module';
+import { ViewerStateModule } from '../viewer-state/viewer-state.module';
+import { LikesModule } from '../likes/likes.module';
+import { ProfileCacheModule } from '../users/profile-cache.module';
+import { ViewsModule } from '../views/views.module';
 
 @Module({
-  imports: [AuthModule, NotificationsModule],
+  imports: [AuthTokenModule, NotificationsModule, TimelineModule, ViewerStateModule, LikesModule, ProfileCacheModule, ViewsModule],
   controllers: [TweetsController],
   providers: [TweetsService],
 })
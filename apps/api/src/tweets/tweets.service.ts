@@ -2,87 +2,256 @@ import { Injectable, NotFoundException, ForbiddenException } from '@nestjs/commo
 import { PrismaService } from '../prisma/prisma.service';
 import { Prisma } from '@repo/database';
 import { NotificationsService } from '../notifications/notifications.service';
+import { TimelineService } from '../timeline/timeline.service';
+import { TweetViewerState, ViewerStateService } from '../viewer-state/viewer-state.service';
+import { Cursor, decodeCursor, encodeCursor } from '../common/cursor';
+import { ProfileCacheService } from '../users/profile-cache.service';
+import { FeedHeadCache } from './feed-head-cache';
+import { THREAD_NESTED_REPLIES, ThreadRow, buildReplyTree, clampParam, toThreadShape } from './reply-tree';
+import { BatchLoader } from '../common/batch-loader';
+import { ClusterBusService } from '../cluster-bus/cluster-bus.service';
+
+type TweetCounters = { likesCount: number; repliesCount: number; retweetsCount: number; quotesCount: number };
+
+// Keeps the `_count` shape clients already read, now sourced from the stored counters
+function toCountShape(tweet: TweetCounters) {
+  return {
+    likes: tweet.likesCount,
+    replies: tweet.repliesCount,
+    retweets: tweet.retweetsCount,
+    quotes: tweet.quotesCount,
+  };
+}
+
+const FEED_INCLUDE = {
+  author: {
+    select: {
+      id: true,
+      name: true,
+      username: true,
+      avatar: true,
+    },
+  },
+} satisfies Prisma.TweetInclude;
+
+type FeedTweet = Prisma.TweetGetPayload<{ include: typeof FEED_INCLUDE }>;
+
+// A write to the global feed head, replayed by the other processes onto theirs. Dates
+// arrive as ISO strings; 'reload' stands in for a row too large to send
+type GlobalFeedChange =
+  | { op: 'add'; tweet: FeedTweet }
+  | { op: 'update'; id: string; changes: Pick<FeedTweet, 'content' | 'updatedAt'> }
+  | { op: 'remove'; id: string }
+  | { op: 'reload' };
+
+// (createdAt, id) gives a total order, which keyset paging needs to avoid skipping ties
+const FEED_ORDER: Prisma.TweetOrderByWithRelationInput[] = [{ createdAt: 'desc' }, { id: 'desc' }];
+
+// Newest global-feed tweets kept in memory; 0 disables. The TTL bounds how stale counters get
+const GLOBAL_FEED_CACHE_SIZE = parseInt(process.env.GLOBAL_FEED_CACHE_SIZE ?? '200');
+const GLOBAL_FEED_CACHE_TTL_MS = parseInt(process.env.GLOBAL_FEED_CACHE_TTL_MS ?? '5000');
+
+// Upper bound on GET /tweets?ids=
+export const MAX_BULK_IDS = 100;
+
+// Reply trees: top-level replies page `limit` at a time, deeper levels show a few each
+const THREAD_MAX_DEPTH = 5;
+const THREAD_MAX_PAGE_SIZE = 100;
+const THREAD_PAGE_SIZE = 20;
+const THREAD_MAX_ANCESTORS = 50;
 
 @Injectable()
 export class TweetsService {
+  // Every viewer's first global-feed pages are the same rows; only isLiked/isBookmarked differ
+  private readonly globalFeedHead = new FeedHeadCache<FeedTweet>(
+    GLOBAL_FEED_CACHE_SIZE,
+    GLOBAL_FEED_CACHE_TTL_MS,
+    // From the primary: the head is shared by every viewer and patched with this process's own
+    // writes, so a lagging replica would bake a stale head in for the whole TTL
+    take => this.prisma.tweet.findMany({ take, orderBy: FEED_ORDER, include: FEED_INCLUDE })
+  );
+
+  // Every by-id tweet lookup in a tick becomes one IN query
+  private readonly tweetsById = new BatchLoader<string, FeedTweet>(async ids => {
+    const tweets = await this.prisma.tweet.findMany({ where: { id: { in: ids } }, include: FEED_INCLUDE });
+    return new Map(tweets.map(tweet => [tweet.id, tweet]));
+  });
+
   constructor(
     private prisma: PrismaService,
-    private notificationsService: NotificationsService
-  ) {}
+    private notificationsService: NotificationsService,
+    private timelineService: TimelineService,
+    private viewerStateService: ViewerStateService,
+    private profileCache: ProfileCacheService,
+    private clusterBus: ClusterBusService
+  ) {
+    // Other processes apply the same write to their head, which stays warm
+    clusterBus.subscribe('global-feed', (change: GlobalFeedChange) => this.applyGlobalFeedChange(change));
+    clusterBus.onReset(() => this.globalFeedHead.invalidate());
+  }
 
   async create(data: Prisma.TweetCreateInput) {
-    const tweet = await this.prisma.tweet.create({
-      data,
-      include: {
-        author: {
-          select: {
-            id: true,
-            name: true,
-            username: true,
-            avatar: true,
-          },
-        },
-      },
+    const { tweet, parentTweet } = await this.prisma.$transaction(async (tx) => {
+      const tweet = await tx.tweet.create({
+        data,
+        include: FEED_INCLUDE,
+      });
+
+      await tx.user.update({
+        where: { id: tweet.authorId },
+        data: { tweetsCount: { increment: 1 } },
+      });
+
+      // The counter bump hands back the parent's author, so the reply notification needs no extra read
+      const parentTweet = tweet.parentId
+        ? await tx.tweet.update({
+            where: { id: tweet.parentId },
+            data: { repliesCount: { increment: 1 } },
+            select: { authorId: true },
+          })
+        : null;
+
+      return { tweet, parentTweet };
     });
 
-    if (data.parent?.connect?.id && data.author?.connect?.id) {
-       const parentTweet = await this.prisma.tweet.findUnique({ where: { id: data.parent.connect.id } });
-       if (parentTweet && parentTweet.authorId !== data.author.connect.id) {
-           await this.notificationsService.create({
-               type: 'REPLY',
-               user: { connect: { id: parentTweet.authorId } },
-               issuer: { connect: { id: data.author.connect.id } },
-               tweet: { connect: { id: tweet.id } }
-           });
-       }
+    this.globalFeedHead.add(tweet);
+    this.publishGlobalFeedChange({ op: 'add', tweet });
+    // The author's tweet count changed
+    this.profileCache.invalidate(tweet.authorId);
+
+    // Fan-out runs off the request path; the author's own post response shouldn't wait on follower count
+    this.timelineService.fanOut(tweet).catch(error => console.error('[TweetsService] Timeline fan-out failed:', error));
+
+    if (parentTweet) {
+      this.notificationsService.enqueue({
+        type: 'REPLY',
+        userId: parentTweet.authorId,
+        issuerId: tweet.authorId,
+        tweetId: tweet.id,
+      });
     }
 
     return tweet;
   }
 
-  async toggleLike(tweetId: string, userId: string) {
-    const like = await this.prisma.like.findUnique({
-      where: {
-        userId_tweetId: {
-          userId,
-          tweetId,
-        },
-      },
+  async findAll(userId?: string, authorId?: string, excludeReplies: boolean = false, onlyFollowing: boolean = false, page: number = 1, limit: number = 3) {
+    if (userId && this.usesHomeTimeline(authorId, excludeReplies, onlyFollowing)) {
+      const keys = await this.timelineService.getPage(userId, { skip: (page - 1) * limit, take: limit });
+      return this.findByKeys(keys, userId);
+    }
+
+    if (this.isGlobalFeed(userId, authorId, excludeReplies, onlyFollowing)) {
+      const cached = await this.globalFeedHead.getPage({ skip: (page - 1) * limit, take: limit });
+      if (cached) return this.withViewerState(cached, userId);
+    }
+
+    const whereClause = await this.buildFeedWhere(userId, authorId, excludeReplies, onlyFollowing);
+
+    const tweets = await this.prisma.reader(userId).tweet.findMany({
+      where: whereClause,
+      take: limit,
+      skip: (page - 1) * limit,
+      orderBy: FEED_ORDER,
+      include: FEED_INCLUDE,
     });
 
-    if (like) {
-      await this.prisma.like.delete({
-        where: {
-          userId_tweetId: {
-            userId,
-            tweetId,
-          },
-        },
-      });
-      return { liked: false };
-    } else {
-      await this.prisma.like.create({
-        data: {
-          userId,
-          tweetId,
-        },
+    return this.withViewerState(tweets, userId);
+  }
+
+  /**
+   * Keyset-paginated variant of findAll.
+   * Seeks past the (createdAt, id) of the previous page's last row, so deep pages
+   * cost the same as the first one and concurrent inserts don't shift results.
+   */
+  async findPage(userId?: string, authorId?: string, excludeReplies: boolean = false, onlyFollowing: boolean = false, cursor?: string, limit: number = 3) {
+    if (userId && this.usesHomeTimeline(authorId, excludeReplies, onlyFollowing)) {
+      const keys = await this.timelineService.getPage(userId, {
+        after: cursor ? decodeCursor(cursor) : undefined,
+        take: limit + 1,
       });
+      const hasMore = keys.length > limit;
+      const pageKeys = hasMore ? keys.slice(0, limit) : keys;
 
-      const tweet = await this.prisma.tweet.findUnique({ where: { id: tweetId } });
-      if (tweet && tweet.authorId !== userId) {
-          await this.notificationsService.create({
-              type: 'LIKE',
-              user: { connect: { id: tweet.authorId } },
-              issuer: { connect: { id: userId } },
-              tweet: { connect: { id: tweetId } }
-          });
+      return {
+        tweets: await this.findByKeys(pageKeys, userId),
+        nextCursor: hasMore ? encodeCursor(pageKeys[pageKeys.length - 1]) : null,
+      };
+    }
+
+    if (this.isGlobalFeed(userId, authorId, excludeReplies, onlyFollowing)) {
+      const cached = await this.globalFeedHead.getPage({
+        after: cursor ? decodeCursor(cursor) : undefined,
+        take: limit + 1,
+      });
+      if (cached) {
+        const hasMore = cached.length > limit;
+        const tweets = hasMore ? cached.slice(0, limit) : cached;
+        return {
+          tweets: await this.withViewerState(tweets, userId),
+          nextCursor: hasMore ? encodeCursor(tweets[tweets.length - 1]) : null,
+        };
       }
+    }
+
+    const whereClause = await this.buildFeedWhere(userId, authorId, excludeReplies, onlyFollowing);
 
-      return { liked: true };
+    if (cursor) {
+      const after = decodeCursor(cursor);
+      whereClause.AND = [
+        ...(whereClause.AND as Prisma.TweetWhereInput[]),
+        {
+          OR: [
+            { createdAt: { lt: after.createdAt } },
+            { createdAt: after.createdAt, id: { lt: after.id } },
+          ],
+        },
+      ];
     }
+
+    // Fetch one extra row to know whether another page exists without a count query
+    const rows = await this.prisma.reader(userId).tweet.findMany({
+      where: whereClause,
+      take: limit + 1,
+      orderBy: FEED_ORDER,
+      include: FEED_INCLUDE,
+    });
+
+    const hasMore = rows.length > limit;
+    const tweets = hasMore ? rows.slice(0, limit) : rows;
+
+    return {
+      tweets: await this.withViewerState(tweets, userId),
+      nextCursor: hasMore ? encodeCursor(tweets[tweets.length - 1]) : null,
+    };
   }
 
-  async findAll(userId?: string, authorId?: string, excludeReplies: boolean = false, onlyFollowing: boolean = false, page: number = 1, limit: number = 3) {
+  private usesHomeTimeline(authorId?: string, excludeReplies: boolean = false, onlyFollowing: boolean = false) {
+    // The materialized timeline only covers the plain "Following" feed; filtered variants fall back to the IN query
+    return onlyFollowing && !authorId && !excludeReplies;
+  }
+
+  private isGlobalFeed(userId?: string, authorId?: string, excludeReplies: boolean = false, onlyFollowing: boolean = false) {
+    // buildFeedWhere ignores onlyFollowing for anonymous viewers, so they get the global feed too
+    return !authorId && !excludeReplies && !(onlyFollowing && userId);
+  }
+
+  // Hydrates timeline keys in one query while keeping the timeline's order
+  private async findByKeys(keys: { id: string }[], userId?: string) {
+    if (keys.length === 0) return [];
+
+    const tweets = await this.prisma.reader(userId).tweet.findMany({
+      where: { id: { in: keys.map(key => key.id) } },
+      include: FEED_INCLUDE,
+    });
+    const byId = new Map(tweets.map(tweet => [tweet.id, tweet]));
+
+    const ordered = keys
+      .map(key => byId.get(key.id))
+      .filter((tweet): tweet is (typeof tweets)[number] => !!tweet);
+    return this.withViewerState(ordered, userId);
+  }
+
+  private async buildFeedWhere(userId?: string, authorId?: string, excludeReplies: boolean = false, onlyFollowing: boolean = false) {
     let whereClause: Prisma.TweetWhereInput = {
       AND: [
         authorId ? { authorId } : {},
@@ -91,7 +260,7 @@ export class TweetsService {
     };
 
     if (onlyFollowing && userId) {
-      const following = await this.prisma.follow.findMany({
+      const following = await this.prisma.reader(userId).follow.findMany({
         where: { followerId: userId },
         select: { followingId: true }
       });
@@ -106,95 +275,185 @@ export class TweetsService {
       ];
     }
 
-    const tweets = await this.prisma.tweet.findMany({
-      where: whereClause,
-      take: limit,
-      skip: (page - 1) * limit,
-      orderBy: {
-        createdAt: 'desc',
-      },
-      include: {
-        author: {
-          select: {
-            id: true,
-            name: true,
-            username: true,
-            avatar: true,
-          },
-        },
-        _count: {
-          select: {
-            likes: true,
-            replies: true,
-            retweets: true,
-            quotes: true,
-          },
-        },
-        likes: userId ? {
-          where: { userId },
-          select: { userId: true }
-        } : false,
-      },
-    });
+    return whereClause;
+  }
 
-    return tweets.map(tweet => ({
+  // Resolves isLiked/isBookmarked for the whole page in one query rather than a nested include per row
+  private async withViewerState<T extends TweetCounters & { id: string; views: number }>(tweets: T[], userId?: string) {
+    const states = await this.viewerStateService.getTweetStates(userId, tweets.map(tweet => tweet.id));
+    return tweets.map(tweet => this.toFeedItem(tweet, states.get(tweet.id)));
+  }
+
+  private toFeedItem<T extends TweetCounters & { views: number }>(tweet: T, state?: TweetViewerState) {
+    return {
       ...tweet,
-      isLiked: userId ? (tweet.likes as any[]).length > 0 : false,
-      likes: tweet._count.likes,
-      retweets: tweet._count.retweets,
-      replies: tweet._count.replies,
+      isLiked: state?.isLiked ?? false,
+      isBookmarked: state?.isBookmarked ?? false,
+      likes: tweet.likesCount,
+      retweets: tweet.retweetsCount,
+      replies: tweet.repliesCount,
       views: tweet.views,
-    }));
+      _count: toCountShape(tweet),
+    };
+  }
+
+  /** Bulk hydration in the caller's order; unknown ids are left out. */
+  async findByIds(ids: string[], userId?: string) {
+    const tweets = await this.tweetsById.loadMany(ids.slice(0, MAX_BULK_IDS));
+    return this.withViewerState([...tweets.values()], userId);
   }
 
+  /**
+   * A tweet with the first page of its direct replies, oldest first. A viral tweet's
+   * replies are paged like findThread's: nextCursor continues through findReplies.
+   */
   async findOne(id: string, userId?: string) {
-    const tweet = await this.prisma.tweet.findUnique({
+    const tweet = await this.prisma.reader(userId).tweet.findUnique({
       where: { id },
+      // FEED_INCLUDE's author select; `author: true` sent the author's whole row, password hash included
       include: {
-        author: true,
+        ...FEED_INCLUDE,
         replies: {
-          include: {
-            author: true,
-            _count: { select: { likes: true, replies: true, retweets: true, quotes: true } },
-            likes: userId ? {
-               where: { userId },
-               select: { userId: true }
-             } : false,
-          },
-          orderBy: { createdAt: 'asc' }
-        },
-        _count: {
-          select: { likes: true, replies: true, retweets: true, quotes: true },
+          include: FEED_INCLUDE,
+          // The order findReplies pages in; one extra row only signals "more"
+          orderBy: [{ createdAt: 'asc' }, { id: 'asc' }],
+          take: THREAD_PAGE_SIZE + 1,
         },
-        likes: userId ? {
-          where: { userId },
-          select: { userId: true }
-        } : false,
       },
     });
 
     if (!tweet) return null;
 
+    const hasMore = tweet.replies.length > THREAD_PAGE_SIZE;
+    const replies = hasMore ? tweet.replies.slice(0, THREAD_PAGE_SIZE) : tweet.replies;
+    const states = await this.viewerStateService.getTweetStates(userId, [tweet.id, ...replies.map(child => child.id)]);
+
     return {
-      ...tweet,
-      isLiked: userId ? (tweet.likes as any[]).length > 0 : false,
-      likes: tweet._count.likes,
-      retweets: tweet._count.retweets,
-      replies: tweet._count.replies,
-      views: tweet.views,
-      children: tweet.replies.map(child => ({
-        ...child,
-        isLiked: userId ? (child.likes as any[]).length > 0 : false,
-        likes: child._count.likes,
-        retweets: child._count.retweets,
-        replies: child._count.replies,
-        views: child.views,
-      }))
+      ...this.toFeedItem(tweet, states.get(tweet.id)),
+      children: replies.map(child => this.toFeedItem(child, states.get(child.id))),
+      nextCursor: hasMore ? encodeCursor(replies[replies.length - 1]) : null,
     };
   }
 
+  /**
+   * A tweet with its ancestors (root first) and a depth-limited reply tree, loaded in one
+   * recursive query. Any level with more replies than it shows carries a nextCursor for
+   * findReplies; replies at the depth limit come without `children`.
+   */
+  async findThread(id: string, userId?: string, depth: number = 3, limit: number = 20) {
+    depth = clampParam(depth, 3, THREAD_MAX_DEPTH);
+    limit = clampParam(limit, THREAD_PAGE_SIZE, THREAD_MAX_PAGE_SIZE);
+
+    const rows = await this.queryThread(id, { viewerId: userId, depth, limit, withAncestors: true });
+    const focus = rows.find(row => row.kind === 'focus');
+    if (!focus) {
+      throw new NotFoundException(`Tweet with ID ${id} not found`);
+    }
+
+    const states = await this.viewerStateService.getTweetStates(userId, rows.map(row => row.id));
+    const ancestors = rows
+      .filter(row => row.kind === 'ancestor')
+      .sort((a, b) => b.depth - a.depth)
+      .map(row => this.toFeedItem(toThreadShape(row), states.get(row.id)));
+
+    return {
+      ancestors,
+      tweet: this.toFeedItem(toThreadShape(focus), states.get(focus.id)),
+      ...this.buildReplyTree(rows, id, depth, limit, states),
+    };
+  }
+
+  /** "Load more replies": the next page of replies under `id`, each with its own subtree. */
+  async findReplies(id: string, userId?: string, cursor?: string, depth: number = 1, limit: number = 20) {
+    depth = clampParam(depth, 1, THREAD_MAX_DEPTH);
+    limit = clampParam(limit, THREAD_PAGE_SIZE, THREAD_MAX_PAGE_SIZE);
+
+    const rows = await this.queryThread(id, {
+      viewerId: userId,
+      after: cursor ? decodeCursor(cursor) : undefined,
+      depth,
+      limit,
+      withAncestors: false,
+    });
+    const states = await this.viewerStateService.getTweetStates(userId, rows.map(row => row.id));
+    return this.buildReplyTree(rows, id, depth, limit, states);
+  }
+
+  /**
+   * Walks up parentId for the ancestors and down for the replies. Each level takes its
+   * page through a LATERAL LIMIT on the (parentId, createdAt, id) index, plus one row
+   * that only signals "more"; that row isn't expanded further. A viral tweet's 50k
+   * replies cost a page, not a scan.
+   */
+  private queryThread(id: string, options: { viewerId?: string; after?: Cursor; depth: number; limit: number; withAncestors: boolean }) {
+    const { viewerId, after, depth, limit, withAncestors } = options;
+    // Timestamps are stored as UTC timestamp(3); the ISO string's offset is ignored on the cast
+    const afterClause = after
+      ? Prisma.sql`AND (r."createdAt", r."id") > (${after.createdAt.toISOString()}::timestamp(3), ${after.id})`
+      : Prisma.empty;
+
+    // Postgres skips the ancestors CTE entirely when nothing references it
+    const ancestorNodes = withAncestors
+      ? Prisma.sql`
+          UNION ALL
+          SELECT "id", 'ancestor', "level", NULL FROM ancestors
+          UNION ALL
+          SELECT ${id}, 'focus', 0, NULL
+        `
+      : Prisma.empty;
+
+    return this.prisma.reader(viewerId).$queryRaw<ThreadRow[]>`
+      WITH RECURSIVE ancestors AS (
+        SELECT p."id", p."parentId", 1 AS "level"
+        FROM "Tweet" t JOIN "Tweet" p ON p."id" = t."parentId"
+        WHERE t."id" = ${id}
+        UNION ALL
+        SELECT p."id", p."parentId", a."level" + 1
+        FROM ancestors a JOIN "Tweet" p ON p."id" = a."parentId"
+        WHERE a."level" < ${THREAD_MAX_ANCESTORS}
+      ),
+      replies AS (
+        SELECT c."id", 1 AS "depth", c."rn"
+        FROM (
+          SELECT r."id", (row_number() OVER (ORDER BY r."createdAt", r."id"))::int AS "rn"
+          FROM "Tweet" r
+          WHERE r."parentId" = ${id} ${afterClause}
+          ORDER BY r."createdAt", r."id"
+          LIMIT ${limit + 1}
+        ) c
+        UNION ALL
+        SELECT c."id", p."depth" + 1, c."rn"
+        FROM replies p
+        CROSS JOIN LATERAL (
+          SELECT r."id", (row_number() OVER (ORDER BY r."createdAt", r."id"))::int AS "rn"
+          FROM "Tweet" r
+          WHERE r."parentId" = p."id"
+          ORDER BY r."createdAt", r."id"
+          LIMIT ${THREAD_NESTED_REPLIES + 1}
+        ) c
+        WHERE p."depth" < ${depth}
+          AND p."rn" <= CASE WHEN p."depth" = 1 THEN ${limit} ELSE ${THREAD_NESTED_REPLIES} END
+      ),
+      nodes AS (
+        SELECT "id", 'reply' AS "kind", "depth", "rn" FROM replies
+        ${ancestorNodes}
+      )
+      SELECT n."kind", n."depth", n."rn",
+             t."id", t."content", t."image", t."views", t."createdAt", t."parentId", t."authorId",
+             t."likesCount", t."repliesCount", t."retweetsCount", t."quotesCount",
+             json_build_object('id', u."id", 'name', u."name", 'username', u."username", 'avatar', u."avatar") AS "author"
+      FROM nodes n
+      JOIN "Tweet" t ON t."id" = n."id"
+      JOIN "User" u ON u."id" = t."authorId"
+    `;
+  }
+
+  private buildReplyTree(rows: ThreadRow[], rootId: string, maxDepth: number, limit: number, states: Map<string, TweetViewerState>) {
+    return buildReplyTree(rows, rootId, maxDepth, limit, row => this.toFeedItem(toThreadShape(row), states.get(row.id)));
+  }
+
   async remove(id: string, userId: string) {
-    const tweet = await this.prisma.tweet.findUnique({ where: { id } });
+    const tweet = await this.tweetsById.load(id);
     if (!tweet) {
       throw new NotFoundException(`Tweet with ID ${id} not found`);
     }
@@ -203,13 +462,28 @@ export class TweetsService {
       throw new ForbiddenException('You are not allowed to delete this tweet');
     }
 
-    return this.prisma.tweet.delete({
-      where: { id },
-    });
+    await this.prisma.$transaction([
+      this.prisma.tweet.delete({
+        where: { id },
+      }),
+      this.prisma.user.update({
+        where: { id: tweet.authorId },
+        data: { tweetsCount: { decrement: 1 } },
+      }),
+      // Replies removed by the cascade aren't decremented here; CountersService.reconcile repairs that drift
+      ...(tweet.parentId ? [this.prisma.tweet.update({
+        where: { id: tweet.parentId },
+        data: { repliesCount: { decrement: 1 } },
+      })] : []),
+    ]);
+    this.globalFeedHead.remove(id);
+    this.publishGlobalFeedChange({ op: 'remove', id });
+    this.profileCache.invalidate(tweet.authorId);
+    return tweet;
   }
 
   async update(id: string, userId: string, content: string) {
-    const tweet = await this.prisma.tweet.findUnique({ where: { id } });
+    const tweet = await this.tweetsById.load(id);
     if (!tweet) {
       throw new NotFoundException(`Tweet with ID ${id} not found`);
     }
@@ -218,9 +492,39 @@ export class TweetsService {
       throw new ForbiddenException('You are not allowed to update this tweet');
     }
 
-    return this.prisma.tweet.update({
+    const updated = await this.prisma.tweet.update({
       where: { id },
       data: { content },
     });
+    this.globalFeedHead.update(id, updated);
+    this.publishGlobalFeedChange({ op: 'update', id, changes: { content: updated.content, updatedAt: updated.updatedAt } });
+    return updated;
+  }
+
+  private publishGlobalFeedChange(change: GlobalFeedChange) {
+    if (!this.clusterBus.publish('global-feed', change)) {
+      this.clusterBus.publish('global-feed', { op: 'reload' });
+    }
+  }
+
+  private applyGlobalFeedChange(change: GlobalFeedChange) {
+    switch (change.op) {
+      case 'add':
+        this.globalFeedHead.add({
+          ...change.tweet,
+          createdAt: new Date(change.tweet.createdAt),
+          updatedAt: new Date(change.tweet.updatedAt),
+        });
+        break;
+      case 'update':
+        this.globalFeedHead.update(change.id, { ...change.changes, updatedAt: new Date(change.changes.updatedAt) });
+        break;
+      case 'remove':
+        this.globalFeedHead.remove(change.id);
+        break;
+      case 'reload':
+        this.globalFeedHead.invalidate();
+        break;
+    }
   }
 }
@@ -1,28 +1,27 @@
-import { Controller, Post, UseInterceptors, UploadedFile } from '@nestjs/common';
+import { Controller, Post, UseInterceptors, UploadedFile, BadRequestException } from '@nestjs/common';
 import { FileInterceptor } from '@nestjs/platform-express';
-import { diskStorage } from 'multer';
-import { extname } from 'path';
+import { memoryStorage } from 'multer';
+import { UploadsService } from './uploads.service';
+import { RateLimit } from '../admission/rate-limit.decorator';
+
+const MAX_UPLOAD_BYTES = 10 * 1024 * 1024;
 
 @Controller('uploads')
 export class UploadsController {
+  constructor(private readonly uploadsService: UploadsService) {}
+
+  // Kept in memory: only the re-encoded variants are written, never the raw upload
+  // Re-encoding is CPU-heavy; limited per address since uploads don't require a login
+  @RateLimit('upload', { ip: '30/60' })
   @Post()
   @UseInterceptors(FileInterceptor('file', {
-    storage: diskStorage({
-      destination: './uploads',
-      filename: (req, file, cb) => {
-        const randomName = Array(32).fill(null).map(() => (Math.round(Math.random() * 16)).toString(16)).join('');
-        return cb(null, `${randomName}${extname(file.originalname)}`);
-      },
-    }),
+    storage: memoryStorage(),
+    limits: { fileSize: MAX_UPLOAD_BYTES, files: 1 },
   }))
   uploadFile(@UploadedFile() file: Express.Multer.File) {
     if (!file) {
-        throw new Error('File upload failed');
+      throw new BadRequestException('File upload failed');
     }
-    // Return the URL to access the file
-    // Assuming the server runs on port 3001
-    return { url: `http://localhost:3001/uploads/${file.filename}` };
+    return this.uploadsService.processImage(file.buffer);
   }
-
-
 }
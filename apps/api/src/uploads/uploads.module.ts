@@ -1,13 +1,9 @@
 import { Module } from '@nestjs/common';
 import { UploadsController } from './uploads.controller';
-import { MulterModule } from '@nestjs/platform-express';
+import { UploadsService } from './uploads.service';
 
 @Module({
-  imports: [
-    MulterModule.register({
-      dest: './uploads',
-    }),
-  ],
   controllers: [UploadsController],
+  providers: [UploadsService],
 })
 export class UploadsModule {}
@@ -0,0 +1,88 @@
+import { BadRequestException, Injectable } from '@nestjs/common';
+import { randomBytes } from 'crypto';
+import { join } from 'path';
+import sharp from 'sharp';
+
+export const UPLOAD_DIR = join(process.cwd(), 'uploads');
+const PUBLIC_BASE_URL = 'http://localhost:3001/uploads';
+
+const ACCEPTED_FORMATS = new Set(['jpeg', 'png', 'webp', 'gif', 'avif']);
+// Rejects decompression bombs before libvips allocates the full frame
+const MAX_INPUT_PIXELS = 50_000_000;
+// Images decoded at once; each one already uses several libvips threads
+const UPLOAD_PROCESSING_CONCURRENCY = parseInt(process.env.UPLOAD_PROCESSING_CONCURRENCY ?? '2');
+
+export const IMAGE_VARIANTS = {
+  avatar: { width: 400, height: 400, fit: 'cover' },
+  card: { width: 1200, height: 1200, fit: 'inside' },
+  full: { width: 2048, height: 2048, fit: 'inside' },
+} as const;
+
+export type ImageVariant = keyof typeof IMAGE_VARIANTS;
+
+@Injectable()
+export class UploadsService {
+  private active = 0;
+  private waiting: (() => void)[] = [];
+
+  /**
+   * Validates an uploaded image and writes WebP variants named `<id>-<variant>.webp`.
+   * Decoding and encoding run on libvips threads, so the event loop only waits on them.
+   */
+  async processImage(buffer: Buffer) {
+    return this.withSlot(async () => {
+      const image = sharp(buffer, { limitInputPixels: MAX_INPUT_PIXELS, failOn: 'error' });
+
+      let metadata: sharp.Metadata;
+      try {
+        metadata = await image.metadata();
+      } catch (error) {
+        throw new BadRequestException('File is not a readable image');
+      }
+      if (!metadata.format || !ACCEPTED_FORMATS.has(metadata.format)) {
+        throw new BadRequestException('Unsupported image format');
+      }
+      if ((metadata.width ?? 0) * (metadata.height ?? 0) > MAX_INPUT_PIXELS) {
+        throw new BadRequestException('Image dimensions are too large');
+      }
+
+      const id = randomBytes(16).toString('hex');
+      // rotate() applies EXIF orientation; re-encoding also drops EXIF (GPS etc.)
+      const oriented = image.rotate();
+
+      const entries = await Promise.all(
+        (Object.keys(IMAGE_VARIANTS) as ImageVariant[]).map(async variant => {
+          const { width, height, fit } = IMAGE_VARIANTS[variant];
+          const filename = `${id}-${variant}.webp`;
+          await oriented
+            .clone()
+            .resize({ width, height, fit, withoutEnlargement: true })
+            .webp({ quality: 80 })
+            .toFile(join(UPLOAD_DIR, filename));
+          return [variant, `${PUBLIC_BASE_URL}/${filename}`] as const;
+        })
+      );
+
+      const variants = Object.fromEntries(entries) as Record<ImageVariant, string>;
+      return { url: variants.full, variants };
+    });
+  }
+
+  // Caps concurrent decodes so a burst of large uploads can't exhaust memory
+  private async withSlot<T>(task: () => Promise<T>): Promise<T> {
+    if (this.active >= UPLOAD_PROCESSING_CONCURRENCY) {
+      // The releasing task hands its slot over directly, so `active` stays accurate
+      await new Promise<void>(resolve => this.waiting.push(resolve));
+    } else {
+      this.active++;
+    }
+
+    try {
+      return await task();
+    } finally {
+      const next = this.waiting.shift();
+      if (next) next();
+      else this.active--;
+    }
+  }
+}
@@ -0,0 +1,56 @@
+import { User } from '@repo/database';
+import { ClusterBusService } from '../cluster-bus/cluster-bus.service';
+import { ProfileCacheService } from './profile-cache.service';
+
+const user = { id: 'u1', username: 'Bob' } as User;
+
+function fakeBus() {
+  const handlers: Record<string, (payload: any) => void> = {};
+  const bus = {
+    subscribe: (topic: string, handler: (payload: any) => void) => (handlers[topic] = handler),
+    onReset: jest.fn(),
+    publish: jest.fn(),
+  };
+  return { bus: bus as unknown as ClusterBusService, handlers, publish: bus.publish };
+}
+
+describe('ProfileCacheService', () => {
+  it('should look up profiles case-insensitively and drop them on invalidate', () => {
+    const cache = new ProfileCacheService(fakeBus().bus);
+    cache.set(user, cache.currentVersion);
+
+    expect(cache.get('bob')).toBe(user);
+    cache.invalidate('u1');
+    expect(cache.get('BOB')).toBeUndefined();
+  });
+
+  it('should not cache a row loaded before an invalidation', () => {
+    const cache = new ProfileCacheService(fakeBus().bus);
+    const version = cache.currentVersion;
+    cache.invalidate('u1');
+    cache.set(user, version);
+
+    expect(cache.get('bob')).toBeUndefined();
+  });
+
+  it('should still cache a row when only other users were invalidated meanwhile', () => {
+    const cache = new ProfileCacheService(fakeBus().bus);
+    const version = cache.currentVersion;
+    cache.invalidate('u2', 'u3');
+    cache.set(user, version);
+
+    expect(cache.get('bob')).toBe(user);
+  });
+
+  it('should tell other processes about invalidations and apply theirs', () => {
+    const { bus, handlers, publish } = fakeBus();
+    const cache = new ProfileCacheService(bus);
+
+    cache.invalidate('u2');
+    expect(publish).toHaveBeenCalledWith('profiles', { userIds: ['u2'] });
+
+    cache.set(user, cache.currentVersion);
+    handlers.profiles({ userIds: ['u1'] });
+    expect(cache.get('bob')).toBeUndefined();
+  });
+});
@@ -0,0 +1,74 @@
+import { Injectable } from '@nestjs/common';
+import { User } from '@repo/database';
+import { LruCache } from '../common/lru-cache';
+import { ClusterBusService } from '../cluster-bus/cluster-bus.service';
+
+const PROFILE_CACHE_SIZE = parseInt(process.env.PROFILE_CACHE_SIZE ?? '10000');
+const PROFILE_CACHE_TTL_MS = parseInt(process.env.PROFILE_CACHE_TTL_MS ?? '30000');
+
+/**
+ * Profile rows by normalized username, so hot profiles are served without a query.
+ * Writes that change a profile or its counters invalidate by user id, here and, over the
+ * cluster bus, in every other API process; the TTL bounds staleness from writes that
+ * bypass both (counter reconciliation, manual fixes).
+ */
+@Injectable()
+export class ProfileCacheService {
+  private readonly profiles = new LruCache<string, User>(PROFILE_CACHE_SIZE, PROFILE_CACHE_TTL_MS);
+  // userId -> cache key, for writers that only know the id
+  private readonly keysById = new LruCache<string, string>(PROFILE_CACHE_SIZE, PROFILE_CACHE_TTL_MS);
+  // Ticks on every invalidation. A read notes the tick it started at and mustn't cache
+  // what it loaded if that user was invalidated since, or the whole cache was cleared.
+  private clock = 0;
+  private readonly invalidatedAt = new Map<string, number>();
+  // Reads that started before this tick are never cached
+  private floor = 0;
+
+  constructor(private clusterBus: ClusterBusService) {
+    clusterBus.subscribe('profiles', ({ userIds }: { userIds: string[] }) => this.evict(userIds));
+    clusterBus.onReset(() => this.clear());
+  }
+
+  get currentVersion() {
+    return this.clock;
+  }
+
+  get(username: string) {
+    return this.profiles.get(username.toLowerCase());
+  }
+
+  set(user: User, loadedAtVersion: number) {
+    if (loadedAtVersion < this.floor || (this.invalidatedAt.get(user.id) ?? 0) > loadedAtVersion) return;
+
+    const key = user.username.toLowerCase();
+    this.profiles.set(key, user);
+    this.keysById.set(user.id, key);
+  }
+
+  invalidate(...userIds: string[]) {
+    this.evict(userIds);
+    this.clusterBus.publish('profiles', { userIds });
+  }
+
+  private evict(userIds: string[]) {
+    this.clock++;
+    // Only reads in flight need the ticks; past the cap, forget them and refuse those reads
+    if (this.invalidatedAt.size + userIds.length > PROFILE_CACHE_SIZE) {
+      this.invalidatedAt.clear();
+      this.floor = this.clock;
+    }
+    for (const userId of userIds) {
+      this.invalidatedAt.set(userId, this.clock);
+      const key = this.keysById.get(userId);
+      if (key !== undefined) this.profiles.delete(key);
+      this.keysById.delete(userId);
+    }
+  }
+
+  private clear() {
+    this.floor = ++this.clock;
+    this.invalidatedAt.clear();
+    this.profiles.clear();
+    this.keysById.clear();
+  }
+}
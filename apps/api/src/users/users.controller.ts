@@ -1,38 +1,38 @@
-import { Controller, Get, Body, Patch, Param, UseGuards, Request, NotFoundException, Post, Delete, Headers } from '@nestjs/common';
+import { Controller, Get, Body, Patch, Param, UseGuards, Request, NotFoundException, BadRequestException, Post, Delete, Query, Header } from '@nestjs/common';
 import { UsersService } from './users.service';
 import { AuthGuard } from '@nestjs/passport';
-import { JwtService } from '@nestjs/jwt';
+import { OptionalJwtGuard } from '../auth/optional-jwt.guard';
+import { parseFields, selectFields } from '../common/fields';
+import { RateLimit } from '../admission/rate-limit.decorator';
 
 @Controller('users')
 export class UsersController {
-  constructor(
-    private readonly usersService: UsersService,
-    private readonly jwtService: JwtService
-  ) {}
+  constructor(private readonly usersService: UsersService) {}
 
-  @Get(':username')
-  async getUserProfile(@Param('username') username: string, @Headers('authorization') authHeader?: string) {
-    let userId: string | undefined;
-    if (authHeader) {
-      try {
-        const token = authHeader.split(' ')[1];
-        const decoded: any = this.jwtService.decode(token);
-        if (decoded?.sub) {
-          userId = decoded.sub;
-        } else if (decoded?.userId) {
-          userId = decoded.userId;
-        }
-      } catch (e) {
-        // ignore
-      }
+  // Bulk profiles: ?ids=a,b or ?usernames=alice,bob (up to 100), in request order
+  @UseGuards(OptionalJwtGuard)
+  @Get()
+  async getUsers(@Request() req: any, @Query('ids') ids?: string, @Query('usernames') usernames?: string, @Query('fields') fields?: string) {
+    if (ids === undefined && usernames === undefined) {
+      throw new BadRequestException('Pass ids or usernames');
     }
+    const by = ids !== undefined ? 'id' : 'username';
+    const keys = (ids ?? usernames)!.split(',').filter(Boolean);
+    const users = await this.usersService.findMany(by, keys, req.user?.userId);
+    return selectFields(users.map(({ password, ...user }) => user), parseFields(fields));
+  }
 
-    const user = await this.usersService.findByUsername(username, userId);
+  @UseGuards(OptionalJwtGuard)
+  @Get(':username')
+  @Header('Cache-Control', 'private, no-cache')
+  @Header('Vary', 'Authorization')
+  async getUserProfile(@Param('username') username: string, @Request() req: any, @Query('fields') fields?: string) {
+    const user = await this.usersService.findByUsername(username, req.user?.userId);
     if (!user) {
       throw new NotFoundException(`User @${username} not found`);
     }
     const { password, ...result } = user;
-    return result;
+    return selectFields(result, parseFields(fields));
   }
 
   @UseGuards(AuthGuard('jwt'))
@@ -42,12 +42,14 @@ export class UsersController {
   }
 
   @UseGuards(AuthGuard('jwt'))
+  @RateLimit('follow', { user: '60/60', ip: '300/60' })
   @Post(':id/follow')
   async followUser(@Param('id') targetId: string, @Request() req: any) {
     return this.usersService.follow(req.user.userId, targetId);
   }
 
   @UseGuards(AuthGuard('jwt'))
+  @RateLimit('follow', { user: '60/60', ip: '300/60' })
   @Delete(':id/follow')
   async unfollowUser(@Param('id') targetId: string, @Request() req: any) {
     return this.usersService.unfollow(req.user.userId, targetId);
@@ -3,14 +3,19 @@ import { UsersService } from './users.service';
 
 import { UsersController } from './users.controller';
 
-import { JwtModule } from '@nestjs/jwt';
+import { AuthTokenModule } from '../auth/auth-token.module';
+import { PasswordsModule } from '../passwords/passwords.module';
+import { TimelineModule } from '../timeline/timeline.module';
+import { ViewerStateModule } from '../viewer-state/viewer-state.module';
+import { ProfileCacheModule } from './profile-cache.module';
 
 @Module({
   imports: [
-    JwtModule.register({
-      secret: 'secretKey',
-      signOptions: { expiresIn: '60m' },
-    }),
+    AuthTokenModule,
+    PasswordsModule,
+    TimelineModule,
+    ViewerStateModule,
+    ProfileCacheModule,
   ],
   controllers: [UsersController],
   providers: [UsersService],
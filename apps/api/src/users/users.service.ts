@@ -1,15 +1,51 @@
 import { Injectable } from '@nestjs/common';
 import { PrismaService } from '../prisma/prisma.service';
 import { Prisma, User } from '@repo/database';
-import * as bcrypt from 'bcrypt';
+import { TimelineService } from '../timeline/timeline.service';
+import { ViewerStateService } from '../viewer-state/viewer-state.service';
+import { PasswordsService } from '../passwords/passwords.service';
+import { ProfileCacheService } from './profile-cache.service';
+import { BatchLoader } from '../common/batch-loader';
+
+// Upper bound on GET /users?ids= and ?usernames=
+export const MAX_BULK_USERS = 100;
+
+// Profile pages still read followers/following/tweets from `_count`
+function withCountShape(user: User) {
+  return {
+    ...user,
+    _count: {
+      followers: user.followersCount,
+      following: user.followingCount,
+      tweets: user.tweetsCount,
+    },
+  };
+}
 
 @Injectable()
 export class UsersService {
-  constructor(private prisma: PrismaService) {}
+  // Lookups issued in the same tick share one IN query per key type
+  private readonly usersById = new BatchLoader<string, User>(async ids => {
+    const users = await this.prisma.reader(...ids).user.findMany({ where: { id: { in: ids } } });
+    return new Map(users.map(user => [user.id, user]));
+  });
+  // Keyed by lowercase username; citext makes the IN case-insensitive
+  private readonly usersByUsername = new BatchLoader<string, User>(async usernames => {
+    const users = await this.prisma.reader().user.findMany({ where: { username: { in: usernames } } });
+    return new Map(users.map(user => [user.username.toLowerCase(), user]));
+  });
+
+  constructor(
+    private prisma: PrismaService,
+    private timelineService: TimelineService,
+    private viewerStateService: ViewerStateService,
+    private passwordsService: PasswordsService,
+    private profileCache: ProfileCacheService
+  ) {}
 
   async create(data: Prisma.UserCreateInput): Promise<User> {
     console.log('[UsersService] Creating user in DB:', data.email);
-    const hashedPassword = await bcrypt.hash(data.password, 10);
+    const hashedPassword = await this.passwordsService.hash(data.password);
     const user = await this.prisma.user.create({
       data: {
         ...data,
@@ -30,63 +66,60 @@ export class UsersService {
   }
 
   async findById(id: string): Promise<User | null> {
-    return this.prisma.user.findUnique({
-      where: { id },
-      include: {
-        _count: {
-          select: {
-            followers: true,
-            following: true,
-            tweets: true,
-          }
-        }
-      }
-    });
+    const user = await this.usersById.load(id);
+    return user ? withCountShape(user) : null;
   }
 
-  async findByUsername(username: string, currentUserId?: string): Promise<User & { isFollowing?: boolean } | null> {
-    const user = await this.prisma.user.findFirst({
-      where: { 
-        username: {
-          equals: username,
-          mode: 'insensitive',
-        }
-      },
-      include: {
-        _count: {
-          select: {
-            followers: true,
-            following: true,
-            tweets: true,
-          }
-        }
-      }
-    });
+  /** Bulk profiles by id or username, in the caller's order; unknown keys are left out. */
+  async findMany(by: 'id' | 'username', keys: string[], currentUserId?: string) {
+    keys = keys.slice(0, MAX_BULK_USERS);
+    let users: User[];
+    if (by === 'id') {
+      const loaded = await this.usersById.loadMany(keys);
+      users = [...loaded.values()];
+    } else {
+      users = await Promise.all(keys.map(username => this.loadByUsername(username)))
+        .then(rows => rows.filter((user): user is User => !!user));
+    }
 
+    const following = await this.viewerStateService.getFollowingStates(currentUserId, users.map(user => user.id));
+    return users.map(user => ({ ...withCountShape(user), isFollowing: following.has(user.id) }));
+  }
+
+  async findByUsername(username: string, currentUserId?: string): Promise<User & { isFollowing?: boolean } | null> {
+    const user = await this.loadByUsername(username);
     if (!user) return null;
 
-    let isFollowing = false;
-    if (currentUserId) {
-      const follow = await this.prisma.follow.findUnique({
-        where: {
-          followerId_followingId: {
-            followerId: currentUserId,
-            followingId: user.id,
-          },
-        },
-      });
-      isFollowing = !!follow;
-    }
+    const following = await this.viewerStateService.getFollowingStates(currentUserId, [user.id]);
+    const isFollowing = following.has(user.id);
 
-    return { ...user, isFollowing };
+    return { ...withCountShape(user), isFollowing };
+  }
+
+  private async loadByUsername(username: string) {
+    const cached = this.profileCache.get(username);
+    if (cached) return cached;
+
+    const version = this.profileCache.currentVersion;
+    // username is citext, so the lookup is case-insensitive and served by the unique index
+    let user = await this.usersByUsername.load(username.toLowerCase());
+    // The replica read can't know whose profile it is in advance; re-read just-written ones from the primary
+    if (user && this.prisma.wroteRecently(user.id)) {
+      user = (await this.prisma.user.findUnique({ where: { id: user.id } })) ?? undefined;
+    }
+    if (user) this.profileCache.set(user, version);
+    return user;
   }
 
   async update(id: string, data: Prisma.UserUpdateInput): Promise<User> {
     try {
-      return await this.prisma.user.update({
+      const user = await this.prisma.user.update({
         where: { id },
         data,
       });
+      this.prisma.markWritten(id);
+      this.profileCache.invalidate(id);
+      return user;
     } catch (error) {
       console.error("Error updating user profile:", error);
       throw error;
@@ -97,12 +130,25 @@ export class UsersService {
     if (userId === targetId) throw new Error("Cannot follow yourself");
     
     // Create follow
-    await this.prisma.follow.create({
-      data: {
-        followerId: userId,
-        followingId: targetId,
-      },
-    });
+    await this.prisma.$transaction([
+      this.prisma.follow.create({
+        data: {
+          followerId: userId,
+          followingId: targetId,
+        },
+      }),
+      this.prisma.user.update({
+        where: { id: userId },
+        data: { followingCount: { increment: 1 } },
+      }),
+      this.prisma.user.update({
+        where: { id: targetId },
+        data: { followersCount: { increment: 1 } },
+      }),
+    ]);
+    this.prisma.markWritten(userId, targetId);
+    this.profileCache.invalidate(userId, targetId);
+    await this.timelineService.onFollow(userId, targetId);
 
     // Create notification
     // Need to avoid circular dependency if NotificationsService depends on UsersService?
@@ -114,14 +160,27 @@ export class UsersService {
   }
 
   async unfollow(userId: string, targetId: string) {
-    await this.prisma.follow.delete({
-      where: {
-        followerId_followingId: {
-          followerId: userId,
-          followingId: targetId,
+    await this.prisma.$transaction([
+      this.prisma.follow.delete({
+        where: {
+          followerId_followingId: {
+            followerId: userId,
+            followingId: targetId,
+          },
         },
-      },
-    });
+      }),
+      this.prisma.user.update({
+        where: { id: userId },
+        data: { followingCount: { decrement: 1 } },
+      }),
+      this.prisma.user.update({
+        where: { id: targetId },
+        data: { followersCount: { decrement: 1 } },
+      }),
+    ]);
+    this.prisma.markWritten(userId, targetId);
+    this.profileCache.invalidate(userId, targetId);
+    await this.timelineService.onUnfollow(userId, targetId);
     return { success: true };
   }
 }
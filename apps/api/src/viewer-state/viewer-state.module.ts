@@ -0,0 +1,8 @@
+import { Module } from '@nestjs/common';
+import { ViewerStateService } from './viewer-state.service';
+
+@Module({
+  providers: [ViewerStateService],
+  exports: [ViewerStateService],
+})
+export class ViewerStateModule {}
@@ -0,0 +1,129 @@
+import { Injectable } from '@nestjs/common';
+import { PrismaService } from '../prisma/prisma.service';
+import { LruCache } from '../common/lru-cache';
+import { BatchLoader } from '../common/batch-loader';
+import { ClusterBusService } from '../cluster-bus/cluster-bus.service';
+
+// Users whose per-tweet like/bookmark state is kept in memory; 0 disables the cache
+const VIEWER_STATE_CACHE_USERS = parseInt(process.env.VIEWER_STATE_CACHE_USERS ?? '0');
+const VIEWER_STATE_CACHE_TWEETS_PER_USER = 500;
+const VIEWER_STATE_CACHE_TTL_MS = 60 * 1000;
+
+export interface TweetViewerState {
+  isLiked: boolean;
+  isBookmarked: boolean;
+}
+
+const ANONYMOUS_STATE: TweetViewerState = { isLiked: false, isBookmarked: false };
+
+/**
+ * Resolves per-viewer flags for a whole page of tweets or users with one set-based
+ * query instead of a nested include per row.
+ */
+@Injectable()
+export class ViewerStateService {
+  private readonly recentStates = new LruCache<string, LruCache<string, TweetViewerState>>(
+    VIEWER_STATE_CACHE_USERS,
+    VIEWER_STATE_CACHE_TTL_MS
+  );
+
+  // Keyed "viewerId:tweetId"; concurrent page loads, from one request or several, share a query
+  private readonly stateLoader = new BatchLoader<string, TweetViewerState>(keys => this.loadStates(keys));
+
+  constructor(
+    private prisma: PrismaService,
+    private clusterBus: ClusterBusService
+  ) {
+    // Other processes drop the viewer's whole cache rather than patching a state they may not hold
+    clusterBus.subscribe('viewer-state', ({ viewerId }: { viewerId: string }) => this.recentStates.delete(viewerId));
+    clusterBus.onReset(() => this.recentStates.clear());
+  }
+
+  async getTweetStates(viewerId: string | undefined, tweetIds: string[]): Promise<Map<string, TweetViewerState>> {
+    const states = new Map<string, TweetViewerState>();
+    if (!viewerId) {
+      tweetIds.forEach(id => states.set(id, ANONYMOUS_STATE));
+      return states;
+    }
+
+    const cached = this.recentStates.get(viewerId);
+    const missing: string[] = [];
+    for (const id of new Set(tweetIds)) {
+      const state = cached?.get(id);
+      if (state) states.set(id, state);
+      else missing.push(id);
+    }
+    if (missing.length === 0) return states;
+
+    const loaded = await this.stateLoader.loadMany(missing.map(id => `${viewerId}:${id}`));
+    for (const id of missing) {
+      states.set(id, loaded.get(`${viewerId}:${id}`) ?? { isLiked: false, isBookmarked: false });
+    }
+
+    const userCache = this.userCache(viewerId);
+    if (userCache) {
+      missing.forEach(id => userCache.set(id, states.get(id)!));
+    }
+
+    return states;
+  }
+
+  async getFollowingStates(viewerId: string | undefined, userIds: string[]): Promise<Set<string>> {
+    if (!viewerId || userIds.length === 0) return new Set();
+
+    const follows = await this.prisma.reader(viewerId).follow.findMany({
+      where: { followerId: viewerId, followingId: { in: userIds } },
+      select: { followingId: true },
+    });
+    return new Set(follows.map(follow => follow.followingId));
+  }
+
+  /** Write-through from the like path so cached pages reflect the viewer's own action. */
+  recordLike(viewerId: string, tweetId: string, liked: boolean) {
+    const userCache = this.recentStates.get(viewerId);
+    const state = userCache?.get(tweetId);
+    if (userCache && state) {
+      userCache.set(tweetId, { ...state, isLiked: liked });
+    }
+    if (VIEWER_STATE_CACHE_USERS > 0) this.clusterBus.publish('viewer-state', { viewerId });
+  }
+
+  private async loadStates(keys: string[]) {
+    const viewerIds: string[] = [];
+    const tweetIds: string[] = [];
+    for (const key of keys) {
+      const [viewerId, tweetId] = key.split(':');
+      viewerIds.push(viewerId);
+      tweetIds.push(tweetId);
+    }
+
+    // The (viewer, tweet) pairs join against the unique (userId, tweetId) indexes
+    const rows = await this.prisma.reader(...viewerIds).$queryRaw<{ userId: string; tweetId: string; kind: 'like' | 'bookmark' }[]>`
+      WITH pairs AS (
+        SELECT * FROM unnest(${viewerIds}::text[], ${tweetIds}::text[]) AS p("userId", "tweetId")
+      )
+      SELECT l."userId", l."tweetId", 'like' AS "kind" FROM "Like" l JOIN pairs USING ("userId", "tweetId")
+      UNION ALL
+      SELECT b."userId", b."tweetId", 'bookmark' AS "kind" FROM "Bookmark" b JOIN pairs USING ("userId", "tweetId")
+    `;
+
+    const states = new Map<string, TweetViewerState>(keys.map(key => [key, { isLiked: false, isBookmarked: false }]));
+    for (const row of rows) {
+      const state = states.get(`${row.userId}:${row.tweetId}`)!;
+      if (row.kind === 'like') state.isLiked = true;
+      else state.isBookmarked = true;
+    }
+    return states;
+  }
+
+  private userCache(viewerId: string) {
+    if (VIEWER_STATE_CACHE_USERS <= 0) return null;
+
+    let userCache = this.recentStates.get(viewerId);
+    if (!userCache) {
+      userCache = new LruCache(VIEWER_STATE_CACHE_TWEETS_PER_USER, VIEWER_STATE_CACHE_TTL_MS);
+      this.recentStates.set(viewerId, userCache);
+    }
+    return userCache;
+  }
+}
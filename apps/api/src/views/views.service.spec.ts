@@ -0,0 +1,53 @@
+import { PrismaService } from '../prisma/prisma.service';
+import { ViewsService } from './views.service';
+
+function fakePrisma() {
+  const executeRaw = jest.fn().mockResolvedValue(0);
+  return { prisma: { $executeRaw: executeRaw } as unknown as PrismaService, executeRaw };
+}
+
+// (id, count) pairs of one UPDATE, from the values bound to its VALUES list
+function increments(call: unknown[]) {
+  const values = (call[1] as { values: unknown[] }).values;
+  const pairs: [unknown, unknown][] = [];
+  for (let i = 0; i < values.length; i += 2) pairs.push([values[i], values[i + 1]]);
+  return pairs;
+}
+
+describe('ViewsService', () => {
+  it('should count a viewer once per tweet and sum viewers per tweet', async () => {
+    const { prisma, executeRaw } = fakePrisma();
+    const views = new ViewsService(prisma);
+
+    views.record('v1', ['t1', 't1']);
+    views.record('v1', ['t1']);
+    views.record('v2', ['t1', 't2']);
+    await views.flush();
+
+    expect(executeRaw).toHaveBeenCalledTimes(1);
+    expect(increments(executeRaw.mock.calls[0])).toEqual([['t1', 2], ['t2', 1]]);
+  });
+
+  it('should write nothing when no views are pending', async () => {
+    const { prisma, executeRaw } = fakePrisma();
+    await new ViewsService(prisma).flush();
+
+    expect(executeRaw).not.toHaveBeenCalled();
+  });
+
+  it('should queue one early flush for a full batch and split the write into batches', async () => {
+    const { prisma, executeRaw } = fakePrisma();
+    const views = new ViewsService(prisma);
+    const flush = jest.spyOn(views, 'flush');
+
+    views.record('v1', Array.from({ length: 1000 }, (_, i) => `t${i}`));
+    views.record('v1', ['t1000']);
+    views.record('v2', ['t1001']);
+    expect(flush).toHaveBeenCalledTimes(1);
+
+    await views.flush();
+    expect(executeRaw).toHaveBeenCalledTimes(2);
+    expect(increments(executeRaw.mock.calls[0])).toHaveLength(1000);
+    expect(increments(executeRaw.mock.calls[1])).toEqual([['t1000', 1], ['t1001', 1]]);
+  });
+});
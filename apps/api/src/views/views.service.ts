@@ -0,0 +1,84 @@
+import { Injectable, OnModuleInit, OnModuleDestroy } from '@nestjs/common';
+import { PrismaService } from '../prisma/prisma.service';
+import { Prisma } from '@repo/database';
+import { LruCache } from '../common/lru-cache';
+
+// Increments are held this long, so every tweet gets at most one UPDATE per interval however often it's seen
+const VIEW_FLUSH_INTERVAL_MS = parseInt(process.env.VIEW_FLUSH_INTERVAL_MS ?? '5000');
+// A viewer seeing the same tweet again within the window isn't counted again
+const VIEW_DEDUPE_WINDOW_MS = parseInt(process.env.VIEW_DEDUPE_WINDOW_MS ?? String(30 * 60 * 1000));
+const VIEW_DEDUPE_MAX_ENTRIES = parseInt(process.env.VIEW_DEDUPE_MAX_ENTRIES ?? '200000');
+// Distinct tweets pending before an early flush; also the size of one UPDATE
+const VIEW_MAX_BATCH = 1000;
+
+/**
+ * Counts tweet impressions for Tweet.views. Impressions are deduped per viewer and
+ * aggregated per tweet in memory, then written as one set-based UPDATE per batch.
+ * Counts pending at a crash are lost; views are approximate by design.
+ */
+@Injectable()
+export class ViewsService implements OnModuleInit, OnModuleDestroy {
+  private pending = new Map<string, number>();
+  private readonly recentViews = new LruCache<string, true>(VIEW_DEDUPE_MAX_ENTRIES, VIEW_DEDUPE_WINDOW_MS);
+  private flushTimer?: NodeJS.Timeout;
+  private flushing: Promise<void> = Promise.resolve();
+  // A size-triggered flush is queued and hasn't taken the pending map yet
+  private flushScheduled = false;
+
+  constructor(private prisma: PrismaService) {}
+
+  onModuleInit() {
+    this.flushTimer = setInterval(() => this.flush(), VIEW_FLUSH_INTERVAL_MS);
+    this.flushTimer.unref();
+  }
+
+  async onModuleDestroy() {
+    clearInterval(this.flushTimer);
+    await this.flush();
+  }
+
+  /**
+   * Records that `viewerKey` (a user id, or an anonymous key such as the client IP)
+   * was shown these tweets. Never touches the database.
+   */
+  record(viewerKey: string, tweetIds: string[]) {
+    for (const tweetId of new Set(tweetIds)) {
+      const key = `${viewerKey}:${tweetId}`;
+      if (this.recentViews.get(key)) continue;
+      this.recentViews.set(key, true);
+      this.pending.set(tweetId, (this.pending.get(tweetId) ?? 0) + 1);
+    }
+
+    if (this.pending.size >= VIEW_MAX_BATCH && !this.flushScheduled) {
+      this.flushScheduled = true;
+      this.flush();
+    }
+  }
+
+  flush(): Promise<void> {
+    // Chained so a size-triggered flush never overlaps the interval one
+    this.flushing = this.flushing.then(() => this.drain());
+    return this.flushing;
+  }
+
+  private async drain() {
+    this.flushScheduled = false;
+    if (this.pending.size === 0) return;
+    const increments = [...this.pending];
+    this.pending = new Map();
+
+    for (let i = 0; i < increments.length; i += VIEW_MAX_BATCH) {
+      const batch = increments.slice(i, i + VIEW_MAX_BATCH);
+      try {
+        // Rows for deleted tweets simply don't join
+        await this.prisma.$executeRaw`
+          UPDATE "Tweet" t SET "views" = t."views" + d."count"
+          FROM (VALUES ${Prisma.join(batch.map(([tweetId, count]) => Prisma.sql`(${tweetId}, ${count}::int)`))}) AS d("id", "count")
+          WHERE t."id" = d."id"
+        `;
+      } catch (error) {
+        console.error('[ViewsService] Failed to write view batch:', error);
+      }
+    }
+  }
+}
@@ -37,7 +37,7 @@ export function Feed({ type = 'all' }: FeedProps) {
   const [isLoading, setIsLoading] = useState(true);
   const fileInputRef = useRef<HTMLInputElement>(null);
 
-  const [page, setPage] = useState(1);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [hasMore, setHasMore] = useState(true);
   const [loadingMore, setLoadingMore] = useState(false);
 
@@ -49,7 +49,7 @@ export function Feed({ type = 'all' }: FeedProps) {
     formData.append('file', file);
 
     try {
-      const response = await api.post('/upload', formData, {
+      const response = await api.post('/uploads', formData, {
         headers: {
           'Content-Type': 'multipart/form-data',
         },
@@ -61,25 +61,22 @@ export function Feed({ type = 'all' }: FeedProps) {
     }
   };
 
-  const fetchTweets = async (pageNum: number = 1) => {
-    if (pageNum === 1) setIsLoading(true);
+  const fetchTweets = async (cursor: string | null = null) => {
+    if (!cursor) setIsLoading(true);
     else setLoadingMore(true);
 
     try {
       const endpoint = type === 'following' ? '/tweets?following=true' : '/tweets';
-      // Append pagination params
-      const url = `${endpoint}${endpoint.includes('?') ? '&' : '?'}page=${pageNum}&limit=3`;
+      // Keyset pagination: the server hands back an opaque cursor for the next page
+      const url = `${endpoint}${endpoint.includes('?') ? '&' : '?'}cursor=${encodeURIComponent(cursor ?? '')}&limit=3`;
       
       const response = await api.get(url);
-      const newTweets = response.data;
+      const { tweets: newTweets, nextCursor: newCursor } = response.data;
       
-      if (newTweets.length < 3) {
-        setHasMore(false);
-      } else {
-        setHasMore(true);
-      }
+      setNextCursor(newCursor);
+      setHasMore(!!newCursor);
 
-      if (pageNum === 1) {
+      if (!cursor) {
         setTweets(newTweets);
       } else {
         setTweets(prev => [...prev, ...newTweets]);
@@ -102,17 +99,15 @@ export function Feed({ type = 'all' }: FeedProps) {
   };
 
   useEffect(() => {
-    setPage(1);
+    setNextCursor(null);
     setHasMore(true);
     setTweets([]);
-    fetchTweets(1);
+    fetchTweets();
     fetchUser();
   }, [type]);
 
   const handleLoadMore = () => {
-    const nextPage = page + 1;
-    setPage(nextPage);
-    fetchTweets(nextPage);
+    if (nextCursor) fetchTweets(nextCursor);
   };
 
   const handlePostTweet = async () => {
@@ -125,8 +120,7 @@ export function Feed({ type = 'all' }: FeedProps) {
       setNewTweetContent('');
       setImageUrl(null);
       if (fileInputRef.current) fileInputRef.current.value = '';
-      setPage(1);
-      fetchTweets(1); 
+      fetchTweets(); 
     } catch (error) {
       console.error('Failed to post tweet:', error);
     }
@@ -221,7 +215,7 @@ export function Feed({ type = 'all' }: FeedProps) {
               replies={tweet._count.children} 
               views={tweet.views}
               currentUser={currentUser}
-              onDelete={() => fetchTweets(1)}
+              onDelete={() => fetchTweets()}
               isLiked={tweet.isLiked}
             />
           ))}
@@ -17,9 +17,11 @@ interface NotificationItemProps {
     content: string;
   };
   read: boolean;
+  // Total actors folded into an aggregated notification, including `user`
+  actorCount?: number;
 }
 
-export function NotificationItem({ type, user, tweet, read }: NotificationItemProps) {
+export function NotificationItem({ type, user, tweet, read, actorCount = 1 }: NotificationItemProps) {
   const getIcon = () => {
     switch (type) {
       case 'LIKE':
@@ -64,6 +66,9 @@ export function NotificationItem({ type, user, tweet, read }: NotificationItemPr
            <div className="flex items-center gap-2">
              <div className="h-8 w-8 rounded-full bg-gray-700 bg-cover bg-center" style={{ backgroundImage: user.avatar ? `url(${user.avatar})` : undefined }}></div>
              <span className="font-bold text-white hover:underline">{user.name}</span>
+             {actorCount > 1 && (
+               <span className="text-gray-300">and {actorCount - 1} {actorCount === 2 ? 'other' : 'others'}</span>
+             )}
            </div>
         </Link>
         <div className="text-gray-300">
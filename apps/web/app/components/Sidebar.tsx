@@ -1,6 +1,8 @@
 import React, { useState, useEffect, useRef } from 'react';
 import Link from 'next/link';
 import { Home, Search, Bell, Mail, User, MoreHorizontal, PenTool, Bookmark } from 'lucide-react';
+import api from '../lib/api';
+import { useRealtime } from '../lib/useRealtime';
 
 interface SidebarProps {
   currentUser?: {
@@ -15,6 +17,24 @@ export function Sidebar({ currentUser }: SidebarProps) {
   const [showProfileMenu, setShowProfileMenu] = useState(false);
   const profileButtonRef = useRef<HTMLButtonElement>(null);
   const [menuStyle, setMenuStyle] = useState<{ left: number; bottom: number } | null>(null);
+  const [unreadCount, setUnreadCount] = useState(0);
+
+  const fetchUnreadCount = () => {
+    // Served from a stored counter, so this is a single-row read rather than a notifications scan
+    api.get('/notifications/unread-count')
+      .then(res => setUnreadCount(res.data.count))
+      .catch(error => console.error('Failed to fetch unread count:', error));
+  };
+
+  useEffect(() => {
+    if (!currentUser) return;
+    fetchUnreadCount();
+  }, [currentUser?.id]);
+
+  useRealtime({
+    notification: fetchUnreadCount,
+    reset: fetchUnreadCount,
+  });
 
   const handleLogout = () => {
     localStorage.removeItem('token');
@@ -70,7 +90,7 @@ export function Sidebar({ currentUser }: SidebarProps) {
           <nav className="flex w-full flex-col gap-2">
             <NavItem href="/main" icon={Home} label="Home" active />
             <NavItem href="/explore" icon={Search} label="Explore" />
-            <NavItem href="/notifications" icon={Bell} label="Notifications" />
+            <NavItem href="/notifications" icon={Bell} label="Notifications" badge={unreadCount} />
             <NavItem href="/messages" icon={Mail} label="Messages" />
             <NavItem href="/bookmarks" icon={Bookmark} label="Bookmarks" />
             <NavItem href="/profile" icon={User} label="Profile" />
@@ -122,11 +142,18 @@ export function Sidebar({ currentUser }: SidebarProps) {
   );
 }
 
-function NavItem({ href, icon: Icon, label, active }: { href: string; icon: any; label: string; active?: boolean }) {
+function NavItem({ href, icon: Icon, label, active, badge }: { href: string; icon: any; label: string; active?: boolean; badge?: number }) {
   return (
     <Link href={href} className="flex items-center justify-center xl:justify-start">
       <div className={`flex items-center gap-4 rounded-full p-3 px-4 transition hover:bg-gray-900 ${active ? 'font-bold' : ''}`}>
-        <Icon size={26} className="text-white" strokeWidth={active ? 3 : 2} />
+        <div className="relative">
+          <Icon size={26} className="text-white" strokeWidth={active ? 3 : 2} />
+          {!!badge && (
+            <span className="absolute -right-2 -top-1 min-w-[18px] rounded-full bg-blue-500 px-1 text-center text-xs font-bold text-white">
+              {badge > 99 ? '99+' : badge}
+            </span>
+          )}
+        </div>
         <span className="hidden text-xl text-white xl:block">{label}</span>
       </div>
     </Link>
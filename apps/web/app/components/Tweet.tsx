@@ -1,6 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { MessageCircle, Repeat, Heart, BarChart2, Share, MoreHorizontal, Trash2, Edit2 } from 'lucide-react';
 import api from '../lib/api';
+import { imageVariant } from '../lib/images';
 import Link from 'next/link';
 
 interface TweetProps {
@@ -64,7 +65,8 @@ export function Tweet({
     setLikeCount(prev => liked ? prev - 1 : prev + 1);
 
     try {
-      await api.post(`/tweets/${id}/like`);
+      // Send the target state rather than a toggle so a double click can't flip it back
+      await (prevLiked ? api.delete(`/tweets/${id}/like`) : api.put(`/tweets/${id}/like`));
     } catch (error) {
       console.error('Failed to toggle like:', error);
       setLiked(prevLiked);
@@ -75,6 +77,7 @@ export function Tweet({
   const [replies, setReplies] = useState(initialReplies);
   const [showReplies, setShowReplies] = useState(false);
   const [repliesList, setRepliesList] = useState<any[]>([]);
+  const [repliesCursor, setRepliesCursor] = useState<string | null>(null);
   const [replyContent, setReplyContent] = useState('');
 
   const [isEditing, setIsEditing] = useState(false);
@@ -109,16 +112,20 @@ export function Tweet({
     }
   };
 
+  // One page of direct replies; a cursor appends the next page
+  const loadReplies = async (cursor?: string) => {
+    try {
+      const response = await api.get(`/tweets/${id}/replies`, { params: { cursor } });
+      setRepliesList(prev => (cursor ? [...prev, ...response.data.children] : response.data.children));
+      setRepliesCursor(response.data.nextCursor);
+    } catch (error) {
+      console.error('Failed to load replies:', error);
+    }
+  };
+
   const handleToggleReplies = async () => {
     if (!showReplies && repliesList.length === 0) {
-      try {
-        const response = await api.get(`/tweets/${id}`);
-        if (response.data && response.data.children) {
-          setRepliesList(response.data.children);
-        }
-      } catch (error) {
-        console.error('Failed to load replies:', error);
-      }
+      await loadReplies();
     }
     setShowReplies(!showReplies);
   };
@@ -128,8 +135,7 @@ export function Tweet({
     try {
       await api.post('/tweets', { content: replyContent, parentId: id });
       setReplyContent('');
-      const response = await api.get(`/tweets/${id}`);
-      setRepliesList(response.data.children);
+      await loadReplies();
       setReplies(prev => prev + 1);
     } catch (error) {
       alert('Failed to send reply');
@@ -154,7 +160,7 @@ export function Tweet({
   
   return (
     <Wrapper className={`flex w-full gap-3 border-b border-gray-800 p-4 transition ${!isComment ? 'hover:bg-white/5 cursor-pointer' : ''}`}>
-     <Link href={`/profile/${encodeURIComponent(authorHandle)}`} className="h-10 w-10 min-w-[40px] rounded-full bg-gray-700 bg-cover bg-center" style={{ backgroundImage: authorAvatar ? `url(${authorAvatar})` : undefined }} onClick={(e) => e.stopPropagation()}>
+     <Link href={`/profile/${encodeURIComponent(authorHandle)}`} className="h-10 w-10 min-w-[40px] rounded-full bg-gray-700 bg-cover bg-center" style={{ backgroundImage: authorAvatar ? `url(${imageVariant(authorAvatar, 'avatar')})` : undefined }} onClick={(e) => e.stopPropagation()}>
       </Link>
       <div className="flex flex-1 flex-col">
         <div className="flex items-center justify-between">
@@ -210,7 +216,7 @@ export function Tweet({
 
         {image && !isEditing && (
           <div className="mt-3 overflow-hidden rounded-2xl border border-gray-800">
-            <img src={image} alt="Tweet image" className="w-full object-cover" />
+            <img src={imageVariant(image, 'card')} alt="Tweet image" className="w-full object-cover" loading="lazy" />
           </div>
         )}
 
@@ -268,11 +274,17 @@ export function Tweet({
                    replies={reply._count?.children || 0}
                    isComment={true}
                    currentUser={currentUser}
-                   onDelete={() => {
-                      api.get(`/tweets/${id}`).then(res => setRepliesList(res.data.children));
-                   }}
+                   onDelete={() => loadReplies()}
                  />
                ))}
+               {repliesCursor && (
+                 <button
+                   className="w-full py-3 text-sm text-blue-500 hover:bg-white/5"
+                   onClick={() => loadReplies(repliesCursor)}
+                 >
+                   Show more replies
+                 </button>
+               )}
              </div>
           </div>
         )}
@@ -0,0 +1,11 @@
+export type ImageVariant = 'avatar' | 'card' | 'full';
+
+const VARIANT_SUFFIX = /-(avatar|card|full)\.webp$/;
+
+/**
+ * Points an uploaded image URL at one of its sized variants. URLs from before
+ * the upload pipeline (or external ones) have no variants and are returned as-is.
+ */
+export function imageVariant(url: string, variant: ImageVariant) {
+  return VARIANT_SUFFIX.test(url) ? url.replace(VARIANT_SUFFIX, `-${variant}.webp`) : url;
+}
@@ -0,0 +1,64 @@
+import { useEffect, useRef } from 'react';
+import api from './api';
+
+type RealtimeHandlers = {
+  message?: (data: any) => void;
+  notification?: (data: any) => void;
+  // The server could not replay what was missed; refetch from scratch
+  reset?: () => void;
+};
+
+type Listener = (type: keyof RealtimeHandlers, data: any) => void;
+
+// One stream per tab, shared by every subscriber (sidebar badge, page, ...)
+let source: EventSource | null = null;
+const listeners = new Set<Listener>();
+
+function open(token: string) {
+  const stream = new EventSource(`${api.defaults.baseURL}/realtime/stream?token=${encodeURIComponent(token)}`);
+  const dispatch = (type: keyof RealtimeHandlers) => (event: MessageEvent) => {
+    let data: any = null;
+    try {
+      data = JSON.parse(event.data);
+    } catch (error) {
+      console.error('Failed to parse realtime event', error);
+      return;
+    }
+    listeners.forEach(listener => listener(type, data));
+  };
+
+  stream.addEventListener('message', dispatch('message'));
+  stream.addEventListener('notification', dispatch('notification'));
+  stream.addEventListener('reset', dispatch('reset'));
+  return stream;
+}
+
+/**
+ * Subscribes to the API's server-sent event stream. EventSource reconnects on its
+ * own and sends Last-Event-ID, so short drops are replayed rather than refetched.
+ */
+export function useRealtime(handlers: RealtimeHandlers) {
+  const handlersRef = useRef(handlers);
+  handlersRef.current = handlers;
+
+  useEffect(() => {
+    const token = localStorage.getItem('token');
+    if (!token) return;
+
+    const listener: Listener = (type, data) => {
+      const current = handlersRef.current;
+      if (type === 'reset') current.reset?.();
+      else current[type]?.(data);
+    };
+    listeners.add(listener);
+    source = source ?? open(token);
+
+    return () => {
+      listeners.delete(listener);
+      if (listeners.size === 0) {
+        source?.close();
+        source = null;
+      }
+    };
+  }, []);
+}
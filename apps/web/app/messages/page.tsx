@@ -4,6 +4,7 @@ import React, { useEffect, useState, useRef } from 'react';
 import { MainLayout } from '../components/MainLayout';
 import { Mail, Search, MoreHorizontal, Send } from 'lucide-react';
 import api from '../lib/api';
+import { useRealtime } from '../lib/useRealtime';
 import Link from 'next/link';
 
 interface Conversation {
@@ -17,10 +18,9 @@ interface Conversation {
       avatar: string | null;
     }
   }[];
-  messages: {
-    content: string;
-    createdAt: string;
-  }[];
+  lastMessageContent: string | null;
+  lastMessageAt: string | null;
+  unreadCount: number;
 }
 
 interface Message {
@@ -40,6 +40,7 @@ export default function MessagesPage() {
   const [conversations, setConversations] = useState<Conversation[]>([]);
   const [selectedConversation, setSelectedConversation] = useState<Conversation | null>(null);
   const [messages, setMessages] = useState<Message[]>([]);
+  const [olderCursor, setOlderCursor] = useState<string | null>(null);
   const [newMessage, setNewMessage] = useState('');
   const [currentUser, setCurrentUser] = useState<any>(null);
   const messagesEndRef = useRef<HTMLDivElement>(null);
@@ -55,9 +56,23 @@ export default function MessagesPage() {
     }
   }, [selectedConversation]);
 
+  useRealtime({
+    message: (message: Message & { conversationId: string }) => {
+      if (message.conversationId === selectedConversation?.id) {
+        // Our own sends arrive here too; skip the copy already appended from the POST response
+        setMessages(prev => (prev.some(m => m.id === message.id) ? prev : [...prev, message]));
+      }
+      fetchConversations();
+    },
+    reset: () => {
+      fetchConversations();
+      if (selectedConversation) fetchMessages(selectedConversation.id);
+    },
+  });
+
   useEffect(() => {
     scrollToBottom();
-  }, [messages]);
+  }, [messages.length > 0 ? messages[messages.length - 1].id : null]);
 
   const scrollToBottom = () => {
     messagesEndRef.current?.scrollIntoView({ behavior: "smooth" });
@@ -81,10 +96,13 @@ export default function MessagesPage() {
     }
   };
 
-  const fetchMessages = async (conversationId: string) => {
+  const fetchMessages = async (conversationId: string, before: string | null = null) => {
     try {
-        const res = await api.get(`/conversations/${conversationId}/messages`);
-        setMessages(res.data);
+        const res = await api.get(`/conversations/${conversationId}/messages${before ? `?before=${encodeURIComponent(before)}` : ''}`);
+        // The API pages newest-first; the chat renders oldest at the top
+        const page = [...res.data.messages].reverse();
+        setMessages(prev => (before ? [...page, ...prev] : page));
+        setOlderCursor(res.data.nextCursor);
     } catch (error) {
         console.error('Failed to fetch messages', error);
     }
@@ -98,7 +116,7 @@ export default function MessagesPage() {
         const res = await api.post(`/conversations/${selectedConversation.id}/messages`, {
             content: newMessage
         });
-        setMessages([...messages, res.data]);
+        setMessages(prev => (prev.some(m => m.id === res.data.id) ? prev : [...prev, res.data]));
         setNewMessage('');
         fetchConversations(); // Update list to show latest message snippet
     } catch (error) {
@@ -138,8 +156,8 @@ export default function MessagesPage() {
                                     <span className="font-bold text-white">{otherUser.name}</span>
                                     <span className="text-gray-500">@{otherUser.username}</span>
                                 </div>
-                                <span className="text-sm text-gray-500 truncate">
-                                    {conversation.messages[0]?.content || 'Start a conversation'}
+                                <span className={`text-sm truncate ${conversation.unreadCount > 0 ? 'font-bold text-white' : 'text-gray-500'}`}>
+                                    {conversation.lastMessageContent || 'Start a conversation'}
                                 </span>
                             </div>
                         </div>
@@ -163,6 +181,16 @@ export default function MessagesPage() {
 
                     {/* Messages */}
                     <div className="flex-1 overflow-y-auto p-4">
+                        {olderCursor && (
+                            <div className="mb-4 flex justify-center">
+                                <button
+                                    onClick={() => fetchMessages(selectedConversation.id, olderCursor)}
+                                    className="text-blue-500 hover:bg-blue-500/10 px-4 py-2 rounded-full transition"
+                                >
+                                    Load older messages
+                                </button>
+                            </div>
+                        )}
                         {messages.map((msg) => {
                             const isMe = msg.senderId === currentUser?.id;
                             return (
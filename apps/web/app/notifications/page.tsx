@@ -4,26 +4,44 @@ import React, { useEffect, useState } from 'react';
 import { MainLayout } from '../components/MainLayout';
 import { NotificationItem } from '../components/NotificationItem';
 import api from '../lib/api';
+import { useRealtime } from '../lib/useRealtime';
 
 export default function NotificationsPage() {
   const [notifications, setNotifications] = useState<any[]>([]);
   const [loading, setLoading] = useState(true);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
-  useEffect(() => {
-    const fetchNotifications = async () => {
-      try {
-        const res = await api.get('/notifications');
-        setNotifications(res.data);
-      } catch (error) {
-        console.error('Failed to load notifications', error);
-      } finally {
-        setLoading(false);
+  const fetchNotifications = async (cursor: string | null = null) => {
+    if (cursor) setLoadingMore(true);
+    try {
+      const res = await api.get(`/notifications${cursor ? `?cursor=${encodeURIComponent(cursor)}` : ''}`);
+      setNotifications(prev => (cursor ? [...prev, ...res.data.notifications] : res.data.notifications));
+      setNextCursor(res.data.nextCursor);
+
+      // Mark only what was loaded, so anything arriving meanwhile keeps the badge lit
+      const loaded = res.data.notifications;
+      if (!cursor && loaded.length > 0 && loaded.some((notification: any) => !notification.read)) {
+        api.patch('/notifications/read', { upTo: res.data.headCursor }).catch(error => console.error('Failed to mark notifications read', error));
       }
-    };
+    } catch (error) {
+      console.error('Failed to load notifications', error);
+    } finally {
+      setLoading(false);
+      setLoadingMore(false);
+    }
+  };
 
+  useEffect(() => {
     fetchNotifications();
   }, []);
 
+  // New or re-aggregated items move to the top, so reload the first page rather than splice
+  useRealtime({
+    notification: () => fetchNotifications(),
+    reset: () => fetchNotifications(),
+  });
+
   return (
     <MainLayout>
       <div className="flex flex-col min-h-screen border-r border-gray-800">
@@ -44,9 +62,21 @@ export default function NotificationsPage() {
                 user={notification.issuer}
                 tweet={notification.tweet}
                 read={notification.read}
+                actorCount={notification.actorCount}
               />
             ))
           )}
+          {nextCursor && (
+            <div className="flex justify-center p-6 border-b border-gray-800">
+              <button
+                onClick={() => fetchNotifications(nextCursor)}
+                disabled={loadingMore}
+                className="text-blue-500 hover:bg-blue-500/10 px-4 py-2 rounded-full transition disabled:opacity-50"
+              >
+                {loadingMore ? 'Loading...' : 'Load More'}
+              </button>
+            </div>
+          )}
         </div>
       </div>
     </MainLayout>
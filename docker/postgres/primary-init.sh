@@ -0,0 +1,10 @@
+#!/bin/sh
+# Runs once, when the primary's data directory is first initialized.
+# Lets the postgres-replica service stream WAL from this server.
+set -e
+
+psql -v ON_ERROR_STOP=1 --username "$POSTGRES_USER" --dbname "$POSTGRES_DB" <<-EOSQL
+  CREATE ROLE replicator WITH REPLICATION LOGIN PASSWORD 'replicatorpassword';
+EOSQL
+
+echo "host replication replicator all scram-sha-256" >> "$PGDATA/pg_hba.conf"
@@ -0,0 +1,314 @@
+/**
+ * Deterministic synthetic dataset for benchmarks. Same SCALE + SEED always yields
+ * the same rows (ids, timestamps, graph), so results are comparable across runs.
+ *
+ *   DATABASE_URL=... SCALE=1 SEED=42 pnpm db:generate-dataset -- --truncate
+ *
+ * SCALE=1 is roughly 100k users, 1M tweets, 5M likes and 2M follows; counts grow linearly.
+ * Rows are streamed with COPY, table by table in foreign-key order, then the
+ * denormalized counters are computed in one set-based pass per table. Afterwards run
+ * `pnpm --filter api timeline:rebuild` to materialize following timelines.
+ *
+ * COPY data is piped through psql, which must be on the PATH; set PSQL to run it
+ * elsewhere, e.g. PSQL="docker compose exec -T postgres psql -U postgres -d twitter_clone".
+ *
+ * Passwords are a placeholder hash, so generated accounts can't log in; benchmarks
+ * act as them by id.
+ */
+import { spawn } from 'child_process';
+import { PrismaClient } from '@prisma/client';
+
+const SCALE = parseFloat(process.env.SCALE ?? '1');
+const SEED = parseInt(process.env.SEED ?? '42');
+// Fixed "now" so timestamps don't depend on when the generator ran
+const EPOCH = new Date(process.env.DATASET_EPOCH ?? '2025-01-01T00:00:00Z').getTime();
+const SPAN_MS = 365 * 24 * 60 * 60 * 1000;
+const FANOUT_FOLLOWER_THRESHOLD = parseInt(process.env.TIMELINE_FANOUT_THRESHOLD ?? '10000');
+// Command the COPY streams are piped into; when unset, psql connects with DATABASE_URL
+const PSQL = process.env.PSQL;
+
+const USERS = Math.max(10, Math.round(100_000 * SCALE));
+const TWEETS = Math.round(1_000_000 * SCALE);
+const CONVERSATIONS = Math.round(20_000 * SCALE);
+const MEAN_FOLLOWS_PER_USER = 20;
+const MEAN_LIKES_PER_TWEET = 5;
+const MEAN_MESSAGES_PER_CONVERSATION = 10;
+const REPLY_RATIO = 0.3;
+// Chance a reply answers another reply rather than the thread root, producing deep threads
+const NESTED_REPLY_RATIO = 0.5;
+
+const PLACEHOLDER_PASSWORD = '$2a$10$abcdefghijklmnopqrstuvwxyz123456';
+const WORDS = 'the a to of and in is it you that for on with this my was just so but be have not are at like get all me your what new from time out day people now about today one love good great think know'.split(' ');
+
+// mulberry32: tiny, fast and reproducible; Math.random can't be seeded
+function createRng(seed: number) {
+  let state = seed >>> 0;
+  return () => {
+    state = (state + 0x6d2b79f5) >>> 0;
+    let t = state;
+    t = Math.imul(t ^ (t >>> 15), t | 1);
+    t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+}
+
+// Each phase gets its own stream, so changing one phase never reshuffles another
+const phaseRng = (phase: number) => createRng(SEED * 1_000_003 + phase);
+
+/** Rank in [0, n) where low ranks are far more likely: a power-law popularity curve. */
+function powerLawIndex(rng: () => number, n: number, exponent = 2.5) {
+  return Math.min(n - 1, Math.floor(n * Math.pow(rng(), exponent)));
+}
+
+/** Heavy-tailed count with the given mean (Pareto, alpha 2). */
+function heavyTailCount(rng: () => number, mean: number) {
+  return Math.floor((mean / 2) / Math.sqrt(1 - rng()));
+}
+
+// Spreads popular ranks across the id space so "popular" doesn't mean "oldest"
+const scatter = (rank: number, n: number) => (Math.imul(rank, 2654435761) >>> 0) % n;
+
+const userId = (i: number) => `u${i.toString(36).padStart(8, '0')}`;
+const tweetId = (i: number) => `t${i.toString(36).padStart(9, '0')}`;
+// Tweets are evenly spread over the span in index order, so a parent is always older than its replies
+const tweetTime = (i: number) => EPOCH - SPAN_MS + Math.floor(((i + 0.5) * SPAN_MS) / TWEETS);
+const userTime = (i: number) => EPOCH - 2 * SPAN_MS + Math.floor((i * SPAN_MS) / USERS);
+
+function sentence(rng: () => number, words: number) {
+  return Array.from({ length: words }, () => WORDS[Math.floor(rng() * WORDS.length)]).join(' ');
+}
+
+function escapeCopy(value: unknown) {
+  if (value === null || value === undefined) return '\\N';
+  if (value instanceof Date) return value.toISOString();
+  return String(value).replace(/\\/g, '\\\\').replace(/\t/g, '\\t').replace(/\n/g, '\\n').replace(/\r/g, '\\r');
+}
+
+// psql rejects Prisma's ?schema= parameter
+function psqlConnectionUrl() {
+  const url = new URL(process.env.DATABASE_URL ?? '');
+  url.searchParams.delete('schema');
+  return url.toString();
+}
+
+/** Streams rows into one table with COPY through psql, honouring backpressure. */
+async function copyRows(table: string, columns: string[], rows: Iterable<unknown[]>) {
+  const copy = `COPY "${table}" (${columns.map(column => `"${column}"`).join(', ')}) FROM STDIN`;
+  const [command, ...args] = PSQL ? PSQL.split(' ') : ['psql', psqlConnectionUrl()];
+  const psql = spawn(command!, [...args, '-v', 'ON_ERROR_STOP=1', '-c', copy], { stdio: ['pipe', 'ignore', 'inherit'] });
+  const stream = psql.stdin;
+  const done = new Promise<void>((resolve, reject) => {
+    psql.on('error', reject);
+    psql.on('close', code => (code === 0 ? resolve() : reject(new Error(`psql exited with code ${code} while copying ${table}`))));
+  });
+  // A psql that dies mid-copy breaks the pipe; its exit code is what gets reported
+  stream.on('error', () => undefined);
+  done.catch(() => undefined);
+
+  let chunk = '';
+  let count = 0;
+  for (const row of rows) {
+    chunk += row.map(escapeCopy).join('\t') + '\n';
+    count++;
+    if (chunk.length >= 1 << 16) {
+      if (!stream.write(chunk)) await Promise.race([new Promise(resolve => stream.once('drain', resolve)), done]);
+      chunk = '';
+    }
+  }
+  stream.end(chunk);
+  await done;
+
+  console.log(`[generate-dataset] ${table}: ${count.toLocaleString()} rows`);
+  return count;
+}
+
+// Filled by the tweets phase; later phases need authorship and thread shape
+const tweetAuthor = new Int32Array(TWEETS);
+const tweetParent = new Int32Array(TWEETS).fill(-1);
+
+function* users() {
+  const rng = phaseRng(1);
+  for (let i = 0; i < USERS; i++) {
+    const created = new Date(userTime(i));
+    yield [userId(i), `${userId(i)}@dataset.local`, PLACEHOLDER_PASSWORD, `User ${i}`, userId(i), sentence(rng, 6), created, created];
+  }
+}
+
+function* follows() {
+  const rng = phaseRng(2);
+  for (let follower = 0; follower < USERS; follower++) {
+    const count = Math.min(USERS - 1, heavyTailCount(rng, MEAN_FOLLOWS_PER_USER));
+    const seen = new Set<number>();
+    // Bounded attempts: with a steep curve a small user set can run out of distinct targets
+    for (let attempt = 0; seen.size < count && attempt < count * 4; attempt++) {
+      const followee = scatter(powerLawIndex(rng, USERS), USERS);
+      if (followee === follower || seen.has(followee)) continue;
+      seen.add(followee);
+      yield [`f${follower.toString(36)}_${followee.toString(36)}`, new Date(userTime(Math.max(follower, followee)) + 1000), userId(follower), userId(followee)];
+    }
+  }
+}
+
+function* tweets() {
+  const rng = phaseRng(3);
+  for (let i = 0; i < TWEETS; i++) {
+    // Active accounts post far more than the median one
+    const author = scatter(powerLawIndex(rng, USERS, 2), USERS);
+    tweetAuthor[i] = author;
+
+    let parent: number | null = null;
+    if (i > 0 && rng() < REPLY_RATIO) {
+      // Replies cluster on recent tweets; some answer an earlier reply to form deeper threads
+      const candidate = i - 1 - Math.min(i - 1, Math.floor(heavyTailCount(rng, 200)));
+      const grandparent = tweetParent[candidate]!;
+      parent = grandparent >= 0 && rng() > NESTED_REPLY_RATIO ? grandparent : candidate;
+      tweetParent[i] = parent;
+    }
+
+    const created = new Date(tweetTime(i));
+    const views = heavyTailCount(rng, 50);
+    yield [tweetId(i), sentence(rng, 5 + Math.floor(rng() * 20)), views, created, created, userId(author), parent === null ? null : tweetId(parent)];
+  }
+}
+
+function* likes() {
+  const rng = phaseRng(4);
+  for (let i = 0; i < TWEETS; i++) {
+    const count = Math.min(USERS - 1, heavyTailCount(rng, MEAN_LIKES_PER_TWEET));
+    const seen = new Set<number>();
+    for (let attempt = 0; seen.size < count && attempt < count * 4; attempt++) {
+      const liker = scatter(powerLawIndex(rng, USERS, 1.5), USERS);
+      if (seen.has(liker)) continue;
+      seen.add(liker);
+      yield [`l${i.toString(36)}_${liker.toString(36)}`, new Date(tweetTime(i) + Math.floor(rng() * 86_400_000)), userId(liker), tweetId(i)];
+    }
+  }
+}
+
+function* notifications() {
+  const rng = phaseRng(5);
+  const readBefore = EPOCH - 7 * 86_400_000;
+  for (let i = 0; i < TWEETS; i++) {
+    const parent = tweetParent[i]!;
+    if (parent < 0 || tweetAuthor[parent] === tweetAuthor[i]) continue;
+    const created = tweetTime(i);
+    yield [`n${i.toString(36)}`, 'REPLY', created < readBefore || rng() < 0.5, new Date(created), userId(tweetAuthor[parent]!), userId(tweetAuthor[i]!), tweetId(i), null, 1];
+  }
+  // Aggregated like rows, one per liked tweet, as NotificationsService writes them
+  for (let i = 0; i < TWEETS; i += 3) {
+    const actors = 1 + heavyTailCount(rng, MEAN_LIKES_PER_TWEET);
+    const issuer = scatter(powerLawIndex(rng, USERS, 1.5), USERS);
+    if (issuer === tweetAuthor[i]) continue;
+    const created = tweetTime(i) + 3_600_000;
+    yield [`nl${i.toString(36)}`, 'LIKE', created < readBefore, new Date(created), userId(tweetAuthor[i]!), userId(issuer), tweetId(i), `LIKE:${tweetId(i)}`, actors];
+  }
+}
+
+interface ConversationPlan {
+  id: string;
+  a: number;
+  b: number;
+  messages: { sender: number; content: string; at: number }[];
+}
+
+function* conversationPlans(): Generator<ConversationPlan> {
+  const rng = phaseRng(6);
+  const pairs = new Set<string>();
+  for (let c = 0; c < CONVERSATIONS; c++) {
+    const a = scatter(powerLawIndex(rng, USERS, 1.5), USERS);
+    const b = scatter(powerLawIndex(rng, USERS, 1.5), USERS);
+    const key = a < b ? `${a}:${b}` : `${b}:${a}`;
+    if (a === b || pairs.has(key)) continue;
+    pairs.add(key);
+
+    let at = EPOCH - Math.floor(rng() * SPAN_MS);
+    const count = 1 + heavyTailCount(rng, MEAN_MESSAGES_PER_CONVERSATION);
+    const messages = Array.from({ length: count }, () => {
+      at += Math.floor(rng() * 3_600_000);
+      return { sender: rng() < 0.5 ? a : b, content: sentence(rng, 3 + Math.floor(rng() * 12)), at };
+    });
+    yield { id: `c${c.toString(36)}`, a, b, messages };
+  }
+}
+
+function* conversations() {
+  for (const plan of conversationPlans()) {
+    const last = plan.messages[plan.messages.length - 1]!;
+    const dmKey = [userId(plan.a), userId(plan.b)].sort().join(':');
+    yield [plan.id, new Date(plan.messages[0]!.at), new Date(last.at), dmKey, last.content, userId(last.sender), new Date(last.at)];
+  }
+}
+
+function* participants() {
+  for (const plan of conversationPlans()) {
+    const last = plan.messages[plan.messages.length - 1]!;
+    for (const user of [plan.a, plan.b]) {
+      const seen = last.sender === user;
+      yield [`${plan.id}_${user.toString(36)}`, userId(user), plan.id, seen, seen ? 0 : 1, new Date(last.at)];
+    }
+  }
+}
+
+function* messages() {
+  for (const plan of conversationPlans()) {
+    for (let m = 0; m < plan.messages.length; m++) {
+      const message = plan.messages[m]!;
+      yield [`${plan.id}_m${m.toString(36)}`, message.content, new Date(message.at), userId(message.sender), plan.id];
+    }
+  }
+}
+
+async function main() {
+  const prisma = new PrismaClient();
+
+  try {
+    if (await prisma.user.findFirst({ select: { id: true } })) {
+      if (!process.argv.includes('--truncate')) {
+        throw new Error('Database is not empty; pass --truncate to replace its contents');
+      }
+      await prisma.$executeRawUnsafe(`TRUNCATE "Message", "ConversationParticipant", "Conversation", "Notification", "Bookmark", "Like", "TimelineEntry", "Follow", "Tweet", "User" CASCADE`);
+    }
+
+    console.log(`[generate-dataset] SCALE=${SCALE} SEED=${SEED}: ${USERS.toLocaleString()} users, ${TWEETS.toLocaleString()} tweets`);
+    const started = Date.now();
+
+    await copyRows('User', ['id', 'email', 'password', 'name', 'username', 'bio', 'createdAt', 'updatedAt'], users());
+    await copyRows('Follow', ['id', 'createdAt', 'followerId', 'followingId'], follows());
+    await copyRows('Tweet', ['id', 'content', 'views', 'createdAt', 'updatedAt', 'authorId', 'parentId'], tweets());
+    await copyRows('Like', ['id', 'createdAt', 'userId', 'tweetId'], likes());
+    await copyRows('Notification', ['id', 'type', 'read', 'createdAt', 'userId', 'issuerId', 'tweetId', 'groupKey', 'actorCount'], notifications());
+    await copyRows('Conversation', ['id', 'createdAt', 'updatedAt', 'dmKey', 'lastMessageContent', 'lastMessageSenderId', 'lastMessageAt'], conversations());
+    await copyRows('ConversationParticipant', ['id', 'userId', 'conversationId', 'hasSeenLatest', 'unreadCount', 'lastMessageAt'], participants());
+    await copyRows('Message', ['id', 'content', 'createdAt', 'senderId', 'conversationId'], messages());
+
+    console.log('[generate-dataset] Computing denormalized counters...');
+    await prisma.$executeRawUnsafe(`
+      UPDATE "Tweet" t SET "likesCount" = c."count"
+      FROM (SELECT "tweetId", count(*)::int AS "count" FROM "Like" GROUP BY "tweetId") c
+      WHERE t."id" = c."tweetId"
+    `);
+    await prisma.$executeRawUnsafe(`
+      UPDATE "Tweet" t SET "repliesCount" = c."count"
+      FROM (SELECT "parentId", count(*)::int AS "count" FROM "Tweet" WHERE "parentId" IS NOT NULL GROUP BY "parentId") c
+      WHERE t."id" = c."parentId"
+    `);
+    await prisma.$executeRawUnsafe(`
+      UPDATE "User" u SET
+        "followersCount" = COALESCE((SELECT count(*)::int FROM "Follow" f WHERE f."followingId" = u."id"), 0),
+        "followingCount" = COALESCE((SELECT count(*)::int FROM "Follow" f WHERE f."followerId" = u."id"), 0),
+        "tweetsCount" = COALESCE((SELECT count(*)::int FROM "Tweet" t WHERE t."authorId" = u."id"), 0),
+        "unreadNotifications" = COALESCE((SELECT count(*)::int FROM "Notification" n WHERE n."userId" = u."id" AND n."read" = false), 0)
+    `);
+    await prisma.$executeRaw`UPDATE "User" SET "fanoutOnRead" = "followersCount" >= ${FANOUT_FOLLOWER_THRESHOLD}`;
+    await prisma.$executeRawUnsafe('ANALYZE');
+
+    console.log(`[generate-dataset] Done in ${((Date.now() - started) / 1000).toFixed(1)}s. Next: pnpm --filter api timeline:rebuild`);
+  } finally {
+    await prisma.$disconnect();
+  }
+}
+
+main().catch(error => {
+  console.error('[generate-dataset] Failed:', error);
+  process.exit(1);
+});
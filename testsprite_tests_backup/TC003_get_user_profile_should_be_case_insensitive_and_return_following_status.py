@@ -1,38 +1,10 @@
 import requests
-import string
-import random
+
+from api_client import checkout_user
 
 BASE_URL = "http://localhost:3001"
 TIMEOUT = 30
 
-def random_string(length=8):
-    return ''.join(random.choices(string.ascii_letters + string.digits, k=length))
-
-def signup_user(email, username, password, name):
-    url = f"{BASE_URL}/auth/signup"
-    payload = {
-        "email": email,
-        "username": username,
-        "password": password,
-        "name": name
-    }
-    resp = requests.post(url, json=payload, timeout=TIMEOUT)
-    resp.raise_for_status()
-    return resp.json()
-
-def login_user(email, password):
-    url = f"{BASE_URL}/auth/login"
-    payload = {
-        "email": email,
-        "password": password
-    }
-    resp = requests.post(url, json=payload, timeout=TIMEOUT)
-    resp.raise_for_status()
-    data = resp.json()
-    token = data.get("access_token") or data.get("token") or data.get("jwt") or data.get("jwtToken")
-    assert token, "Login response did not contain a JWT token"
-    return token
-
 def follow_user(auth_token, user_id_to_follow):
     url = f"{BASE_URL}/users/{user_id_to_follow}/follow"
     headers = {"Authorization": f"Bearer {auth_token}"}
@@ -54,28 +26,15 @@ def get_user_profile(auth_token, username):
     return resp
 
 def test_get_user_profile_should_be_case_insensitive_and_return_following_status():
-    # Create two users: user A (requesting user) and user B (target user)
-    email_a = f"{random_string(5)}@example.com"
-    username_a = random_string(8)
-    password_a = "Password123!"
-    name_a = "User A"
-    
-    email_b = f"{random_string(5)}@example.com"
-    username_b = random_string(8)
-    password_b = "Password123!"
-    name_b = "User B"
-
-    token_a = None
+    # Two users: user A (requesting user) and user B (target user)
+    user_a = checkout_user()
+    user_b = checkout_user()
+    username_a = user_a["username"]
+    username_b = user_b["username"]
+    token_a = user_a["token"]
+    user_b_id = None
 
     try:
-        # Sign up user A and user B
-        signup_user(email_a, username_a, password_a, name_a)
-        signup_user(email_b, username_b, password_b, name_b)
-
-        # Login user A and user B to get JWT tokens
-        token_a = login_user(email_a, password_a)
-        token_b = login_user(email_b, password_b)
-
         # Get user profiles to obtain IDs
         resp_profile_a = get_user_profile(token_a, username_a)
         resp_profile_b = get_user_profile(token_a, username_b)
@@ -1,33 +1,16 @@
 import requests
 import io
 
+from api_client import checkout_user
+
 BASE_URL = "http://localhost:3001"
 TIMEOUT = 30
 
 
 def test_update_user_profile_should_persist_changes_and_handle_avatar_cover_uploads():
-    # Step 1: Sign up a new user
-    signup_data = {
-        "email": "testuser_tc004@example.com",
-        "username": "testuser_tc004",
-        "password": "TestPass123!",
-        "name": "Test User TC004"
-    }
-    signup_resp = requests.post(
-        f"{BASE_URL}/auth/signup", json=signup_data, timeout=TIMEOUT
-    )
-    assert signup_resp.status_code == 201, f"Signup failed: {signup_resp.text}"
-    # Step 2: Login to get JWT token
-    login_data = {
-        "email": signup_data["email"],
-        "password": signup_data["password"]
-    }
-    login_resp = requests.post(
-        f"{BASE_URL}/auth/login", json=login_data, timeout=TIMEOUT
-    )
-    assert login_resp.status_code == 200, f"Login failed: {login_resp.text}"
-    token = login_resp.json().get("access_token")
-    assert token, "JWT token missing in login response"
+    # Steps 1-2: An authenticated user of its own
+    user = checkout_user()
+    token = user["token"]
 
     headers = {
         "Authorization": f"Bearer {token}"
@@ -79,7 +62,7 @@ def test_update_user_profile_should_persist_changes_and_handle_avatar_cover_uplo
 
     # Step 6: Retrieve profile to verify persistence
     profile_resp = requests.get(
-        f"{BASE_URL}/users/{signup_data['username']}", headers=headers, timeout=TIMEOUT
+        f"{BASE_URL}/users/{user['username']}", headers=headers, timeout=TIMEOUT
     )
     assert profile_resp.status_code == 200, f"Get profile failed: {profile_resp.text}"
     profile_json = profile_resp.json()
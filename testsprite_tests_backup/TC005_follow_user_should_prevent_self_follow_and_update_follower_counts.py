@@ -1,35 +1,10 @@
 import requests
-import uuid
+
+from api_client import checkout_user
 
 BASE_URL = "http://localhost:3001"
 TIMEOUT = 30
 
-def signup_user(email, username, password, name):
-    url = f"{BASE_URL}/auth/signup"
-    payload = {
-        "email": email,
-        "username": username,
-        "password": password,
-        "name": name
-    }
-    resp = requests.post(url, json=payload, timeout=TIMEOUT)
-    resp.raise_for_status()
-    return resp.json()
-
-def login_user(email, password):
-    url = f"{BASE_URL}/auth/login"
-    payload = {
-        "email": email,
-        "password": password
-    }
-    resp = requests.post(url, json=payload, timeout=TIMEOUT)
-    resp.raise_for_status()
-    json_resp = resp.json()
-    # The token may be under 'token' or 'accessToken'; assert at least one is present
-    token = json_resp.get("token") or json_resp.get("accessToken")
-    assert token is not None, f"Login response missing token field: {json_resp}"
-    return token
-
 def get_user_profile(username, token):
     url = f"{BASE_URL}/users/{username}"
     headers = {"Authorization": f"Bearer {token}"}
@@ -43,34 +18,22 @@ def post_follow_user(user_id, token):
     resp = requests.post(url, headers=headers, timeout=TIMEOUT)
     return resp
 
-def delete_user(user_id, token):
-    # No delete user endpoint described in PRD, so skip deleting created users
-    pass
+def delete_follow(user_id, token):
+    url = f"{BASE_URL}/users/{user_id}/follow"
+    headers = {"Authorization": f"Bearer {token}"}
+    return requests.delete(url, headers=headers, timeout=TIMEOUT)
 
 def test_follow_user_should_prevent_self_follow_and_update_follower_counts():
-    # Create two distinct users for this test
-    unique_suffix1 = uuid.uuid4().hex[:8]
-    unique_suffix2 = uuid.uuid4().hex[:8]
-    email1 = f"user1_{unique_suffix1}@example.com"
-    username1 = f"user1_{unique_suffix1}"
-    password1 = "Password123!"
-    name1 = "User One"
-
-    email2 = f"user2_{unique_suffix2}@example.com"
-    username2 = f"user2_{unique_suffix2}"
-    password2 = "Password123!"
-    name2 = "User Two"
-
-    # Signup user1
-    signup_user(email1, username1, password1, name1)
-    token1 = login_user(email1, password1)
+    # Two distinct users for this test
+    user1 = checkout_user()
+    user2 = checkout_user()
+    username1, token1 = user1["username"], user1["token"]
+    username2, token2 = user2["username"], user2["token"]
+
     user1_profile = get_user_profile(username1, token1)
     user1_id = user1_profile.get("id") or user1_profile.get("userId")
     assert user1_id is not None, "User1 creation failed: no user id returned"
 
-    # Signup user2
-    signup_user(email2, username2, password2, name2)
-    token2 = login_user(email2, password2)
     user2_profile = get_user_profile(username2, token2)
     user2_id = user2_profile.get("id") or user2_profile.get("userId")
     assert user2_id is not None, "User2 creation failed: no user id returned"
@@ -108,8 +71,7 @@ def test_follow_user_should_prevent_self_follow_and_update_follower_counts():
             f"User1 following count seems incorrect: {following_before}"
 
     finally:
-        # Cleanup users if deletion API was available
-        # No user deletion endpoint info so skipping actual delete
-        pass
+        # Pool users are reused by later runs, so undo the follow
+        delete_follow(user2_id, token1)
 
 test_follow_user_should_prevent_self_follow_and_update_follower_counts()
@@ -1,35 +1,10 @@
 import requests
-import uuid
+
+from api_client import checkout_user
 
 BASE_URL = "http://localhost:3001"
 TIMEOUT = 30
 
-def signup_user(email, username, password, name):
-    url = f"{BASE_URL}/auth/signup"
-    payload = {
-        "email": email,
-        "username": username,
-        "password": password,
-        "name": name
-    }
-    resp = requests.post(url, json=payload, timeout=TIMEOUT)
-    resp.raise_for_status()
-    json_resp = resp.json()
-    assert "id" in json_resp, "Signup response missing expected 'id' field"
-    return json_resp
-
-def login_user(email, password):
-    url = f"{BASE_URL}/auth/login"
-    payload = {
-        "email": email,
-        "password": password
-    }
-    resp = requests.post(url, json=payload, timeout=TIMEOUT)
-    resp.raise_for_status()
-    json_resp = resp.json()
-    assert "token" in json_resp, "Login response missing 'token'"
-    return json_resp["token"]
-
 def get_user_profile(username, token):
     url = f"{BASE_URL}/users/{username}"
     headers = {"Authorization": f"Bearer {token}"}
@@ -52,26 +27,14 @@ def unfollow_user(user_id, token):
     return resp
 
 def unfollow_user_should_update_follower_counts_correctly():
-    # Create two users: follower and followee
-    follower_email = f"user_follower_{uuid.uuid4()}@test.com"
-    follower_username = f"userfollower{uuid.uuid4().hex[:8]}"
-    follower_password = "Password123!"
-    follower_name = "Follower User"
-
-    followee_email = f"user_followee_{uuid.uuid4()}@test.com"
-    followee_username = f"userfollowee{uuid.uuid4().hex[:8]}"
-    followee_password = "Password123!"
-    followee_name = "Followee User"
+    # Two users: follower and followee
+    follower = checkout_user()
+    followee = checkout_user()
+    follower_token = follower["token"]
+    followee_username = followee["username"]
+    followee_user_id = None
 
     try:
-        # Signup follower
-        signup_user(follower_email, follower_username, follower_password, follower_name)
-        follower_token = login_user(follower_email, follower_password)
-
-        # Signup followee
-        signup_user(followee_email, followee_username, followee_password, followee_name)
-        followee_token = login_user(followee_email, followee_password)
-
         # Get followee profile before follow
         followee_profile_before = get_user_profile(followee_username, follower_token)
         followers_count_before = followee_profile_before.get("followersCount", 0)
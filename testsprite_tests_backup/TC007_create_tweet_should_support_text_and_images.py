@@ -1,37 +1,11 @@
 import requests
-import uuid
+
+from api_client import checkout_user
 
 BASE_URL = "http://localhost:3001"
 TIMEOUT = 30
 
 
-def create_user(email, username, password, name):
-    url = f"{BASE_URL}/auth/signup"
-    payload = {
-        "email": email,
-        "username": username,
-        "password": password,
-        "name": name
-    }
-    resp = requests.post(url, json=payload, timeout=TIMEOUT)
-    resp.raise_for_status()
-    return resp.json()
-
-
-def login_user(email, password):
-    url = f"{BASE_URL}/auth/login"
-    payload = {
-        "email": email,
-        "password": password
-    }
-    resp = requests.post(url, json=payload, timeout=TIMEOUT)
-    resp.raise_for_status()
-    data = resp.json()
-    assert "token" in data, "Login response does not contain 'token'"
-    token = data["token"]
-    return token
-
-
 def upload_image(auth_token, image_content, filename):
     url = f"{BASE_URL}/uploads"
     headers = {
@@ -72,17 +46,8 @@ def delete_tweet(auth_token, tweet_id):
 
 
 def test_create_tweet_should_support_text_and_images():
-    # Step 1: Create a new user
-    unique_val = str(uuid.uuid4())
-    email = f"{unique_val}@example.com"
-    username = f"user{unique_val[:8]}"
-    password = "TestPass123!"
-    name = "Test User"
-
-    user = create_user(email, username, password, name)
-
-    # Step 2: Login to get auth token
-    token = login_user(email, password)
+    # Steps 1-2: An authenticated user of its own
+    token = checkout_user()["token"]
 
     # Step 3: Upload an image to obtain a media URL
     image_content = (
@@ -1,32 +1,15 @@
 import requests
 import time
 
+from api_client import checkout_user
+
 BASE_URL = "http://localhost:3001"
 TIMEOUT = 30
 
 def test_get_all_tweets_should_return_timeline_ordered_newest_first():
     # This test requires authentication to create a tweet (to guarantee at least 2 tweets to verify order)
-    # 1. Sign up a new user
-    signup_data = {
-        "email": f"testuser_{int(time.time())}@example.com",
-        "username": f"testuser_{int(time.time())}",
-        "password": "TestPassword123!",
-        "name": "Test User"
-    }
-    signup_resp = requests.post(f"{BASE_URL}/auth/signup", json=signup_data, timeout=TIMEOUT)
-    assert signup_resp.status_code == 201, f"Signup failed: {signup_resp.text}"
-
-    # 2. Login to obtain JWT token
-    login_data = {
-        "email": signup_data["email"],
-        "password": signup_data["password"]
-    }
-    login_resp = requests.post(f"{BASE_URL}/auth/login", json=login_data, timeout=TIMEOUT)
-    assert login_resp.status_code == 200, f"Login failed: {login_resp.text}"
-
-    login_json = login_resp.json()
-    token = login_json.get("access_token")
-    assert token, f"No token returned on login: {login_resp.text}"
+    # 1-2. An authenticated user of its own
+    token = checkout_user()["token"]
 
     headers = {
         "Authorization": f"Bearer {token}",
@@ -1,31 +1,10 @@
 import requests
-import uuid
+
+from api_client import checkout_user
 
 BASE_URL = "http://localhost:3001"
 TIMEOUT = 30
 
-def signup_user(email, username, password, name):
-    url = f"{BASE_URL}/auth/signup"
-    payload = {
-        "email": email,
-        "username": username,
-        "password": password,
-        "name": name
-    }
-    resp = requests.post(url, json=payload, timeout=TIMEOUT)
-    resp.raise_for_status()
-    return resp.json()
-
-def login_user(email, password):
-    url = f"{BASE_URL}/auth/login"
-    payload = {
-        "email": email,
-        "password": password
-    }
-    resp = requests.post(url, json=payload, timeout=TIMEOUT)
-    resp.raise_for_status()
-    return resp.json()
-
 def create_tweet(token, text):
     url = f"{BASE_URL}/tweets"
     headers = {
@@ -65,20 +44,8 @@ def unlike_tweet(tweet_id, token):
     return resp
 
 def test_like_tweet_should_allow_liking_and_unliking():
-    # Create unique user for test
-    test_email = f"user_{uuid.uuid4().hex}@example.com"
-    test_username = f"user_{uuid.uuid4().hex[:8]}"
-    test_password = "StrongPass!123"
-    test_name = "Test User"
-    
-    user_signup_resp = signup_user(test_email, test_username, test_password, test_name)
-    assert "accessToken" in user_signup_resp, "Signup should return an accessToken"
-    token = user_signup_resp["accessToken"]
-    assert token, "JWT token must be present after signup"
-
-    # Also verify login works (optional)
-    login_resp = login_user(test_email, test_password)
-    assert "accessToken" in login_resp, "Login should return an accessToken"
+    # An authenticated user of its own (signup and login are covered by TC001/TC002)
+    token = checkout_user()["token"]
 
     tweet = None
     try:
@@ -0,0 +1,139 @@
+"""Shared client for the TC suite: one pooled keep-alive session per process,
+plus a pool of pre-provisioned users so tests that only need an authenticated
+actor don't pay a bcrypt signup each time.
+"""
+
+import base64
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+BASE_URL = "http://localhost:3001"
+TIMEOUT = 30
+POOL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tmp", "user_pool.json")
+POOL_PASSWORD = "PoolUser!123"
+# Tokens are re-issued when they have less than this left (the API signs 60 minute tokens)
+TOKEN_REFRESH_MARGIN_S = 5 * 60
+
+_session = None
+_session_lock = threading.Lock()
+_assigned_users = []
+
+
+def get_session():
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32)
+            _session.mount("http://", adapter)
+            _session.mount("https://", adapter)
+        return _session
+
+
+def install_pooled_session():
+    """Routes module-level `requests.get/post/...` through the pooled session, so
+    unmodified TC scripts reuse connections instead of opening one per call."""
+    session = get_session()
+    requests.request = session.request
+    for method in ("get", "post", "put", "patch", "delete", "head", "options"):
+        setattr(requests, method, getattr(session, method))
+
+
+def auth_headers(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def signup_user(email, username, password, name):
+    resp = get_session().post(f"{BASE_URL}/auth/signup", json={
+        "email": email,
+        "username": username,
+        "password": password,
+        "name": name,
+    }, timeout=TIMEOUT)
+    resp.raise_for_status()
+    return resp.json()
+
+
+def login_user(email, password):
+    resp = get_session().post(f"{BASE_URL}/auth/login", json={"email": email, "password": password}, timeout=TIMEOUT)
+    resp.raise_for_status()
+    return resp.json()
+
+
+def _token_expiry(token):
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return json.loads(base64.urlsafe_b64decode(payload)).get("exp", 0)
+    except (IndexError, ValueError):
+        return 0
+
+
+def _new_pool_user():
+    suffix = uuid.uuid4().hex[:10]
+    email = f"pool_{suffix}@example.com"
+    username = f"pool_{suffix}"
+    data = signup_user(email, username, POOL_PASSWORD, f"Pool User {suffix}")
+    return {
+        "id": data["user"]["id"],
+        "email": email,
+        "username": username,
+        "password": POOL_PASSWORD,
+        "token": data["access_token"],
+    }
+
+
+def _fresh(user):
+    if _token_expiry(user["token"]) - time.time() < TOKEN_REFRESH_MARGIN_S:
+        user = dict(user, token=login_user(user["email"], user["password"])["access_token"])
+    return user
+
+
+class UserPool:
+    """Users created once and kept in tmp/user_pool.json across runs.
+
+    The runner hands each test its own users, so tests running side by side
+    never act as the same account.
+    """
+
+    def __init__(self, path=POOL_PATH):
+        self.path = path
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path) as f:
+            return json.load(f)
+
+    def save(self, users):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "w") as f:
+            json.dump(users, f, indent=2)
+
+    def provision(self, count, workers=8):
+        """Returns `count` users with valid tokens, signing up only what's missing."""
+        users = self.load()[:count]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            users = list(executor.map(_fresh, users))
+            users += list(executor.map(lambda _: _new_pool_user(), range(count - len(users))))
+        self.save(users)
+        return users
+
+
+def assign_users(users):
+    """Called by the runner in a worker before it executes a test."""
+    _assigned_users[:] = users
+
+
+def checkout_user():
+    """A user for this test alone: one the runner assigned, or a new signup when run standalone."""
+    if _assigned_users:
+        return _fresh(_assigned_users.pop(0))
+    return _new_pool_user()
@@ -0,0 +1,363 @@
+"""Concurrent load generator built from the TC001-TC010 flows.
+
+Each virtual user signs up, logs in, then loops over weighted actions (post,
+read feed, open a tweet, like/unlike, follow, view a profile, upload an image)
+with randomized think time. Results are per-endpoint latency percentiles,
+histograms and throughput, written as JSON so runs can be diffed across commits.
+
+    pip install aiohttp
+    python loadgen.py --users 200 --duration 120 --ramp linear --ramp-up 30 --output tmp/load.json
+
+Keep --seed, --users, --duration and the ramp fixed between runs you compare,
+and start each run against a freshly seeded database.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import platform
+import random
+import struct
+import subprocess
+import sys
+import time
+import uuid
+import zlib
+from collections import defaultdict
+
+import aiohttp
+
+BASE_URL = "http://localhost:3001"
+TIMEOUT = 30
+PASSWORD = "LoadTest!123"
+
+# Relative weights of what a virtual user does on each iteration
+DEFAULT_MIX = {
+    "read_feed": 40,
+    "view_tweet": 15,
+    "like": 15,
+    "post_tweet": 10,
+    "view_profile": 10,
+    "follow": 7,
+    "upload": 3,
+}
+
+# Log-spaced bucket upper bounds in ms for the latency histograms
+HISTOGRAM_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, math.inf]
+
+
+def make_png(size=64):
+    """A small valid RGB PNG, generated so uploads exercise the real decode path."""
+    raw = b"".join(b"\x00" + bytes([x % 256, (x * 3) % 256, 128]) * size for x in range(size))
+
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+    header = struct.pack(">IIBBBBB", size, size, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(raw)) + chunk(b"IEND", b"")
+
+
+PNG_BYTES = make_png()
+
+
+class Metrics:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+        self.errors = defaultdict(int)
+        self.recording = False
+
+    def record(self, endpoint, status, elapsed_ms):
+        if not self.recording:
+            return
+        self.latencies[endpoint].append(elapsed_ms)
+        self.statuses[endpoint][str(status)] += 1
+
+    def record_error(self, endpoint, error):
+        if not self.recording:
+            return
+        self.errors[f"{endpoint}: {type(error).__name__}"] += 1
+
+    def report(self, window_s):
+        endpoints = {}
+        for endpoint, samples in sorted(self.latencies.items()):
+            samples.sort()
+            histogram = {}
+            start = 0
+            for bound in HISTOGRAM_BUCKETS_MS:
+                end = start
+                while end < len(samples) and samples[end] <= bound:
+                    end += 1
+                histogram["+Inf" if bound == math.inf else f"le_{bound}"] = end
+                start = end
+            endpoints[endpoint] = {
+                "count": len(samples),
+                "throughput_rps": round(len(samples) / window_s, 2),
+                "latency_ms": {
+                    "p50": percentile(samples, 50),
+                    "p95": percentile(samples, 95),
+                    "p99": percentile(samples, 99),
+                    "max": round(samples[-1], 2),
+                    "mean": round(sum(samples) / len(samples), 2),
+                },
+                # Cumulative counts, Prometheus style
+                "histogram": histogram,
+                "statuses": dict(self.statuses[endpoint]),
+            }
+
+        total = sum(len(samples) for samples in self.latencies.values())
+        return {
+            "total_requests": total,
+            "throughput_rps": round(total / window_s, 2),
+            "endpoints": endpoints,
+            "errors": dict(self.errors),
+        }
+
+
+def percentile(sorted_samples, p):
+    if not sorted_samples:
+        return 0
+    index = min(len(sorted_samples) - 1, int(math.ceil(p / 100 * len(sorted_samples))) - 1)
+    return round(sorted_samples[max(index, 0)], 2)
+
+
+def target_users(profile, elapsed, users, ramp_up, duration):
+    """How many virtual users should be active `elapsed` seconds into the run."""
+    if profile == "constant" or ramp_up <= 0:
+        return users
+    if profile == "linear":
+        return min(users, int(users * elapsed / ramp_up) + 1)
+    if profile == "step":
+        steps = 5
+        return min(users, int(users * (int(elapsed / (ramp_up / steps)) + 1) / steps))
+    if profile == "spike":
+        # A fifth of the load, with the full load during the middle third of the run
+        in_spike = duration / 3 <= elapsed < 2 * duration / 3
+        return users if in_spike else max(1, users // 5)
+    raise ValueError(f"Unknown ramp profile: {profile}")
+
+
+class SharedState:
+    """Ids created during the run, so likes and follows hit real, varied targets."""
+
+    def __init__(self, rng):
+        self.rng = rng
+        self.tweet_ids = []
+        self.users = []
+
+    def random_tweet(self):
+        return self.rng.choice(self.tweet_ids) if self.tweet_ids else None
+
+    def random_user(self, exclude_id):
+        candidates = [user for user in self.users[-500:] if user["id"] != exclude_id]
+        return self.rng.choice(candidates) if candidates else None
+
+
+class VirtualUser:
+    def __init__(self, index, session, args, metrics, shared, rng):
+        self.index = index
+        self.session = session
+        self.args = args
+        self.metrics = metrics
+        self.shared = shared
+        self.rng = rng
+        self.token = None
+        self.user = None
+        self.liked = set()
+
+    async def request(self, endpoint, method, path, **kwargs):
+        headers = kwargs.pop("headers", {})
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        started = time.perf_counter()
+        try:
+            async with self.session.request(method, f"{self.args.base_url}{path}", headers=headers, **kwargs) as resp:
+                body = await resp.read()
+                self.metrics.record(endpoint, resp.status, (time.perf_counter() - started) * 1000)
+                if resp.status >= 400:
+                    return None
+                return json.loads(body) if body else {}
+        except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+            self.metrics.record_error(endpoint, error)
+            return None
+
+    async def signup_and_login(self, run_id):
+        # Suffixed so a user respawned by the ramp never collides with an earlier signup
+        username = f"lg_{run_id}_{self.index}_{uuid.uuid4().hex[:6]}"
+        email = f"{username}@example.com"
+        signup = await self.request("POST /auth/signup", "POST", "/auth/signup", json={
+            "email": email, "username": username, "password": PASSWORD, "name": f"Load User {self.index}",
+        })
+        if not signup:
+            return False
+        login = await self.request("POST /auth/login", "POST", "/auth/login", json={"email": email, "password": PASSWORD})
+        if not login:
+            return False
+        self.token = login["access_token"]
+        self.user = login["user"]
+        self.shared.users.append(self.user)
+        return True
+
+    async def read_feed(self):
+        page = await self.request("GET /tweets", "GET", "/tweets?cursor=&limit=20")
+        # Some sessions scroll; deeper pages are where offset-style costs show up
+        pages = 1
+        while page and page.get("nextCursor") and pages < 3 and self.rng.random() < 0.5:
+            page = await self.request("GET /tweets (next page)", "GET", f"/tweets?cursor={page['nextCursor']}&limit=20")
+            pages += 1
+
+    async def view_tweet(self):
+        tweet_id = self.shared.random_tweet()
+        if tweet_id:
+            await self.request("GET /tweets/:id", "GET", f"/tweets/{tweet_id}")
+
+    async def like(self):
+        tweet_id = self.shared.random_tweet()
+        if not tweet_id:
+            return
+        if tweet_id in self.liked:
+            await self.request("DELETE /tweets/:id/like", "DELETE", f"/tweets/{tweet_id}/like")
+            self.liked.discard(tweet_id)
+        else:
+            await self.request("PUT /tweets/:id/like", "PUT", f"/tweets/{tweet_id}/like")
+            self.liked.add(tweet_id)
+
+    async def post_tweet(self):
+        tweet = await self.request("POST /tweets", "POST", "/tweets", json={"content": f"Load test tweet {uuid.uuid4().hex[:12]}"})
+        if tweet and "id" in tweet:
+            self.shared.tweet_ids.append(tweet["id"])
+
+    async def view_profile(self):
+        target = self.shared.random_user(self.user["id"])
+        if target:
+            await self.request("GET /users/:username", "GET", f"/users/{target['username']}")
+
+    async def follow(self):
+        target = self.shared.random_user(self.user["id"])
+        if target:
+            await self.request("POST /users/:id/follow", "POST", f"/users/{target['id']}/follow")
+
+    async def upload(self):
+        form = aiohttp.FormData()
+        form.add_field("file", PNG_BYTES, filename="load.png", content_type="image/png")
+        await self.request("POST /uploads", "POST", "/uploads", data=form)
+
+    async def think(self):
+        if self.args.think_time > 0:
+            # Exponential think time gives bursty, more realistic arrivals than a fixed sleep
+            await asyncio.sleep(self.rng.expovariate(1 / self.args.think_time))
+
+
+async def run_user(vu, run_id, mix, should_run):
+    if not await vu.signup_and_login(run_id):
+        return
+    actions, weights = zip(*mix.items())
+    while should_run(vu.index):
+        action = vu.rng.choices(actions, weights)[0]
+        await getattr(vu, action)()
+        await vu.think()
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def main(args):
+    rng = random.Random(args.seed)
+    mix = dict(DEFAULT_MIX)
+    if args.mix:
+        mix.update({name: int(weight) for name, weight in (item.split("=") for item in args.mix.split(","))})
+    mix = {name: weight for name, weight in mix.items() if weight > 0}
+
+    metrics = Metrics()
+    shared = SharedState(rng)
+    run_id = uuid.uuid4().hex[:8]
+    # One pooled keep-alive connector shared by every virtual user
+    connector = aiohttp.TCPConnector(limit=args.max_connections, keepalive_timeout=60)
+    timeout = aiohttp.ClientTimeout(total=TIMEOUT)
+
+    started = time.monotonic()
+    warmup_until = started + args.warmup
+    deadline = warmup_until + args.duration
+    peak_active = 0
+
+    def should_run(index):
+        now = time.monotonic()
+        return now < deadline and index < target_users(args.ramp, now - started, args.users, args.ramp_up, args.warmup + args.duration)
+
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        # Seed a few tweets so early readers and likers have something to hit
+        seeder = VirtualUser(-1, session, args, metrics, shared, random.Random(args.seed))
+        if await seeder.signup_and_login(run_id):
+            for _ in range(20):
+                await seeder.post_tweet()
+
+        tasks = []
+        while time.monotonic() < deadline:
+            now = time.monotonic()
+            if not metrics.recording and now >= warmup_until:
+                metrics.recording = True
+            target = target_users(args.ramp, now - started, args.users, args.ramp_up, args.warmup + args.duration)
+            # Users retire themselves when the target drops; respawn any that did once it rises again
+            tasks = [task for task in tasks if not task.done()]
+            peak_active = max(peak_active, len(tasks))
+            running = {task.vu_index for task in tasks}
+            for index in range(target):
+                if index not in running:
+                    vu = VirtualUser(index, session, args, metrics, shared, random.Random(f"{args.seed}:{index}"))
+                    task = asyncio.create_task(run_user(vu, run_id, mix, should_run))
+                    task.vu_index = index
+                    tasks.append(task)
+            await asyncio.sleep(0.25)
+
+        metrics.recording = False
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    result = {
+        "meta": {
+            "commit": git_commit(),
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%S%z", time.localtime()),
+            "base_url": args.base_url,
+            "users": args.users,
+            "ramp": args.ramp,
+            "ramp_up_s": args.ramp_up,
+            "warmup_s": args.warmup,
+            "duration_s": args.duration,
+            "think_time_s": args.think_time,
+            "seed": args.seed,
+            "mix": mix,
+            "python": platform.python_version(),
+            "peak_active_users": peak_active,
+        },
+        **metrics.report(args.duration),
+    }
+
+    output = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    print(output)
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--users", type=int, default=50, help="peak number of virtual users")
+    parser.add_argument("--duration", type=float, default=60, help="measured seconds, after warm-up")
+    parser.add_argument("--warmup", type=float, default=10, help="seconds of load that are not recorded")
+    parser.add_argument("--ramp", choices=["constant", "linear", "step", "spike"], default="linear")
+    parser.add_argument("--ramp-up", type=float, default=10, help="seconds to reach --users (linear/step)")
+    parser.add_argument("--think-time", type=float, default=1.0, help="mean seconds between actions, 0 for none")
+    parser.add_argument("--max-connections", type=int, default=100, help="size of the keep-alive connection pool")
+    parser.add_argument("--mix", help="override action weights, e.g. read_feed=60,upload=0")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args(sys.argv[1:])))